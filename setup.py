@@ -11,6 +11,7 @@ setup(
     entry_points={
         'console_scripts': [
             'wlm = website_measure:run',
+            'wlm-benchmark = website_measure.benchmark:main',
         ],
     },
 )
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+from website_measure.alerts import AlertCache
+from website_measure.notify import Notification
+
+
+class TestAlertCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'alerts.json')
+        self.mail = Notification(
+            'mail', 2, 3, 'a@example.com', main_url='https://wp.pl'
+        )
+        self.sms = Notification(
+            'sms', 2, 3, '123123123', main_url='https://wp.pl'
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cooldown(self):
+        cache = AlertCache(self.file_path, cooldown=60)
+        self.assertTrue(cache.should_send(self.mail, 1000))
+        cache.mark_sent(self.mail, 1000)
+        self.assertFalse(cache.should_send(self.mail, 1030))
+        self.assertTrue(cache.should_send(self.sms, 1030))
+        self.assertTrue(cache.should_send(self.mail, 1061))
+
+    def test_cooldown_after_delivery(self):
+        cache = AlertCache(self.file_path, cooldown=60)
+        self.assertTrue(cache.should_send(self.mail, 1000))
+        self.assertTrue(cache.should_send(self.mail, 1030))
+        cache.mark_sent(self.mail, 1030)
+        self.assertFalse(cache.should_send(self.mail, 1031))
+
+    def test_no_cooldown(self):
+        cache = AlertCache(self.file_path)
+        self.assertTrue(cache.should_send(self.mail, 1000))
+        self.assertTrue(cache.should_send(self.mail, 1000))
+
+    def test_state_persists(self):
+        cache = AlertCache(self.file_path, cooldown=10 ** 9)
+        self.assertTrue(cache.should_send(self.mail))
+        cache.mark_sent(self.mail)
+        cache = AlertCache(self.file_path, cooldown=10 ** 9)
+        self.assertFalse(cache.should_send(self.mail))
+
+    def test_digest(self):
+        cache = AlertCache(self.file_path, digest_window=100)
+        other = Notification(
+            'mail', 3, 3, 'a@example.com', main_url='https://onet.pl'
+        )
+        cache.add_to_digest(self.mail, 1000)
+        cache.add_to_digest(other, 1050)
+        self.assertEqual(cache.pop_digests(1099), [])
+
+        cache = AlertCache(self.file_path, digest_window=100)
+        digests = cache.pop_digests(1100)
+        self.assertEqual(len(digests), 1)
+        self.assertEqual(digests[0].kind, 'digest')
+        self.assertEqual(digests[0].recipient, 'a@example.com')
+        self.assertEqual(
+            [alert['main_url'] for alert in digests[0].alerts],
+            ['https://wp.pl', 'https://onet.pl']
+        )
+        self.assertEqual(cache.pop_digests(10 ** 6), [])
+
+    def test_broken_state_file(self):
+        with open(self.file_path, 'w') as file:
+            file.write('{')
+        cache = AlertCache(self.file_path)
+        self.assertEqual(cache.sent, {})
@@ -0,0 +1,182 @@
+import gzip
+import socket
+import threading
+import time
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from website_measure.backend import (
+    MeasureBackend, PhaseTiming, get_error_kind,
+)
+from website_measure.constants import PHASES
+from website_measure.decode import DecodeError
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def handle(self):
+        # tests close connections on purpose (max_bytes, read timeout)
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/gzip':
+            body = b'x' * 10000
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body)
+                self.send_response(200)
+                self.send_header('Content-Encoding', 'gzip')
+            else:
+                self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path == '/corrupt-gzip':
+            body = b'not gzip data'
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path == '/slow':
+            time.sleep(0.5)
+        if self.path == '/missing':
+            self.send_error(404)
+            return
+        body = b'x' * (200 * 1024 if self.path == '/large' else 1024)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestMeasureBackend(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.thread = threading.Thread(
+            target=cls.server.serve_forever, daemon=True
+        )
+        cls.thread.start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.backend = MeasureBackend()
+
+    def test_fetch(self):
+        timing = self.backend.fetch(f'{self.url}/')
+        self.assertIsInstance(timing, PhaseTiming)
+        self.assertGreater(timing.end_ns, timing.start_ns)
+        self.assertEqual(timing.tls, 0)
+        self.assertGreater(timing.connect, 0)
+        self.assertGreater(timing.ttfb, 0)
+        self.assertLessEqual(
+            sum(getattr(timing, phase) for phase in PHASES),
+            timing.end_ns - timing.start_ns
+        )
+
+    def test_fetch_reuse(self):
+        self.backend.fetch(f'{self.url}/', reuse=True)
+        self.assertTrue(self.backend.is_warm(f'{self.url}/'))
+        timing = self.backend.fetch(f'{self.url}/', reuse=True)
+        self.assertEqual(timing.dns, 0)
+        self.assertEqual(timing.connect, 0)
+        self.assertGreater(timing.ttfb, 0)
+        self.backend.close()
+        self.assertFalse(self.backend.is_warm(f'{self.url}/'))
+
+    def test_fetch_without_reuse_not_pooled(self):
+        self.backend.fetch(f'{self.url}/')
+        self.assertFalse(self.backend.is_warm(f'{self.url}/'))
+
+    def test_fetch_reuse_stale_connection(self):
+        self.backend.fetch(f'{self.url}/', reuse=True)
+        key = self.backend.get_key(urlsplit(f'{self.url}/'))
+        self.backend.pool.idle[key][0].sock.shutdown(socket.SHUT_RDWR)
+        timing = self.backend.fetch(f'{self.url}/', reuse=True)
+        self.assertGreater(timing.connect, 0)
+
+    def test_fetch_body_bytes(self):
+        timing = self.backend.fetch(f'{self.url}/large')
+        self.assertEqual(timing.body_bytes, 200 * 1024)
+
+    def test_fetch_max_bytes(self):
+        self.backend.max_bytes = 1000
+        timing = self.backend.fetch(f'{self.url}/large', reuse=True)
+        self.assertEqual(timing.body_bytes, 1000)
+        self.assertFalse(self.backend.is_warm(f'{self.url}/large'))
+
+    def test_get_buffer_reused(self):
+        self.assertIs(self.backend.get_buffer(), self.backend.get_buffer())
+
+    def test_fetch_redirect(self):
+        timing = self.backend.fetch(f'{self.url}/redirect')
+        self.assertGreater(timing.end_ns, timing.start_ns)
+
+    def test_fetch_http_error(self):
+        with self.assertRaises(urllib.error.HTTPError):
+            self.backend.fetch(f'{self.url}/missing')
+
+    def test_fetch_unknown_url_type(self):
+        with self.assertRaises(ValueError):
+            self.backend.fetch('facebook.pl')
+
+    def test_phases(self):
+        timing = PhaseTiming(0, 2_000_000_000, dns=500_000_000)
+        self.assertEqual(timing.end_time, 2.0)
+        self.assertEqual(timing.phases['dns'], 0.5)
+        self.assertEqual(set(timing.phases), set(PHASES))
+
+    def test_read_timeout(self):
+        backend = MeasureBackend(read_timeout=0.1)
+        with self.assertRaises(socket.timeout) as context:
+            backend.fetch(f'{self.url}/slow')
+        self.assertEqual(get_error_kind(context.exception), 'timeout')
+
+    def test_get_error_kind(self):
+        self.assertEqual(get_error_kind(socket.gaierror()), 'dns')
+        self.assertEqual(get_error_kind(ConnectionRefusedError()), 'connect')
+        self.assertEqual(
+            get_error_kind(urllib.error.HTTPError('', 500, '', {}, None)),
+            'http'
+        )
+        self.assertEqual(get_error_kind(RuntimeError()), 'error')
+
+    def test_fetch_compressed(self):
+        timing = self.backend.fetch(f'{self.url}/gzip', keep_body=True)
+        self.assertLess(timing.body_bytes, 10000)
+        self.assertEqual(timing.decoded_bytes, 10000)
+        self.assertEqual(bytes(timing.body), b'x' * 10000)
+        self.assertGreater(timing.decode, 0)
+
+    def test_fetch_corrupt_compressed(self):
+        with self.assertRaises(DecodeError) as context:
+            self.backend.fetch(f'{self.url}/corrupt-gzip')
+        self.assertEqual(get_error_kind(context.exception), 'decode')
+
+    def test_fetch_uncompressed(self):
+        timing = self.backend.fetch(f'{self.url}/gzip', compress=False)
+        self.assertEqual(timing.body_bytes, 10000)
+        self.assertEqual(timing.decoded_bytes, 10000)
+        self.assertEqual(timing.decode, 0)
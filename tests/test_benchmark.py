@@ -0,0 +1,43 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from website_measure.benchmark import StandInServer, main, run_benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_ground_truth(self):
+        with StandInServer(0.1, bandwidth=1000, body_size=500) as server:
+            self.assertEqual(server.get_ground_truth(), 0.6)
+            self.assertTrue(server.get_url('/1').startswith('http://'))
+
+    def test_run_benchmark(self):
+        with StandInServer(0.02, body_size=2048) as server:
+            result = run_benchmark(server, concurrency=4, urls=8, samples=2)
+        self.assertEqual(result.loads, 16)
+        self.assertEqual(result.failures, 0)
+        self.assertGreaterEqual(result.mean_error, 0)
+        self.assertLess(result.mean_error, 0.5)
+        self.assertGreater(result.throughput, 0)
+        self.assertGreaterEqual(result.overhead, 0)
+
+    def test_failures(self):
+        with StandInServer(0, failure_rate=1.0) as server:
+            result = run_benchmark(server, concurrency=2, urls=3)
+        self.assertEqual(result.failures, 3)
+
+    def test_failed_samples(self):
+        with StandInServer(0, failure_rate=0.5, seed=1) as server:
+            result = run_benchmark(server, concurrency=2, urls=2, samples=10)
+        self.assertEqual(result.loads, 20)
+        self.assertGreater(result.failures, 0)
+        self.assertLess(result.failures, 20)
+
+    def test_main(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            results = main(
+                ['--latency', '0.01', '--urls', '4', '-c', '1', '2']
+            )
+        self.assertEqual([result.concurrency for result in results], [1, 2])
+        self.assertIn('ground truth: 10.0 ms', stdout.getvalue())
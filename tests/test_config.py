@@ -0,0 +1,81 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from website_measure.config import BenchmarkGroup, load_config
+
+
+class TestLoadConfig(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        file_path = os.path.join(self.directory.name, name)
+        with open(file_path, 'w') as file:
+            file.write(text)
+        return file_path
+
+    def test_json(self):
+        file_path = self.write('groups.json', json.dumps({'groups': [
+            {'name': 'shop', 'url': 'Example.com/shop',
+             'competitors': ['https://wp.pl', 'https://wp.pl/', 'www'],
+             'mail': 'abcd@example.com'},
+            {'url': 'https://onet.pl', 'competitors': ['https://wp.pl'],
+             'phone_number': 123123123},
+        ]}))
+        with patch('sys.stderr', io.StringIO()):
+            groups = load_config(file_path, default_mail='x@example.com')
+        self.assertEqual(groups, [
+            BenchmarkGroup(
+                'shop', 'http://example.com/shop', ['https://wp.pl'],
+                'abcd@example.com'
+            ),
+            BenchmarkGroup(
+                'https://onet.pl', 'https://onet.pl', ['https://wp.pl'],
+                'x@example.com', '123123123'
+            ),
+        ])
+
+    def test_toml(self):
+        try:
+            import tomllib  # noqa: F401
+        except ImportError:
+            self.skipTest('tomllib requires python>=3.11')
+        file_path = self.write('groups.toml', (
+            '[[groups]]\n'
+            'name = "shop"\n'
+            'url = "https://example.com"\n'
+            'competitors = ["https://wp.pl"]\n'
+        ))
+        groups = load_config(file_path)
+        self.assertEqual(groups[0].competitors, ['https://wp.pl'])
+
+    def test_invalid_main_url(self):
+        file_path = self.write(
+            'groups.json', json.dumps({'groups': [{'url': 'www'}]})
+        )
+        with self.assertRaises(ValueError):
+            load_config(file_path)
+
+    def test_invalid_mail(self):
+        file_path = self.write('groups.json', json.dumps({'groups': [
+            {'url': 'https://example.com', 'mail': 'abcd'}
+        ]}))
+        with self.assertRaises(ValueError):
+            load_config(file_path)
+
+    def test_without_groups(self):
+        file_path = self.write('groups.json', '{}')
+        with self.assertRaises(ValueError):
+            load_config(file_path)
+
+    def test_unknown_format(self):
+        file_path = self.write('groups.ini', '')
+        with self.assertRaises(ValueError):
+            load_config(file_path)
@@ -0,0 +1,76 @@
+import unittest
+
+from website_measure.decision import AlertPolicy
+from website_measure.website import WebsiteMeasurement
+
+
+def get_website(url, values):
+    website = WebsiteMeasurement(url, 0, values[0])
+    for value in values[1:]:
+        website.add_sample(0, value)
+    return website
+
+
+class TestAlertPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = AlertPolicy()
+        self.competitor = get_website(
+            'https://wp.pl', [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 1.02, 0.98]
+        )
+
+    def test_compare_slower(self):
+        main = get_website(
+            'https://onet.pl', [2.5, 2.6, 2.4, 2.55, 2.45, 2.5, 2.52, 2.48]
+        )
+        comparison = self.policy.compare(main, self.competitor)
+        self.assertTrue(comparison.mail)
+        self.assertTrue(comparison.sms)
+        self.assertAlmostEqual(comparison.ratio, 2.5, 2)
+        self.assertLess(comparison.mail_p_value, 0.05)
+
+    def test_compare_outlier(self):
+        main = get_website(
+            'https://onet.pl', [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 1.02, 30.0]
+        )
+        comparison = self.policy.compare(main, self.competitor)
+        self.assertFalse(comparison.mail)
+        self.assertFalse(comparison.sms)
+        self.assertAlmostEqual(comparison.ratio, 1.0, 1)
+
+    def test_compare_ratios(self):
+        main = get_website(
+            'https://onet.pl', [1.5, 1.6, 1.4, 1.55, 1.45, 1.5, 1.52, 1.48]
+        )
+        comparison = self.policy.compare(main, self.competitor)
+        self.assertTrue(comparison.mail)
+        self.assertFalse(comparison.sms)
+        policy = AlertPolicy(mail_ratio=2.0, sms_ratio=3.0)
+        self.assertFalse(policy.compare(main, self.competitor).mail)
+
+    def test_compare_few_samples(self):
+        main = get_website('https://onet.pl', [2.0])
+        competitor = get_website('https://wp.pl', [1.0])
+        comparison = self.policy.compare(main, competitor)
+        self.assertTrue(comparison.mail)
+        self.assertTrue(comparison.sms)
+        self.assertIsNone(comparison.mail_p_value)
+
+    def test_compare_few_samples_spike(self):
+        main = get_website('https://onet.pl', [1.0, 1.0, 1.0, 10.0])
+        competitor = get_website('https://wp.pl', [1.5] * 4)
+        comparison = self.policy.compare(main, competitor)
+        self.assertFalse(comparison.mail)
+        self.assertFalse(comparison.sms)
+        self.assertAlmostEqual(comparison.ratio, 2 / 3)
+
+    def test_compare_all_skips_failed(self):
+        main = get_website('https://onet.pl', [2.0])
+        failed = WebsiteMeasurement.from_error('https://wp.pl', 'dns')
+        self.assertEqual(self.policy.compare_all(main, [failed]), [])
+
+    def test_compare_all_skips_main(self):
+        main = get_website('https://onet.pl', [2.0])
+        self.assertEqual(self.policy.compare_all(main, [main]), [])
+        comparisons = self.policy.compare_all(main, [main, self.competitor])
+        self.assertEqual(len(comparisons), 1)
+        self.assertEqual(comparisons[0].url, 'https://wp.pl')
@@ -0,0 +1,67 @@
+import gzip
+import unittest
+import zlib
+
+from website_measure.decode import (
+    DecodeError, StreamDecoder, get_accept_encoding, get_brotli, get_decoder,
+)
+
+
+class TestStreamDecoder(unittest.TestCase):
+    def setUp(self):
+        self.data = b'website load measure ' * 10000
+
+    def decode(self, encoding, compressed):
+        decoder = get_decoder(encoding)
+        sink = bytearray()
+        decoded = 0
+        for index in range(0, len(compressed), 1000):
+            decoded += decoder.decode(compressed[index:index + 1000], sink)
+        decoded += decoder.flush(sink)
+        return decoded, bytes(sink)
+
+    def test_gzip(self):
+        decoded, sink = self.decode('gzip', gzip.compress(self.data))
+        self.assertEqual(decoded, len(self.data))
+        self.assertEqual(sink, self.data)
+
+    def test_deflate(self):
+        self.assertEqual(
+            self.decode('deflate', zlib.compress(self.data))[1], self.data
+        )
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        raw = compressor.compress(self.data) + compressor.flush()
+        self.assertEqual(self.decode('Deflate', raw)[1], self.data)
+
+    def test_brotli(self):
+        brotli = get_brotli()
+        if brotli is None:
+            self.assertNotIn('br', get_accept_encoding())
+            self.assertIsNone(get_decoder('br'))
+            return
+        self.assertIn('br', get_accept_encoding())
+        self.assertEqual(
+            self.decode('br', brotli.compress(self.data))[1], self.data
+        )
+
+    def test_corrupt(self):
+        with self.assertRaises(DecodeError):
+            self.decode('gzip', b'not gzip data')
+        with self.assertRaises(DecodeError):
+            self.decode('deflate', b'not deflate data')
+
+    def test_truncated(self):
+        with self.assertRaises(DecodeError):
+            self.decode('gzip', gzip.compress(self.data)[:500])
+
+    def test_flush_without_data(self):
+        self.assertEqual(get_decoder('gzip').flush(), 0)
+
+    def test_get_decoder_identity(self):
+        self.assertIsNone(get_decoder(None))
+        self.assertIsNone(get_decoder('identity'))
+        self.assertIsNone(get_decoder('zstd'))
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            StreamDecoder('zstd')
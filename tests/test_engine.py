@@ -0,0 +1,141 @@
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer
+
+from tests.test_backend import Handler
+from website_measure.engine import MeasureEngine, ProcessEngine
+from website_measure.website import WebsiteMeasurement
+
+
+class TestMeasureEngine(unittest.TestCase):
+    def setUp(self):
+        self.urls = [
+            'https://facebook.com', 'https://wp.pl', 'https://onet.pl'
+        ]
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def measure(self, url):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        return WebsiteMeasurement(url, 1, 2)
+
+    def test_measure_all_keeps_order(self):
+        engine = MeasureEngine(self.measure, concurrency=3)
+        measured = engine.measure_all(self.urls)
+        self.assertEqual([page.url for page in measured], self.urls)
+
+    def test_measure_all_parallel(self):
+        engine = MeasureEngine(self.measure, concurrency=3)
+        engine.measure_all(self.urls)
+        self.assertEqual(self.max_running, 3)
+
+    def test_measure_all_concurrency_limit(self):
+        engine = MeasureEngine(self.measure, concurrency=2)
+        engine.measure_all(self.urls * 2)
+        self.assertLessEqual(self.max_running, 2)
+
+    def test_executor_reused(self):
+        with MeasureEngine(self.measure) as engine:
+            engine.measure_all(self.urls)
+            executor = engine.executor
+            engine.measure_all(self.urls)
+            self.assertIs(engine.executor, executor)
+        self.assertIsNone(engine.executor)
+
+    def test_measure_all_empty(self):
+        self.assertEqual(MeasureEngine(self.measure).measure_all([]), [])
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            MeasureEngine(self.measure, concurrency=0)
+
+    def test_measure_all_timeout(self):
+        def measure(url):
+            if url == self.urls[1]:
+                time.sleep(0.5)
+            return WebsiteMeasurement(url, 1, 2)
+        with MeasureEngine(measure, concurrency=3) as engine:
+            measured = engine.measure_all(self.urls, timeout=0.2)
+        self.assertEqual(measured[0].url, self.urls[0])
+        self.assertIsNone(measured[1])
+        self.assertEqual(measured[2].url, self.urls[2])
+
+    def test_measure_all_raises(self):
+        def measure(url):
+            raise ValueError
+        with self.assertRaises(ValueError):
+            MeasureEngine(measure).measure_all(self.urls)
+
+
+class TestProcessEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.thread = threading.Thread(
+            target=cls.server.serve_forever, daemon=True
+        )
+        cls.thread.start()
+        port = cls.server.server_address[1]
+        cls.urls = [f'http://127.0.0.1:{port}/{index}' for index in range(5)]
+        cls.settings = {
+            'samples': 2, 'mode': 'cold', 'max_bytes': None,
+            'connect_timeout': 1, 'read_timeout': 1, 'deadline': None,
+            'full_page': False, 'parallelism': 6, 'compression': 'on',
+            'dns': 'pre-resolve', 'host_concurrency': 2, 'host_rate': None,
+            'in_flight': None,
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_get_shards(self):
+        engine = ProcessEngine(self.settings, processes=2)
+        self.assertEqual(
+            engine.get_shards(['a', 'b', 'c']), [['a', 'c'], ['b']]
+        )
+        self.assertEqual(engine.get_shards(['a']), [['a']])
+
+    def test_measure_all(self):
+        with ProcessEngine(self.settings, processes=2, concurrency=2) as \
+                engine:
+            measured = engine.measure_all(self.urls)
+            self.assertEqual(engine.measure_all([]), [])
+        self.assertIsNone(engine.executor)
+        self.assertEqual([page.url for page in measured], self.urls)
+        for page in measured:
+            self.assertEqual(len(page.samples), 2)
+            self.assertEqual(list(page.byte_samples), [1024, 1024])
+
+    def test_measure_all_deadline(self):
+        slow_url = self.urls[0].rsplit('/', 1)[0] + '/slow'
+        urls = [self.urls[0], slow_url, self.urls[2]]
+        with ProcessEngine(self.settings, processes=1, concurrency=3) as \
+                engine:
+            measured = engine.measure_all(urls, timeout=0.3)
+        self.assertEqual(measured[0].url, self.urls[0])
+        self.assertIsNone(measured[1])
+        self.assertEqual(measured[2].url, self.urls[2])
+
+    def test_close_does_not_wait(self):
+        engine = ProcessEngine(self.settings, processes=1)
+        engine.measure_all([self.urls[0]])
+        engine.futures = [
+            engine.executor.submit(time.sleep, 30) for _ in range(2)
+        ]
+        start = time.monotonic()
+        engine.close(timeout=0.1)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertIsNone(engine.executor)
+
+    def test_invalid_processes(self):
+        with self.assertRaises(ValueError):
+            ProcessEngine(self.settings, processes=0)
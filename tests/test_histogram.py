@@ -0,0 +1,79 @@
+import random
+import unittest
+
+from website_measure import stats
+from website_measure.histogram import Histogram
+
+
+class TestHistogram(unittest.TestCase):
+    def setUp(self):
+        generator = random.Random(1)
+        self.values = [generator.lognormvariate(-2, 1) for _ in range(5000)]
+        self.histogram = Histogram.from_values(self.values)
+
+    def test_get_index(self):
+        histogram = Histogram()
+        previous = -1
+        for units in range(0, 50000, 7):
+            index = histogram.get_index(units * 1e-6)
+            self.assertGreaterEqual(index, previous)
+            self.assertLessEqual(
+                abs(histogram.get_value(index) - units * 1e-6),
+                max(1e-6, units * 1e-6 / histogram.half)
+            )
+            previous = index
+
+    def test_percentile(self):
+        ordered = sorted(self.values)
+        for percent in (50, 90, 99):
+            expected = stats.percentile(ordered, percent)
+            self.assertAlmostEqual(
+                self.histogram.percentile(percent), expected,
+                delta=expected * 0.01
+            )
+        self.assertEqual(self.histogram.percentile(0), ordered[0])
+        self.assertEqual(self.histogram.percentile(100), ordered[-1])
+        with self.assertRaises(ValueError):
+            Histogram().percentile(50)
+
+    def test_exact_values(self):
+        self.assertEqual(len(self.histogram), 5000)
+        self.assertAlmostEqual(self.histogram.mean, stats.mean(self.values))
+        self.assertAlmostEqual(
+            self.histogram.stddev, stats.stddev(self.values)
+        )
+        self.assertEqual(
+            set(self.histogram.summarize()),
+            {'min', 'median', 'mean', 'p90', 'p95', 'p99', 'stddev'}
+        )
+
+    def test_constant_memory(self):
+        buckets = len(self.histogram.counts)
+        for value in self.values * 3:
+            self.histogram.record(value)
+        self.assertEqual(len(self.histogram.counts), buckets)
+        self.assertLess(buckets, 2000)
+
+    def test_merge(self):
+        first = Histogram.from_values(self.values[:2000])
+        second = Histogram.from_values(self.values[2000:])
+        first.merge(second)
+        self.assertEqual(first.counts, self.histogram.counts)
+        self.assertEqual(first.max, self.histogram.max)
+        self.assertEqual(first.percentile(95), self.histogram.percentile(95))
+        with self.assertRaises(ValueError):
+            first.merge(Histogram(digits=3))
+
+    def test_serialization(self):
+        data = self.histogram.to_bytes()
+        self.assertLess(len(data), len(self.values) * 8)
+        copied = Histogram.from_bytes(data)
+        self.assertEqual(copied.counts, self.histogram.counts)
+        self.assertEqual(copied.count, self.histogram.count)
+        self.assertEqual(copied.mean, self.histogram.mean)
+        copied = Histogram.from_text(self.histogram.to_text())
+        self.assertEqual(copied.percentile(99), self.histogram.percentile(99))
+
+    def test_invalid_digits(self):
+        with self.assertRaises(ValueError):
+            Histogram(digits=0)
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from website_measure.history import HistorySample, HistoryStore
+from website_measure.website import WebsiteMeasurement
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(
+            os.path.join(self.directory.name, 'history.sqlite3'),
+            batch_size=2
+        )
+        self.store.open()
+        self.website = WebsiteMeasurement(
+            'https://wp.pl', 0, 1, dns=0.1, bytes_transferred=100
+        )
+        self.website.add_sample(0, 2, {'dns': 0.2}, 200)
+        self.website.variants['warm'] = WebsiteMeasurement(
+            'https://wp.pl', 0, 0.5, mode='warm'
+        )
+        self.other = WebsiteMeasurement('https://onet.pl', 0, 3)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_add_query(self):
+        self.store.add('run-1', [self.website, self.other], 100.0)
+        self.store.add('run-2', [self.website], 200.0)
+        self.store.flush()
+        samples = self.store.query('https://wp.pl')
+        self.assertEqual(len(samples), 6)
+        self.assertIsInstance(samples[0], HistorySample)
+        self.assertEqual(
+            [(s.sample, s.time, s.dns, s.bytes) for s in samples[:2]],
+            [(0, 1.0, 0.1, 100), (1, 2.0, 0.2, 200)]
+        )
+        self.assertEqual(samples[2].mode, 'warm')
+
+    def test_query_time_range(self):
+        self.store.add('run-1', [self.other], 100.0)
+        self.store.add('run-2', [self.other], 200.0)
+        self.store.add('run-3', [self.other], 300.0)
+        self.store.flush()
+        samples = self.store.query('https://onet.pl', 150, 300)
+        self.assertEqual([s.run_id for s in samples], ['run-2', 'run-3'])
+        self.assertEqual(len(self.store.query('https://onet.pl', end=100)), 1)
+
+    def test_persistent(self):
+        self.store.add('run-1', [self.other], 100.0)
+        self.store.close()
+        store = HistoryStore(self.store.file_path)
+        store.open()
+        store.add('run-2', [self.other], 200.0)
+        store.close()
+        self.assertEqual(len(store.query('https://onet.pl')), 2)
+
+    def test_query_histogram(self):
+        self.store.add('run-1', [self.website, self.other], 100.0)
+        self.store.add('run-2', [self.website], 200.0)
+        self.store.flush()
+        histogram = self.store.query_histogram('https://wp.pl')
+        self.assertEqual(histogram.count, 6)
+        self.assertEqual(histogram.max, 2.0)
+        histogram = self.store.query_histogram(
+            'https://wp.pl', start=150, mode='warm'
+        )
+        self.assertEqual(histogram.count, 1)
+        self.assertEqual(histogram.min, 0.5)
+
+    def test_histograms_only(self):
+        self.store.keep_samples = False
+        self.store.add('run-1', [self.website], 100.0)
+        self.store.flush()
+        self.assertEqual(self.store.query('https://wp.pl'), [])
+        self.assertEqual(self.store.query_histogram('https://wp.pl').count, 3)
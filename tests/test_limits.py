@@ -0,0 +1,87 @@
+import threading
+import unittest
+from time import monotonic, sleep
+from unittest.mock import patch
+
+from website_measure.limits import HostLimiter, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    @patch('website_measure.limits.monotonic')
+    def test_reserve(self, mock):
+        mock.return_value = 100.0
+        bucket = TokenBucket(rate=2, burst=2)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.5)
+        self.assertEqual(bucket.reserve(), 1.0)
+        mock.return_value = 110.0
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.tokens, 1)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestHostLimiter(unittest.TestCase):
+    def load(self, limiter, url, results, lock, active):
+        with limiter.limit(url) as queue:
+            with lock:
+                active[url] = active.get(url, 0) + 1
+                results.append((url, active[url], queue))
+            sleep(0.05)
+            with lock:
+                active[url] -= 1
+
+    def run_loads(self, limiter, urls):
+        results = []
+        lock = threading.Lock()
+        active = {}
+        threads = [
+            threading.Thread(
+                target=self.load, args=(limiter, url, results, lock, active)
+            ) for url in urls
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_get_origin(self):
+        self.assertEqual(
+            HostLimiter.get_origin('https://wp.pl/a?b=1'), 'https://wp.pl:443'
+        )
+        self.assertEqual(
+            HostLimiter.get_origin('http://wp.pl:8080/'), 'http://wp.pl:8080'
+        )
+
+    def test_host_concurrency(self):
+        limiter = HostLimiter(host_concurrency=2)
+        results = self.run_loads(
+            limiter, ['http://wp.pl/'] * 6 + ['http://onet.pl/'] * 2
+        )
+        self.assertLessEqual(
+            max(active for url, active, _ in results if 'wp.pl' in url), 2
+        )
+        self.assertEqual(
+            max(active for url, active, _ in results if 'onet' in url), 2
+        )
+        self.assertGreater(max(queue for _, _, queue in results), 0)
+
+    def test_in_flight(self):
+        limiter = HostLimiter(in_flight=1)
+        start = monotonic()
+        self.run_loads(limiter, ['http://wp.pl/', 'http://onet.pl/'])
+        self.assertGreaterEqual(monotonic() - start, 0.1)
+
+    def test_host_rate(self):
+        limiter = HostLimiter(host_rate=20)
+        start = monotonic()
+        for _ in range(3):
+            with limiter.limit('http://wp.pl/'):
+                pass
+        self.assertGreaterEqual(monotonic() - start, 0.09)
+        with limiter.limit('http://onet.pl/') as queue:
+            self.assertLess(queue, 10_000_000)
@@ -0,0 +1,77 @@
+import socket
+import unittest
+from unittest.mock import patch
+
+from website_measure.backend import MeasureBackend
+from website_measure.benchmark import StandInServer
+from website_measure.histogram import Histogram
+from website_measure.load import LoadStep, LoadTest, get_saturation
+
+
+class TestLoadStep(unittest.TestCase):
+    def test_throughput(self):
+        step = LoadStep(
+            2, 2.0, latencies=Histogram.from_values([0.1, 0.2, 0.3])
+        )
+        self.assertEqual(step.requests, 3)
+        self.assertEqual(step.throughput, 1.5)
+        self.assertEqual(LoadStep(1, 0).throughput, 0.0)
+
+    def test_to_text(self):
+        latencies = Histogram.from_values([0.005, 0.01, 0.3, 9.0])
+        step = LoadStep(1, 1.0, latencies=latencies)
+        text = step.to_text()
+        self.assertIn('p50: 0.01 p95: 9.0 p99: 9.0', text)
+        histogram = Histogram.from_text(text.split('histogram: ')[1])
+        self.assertEqual(histogram.count, 4)
+        self.assertNotIn('histogram', LoadStep(1, 1.0).to_text())
+
+    def test_get_saturation(self):
+        def step(clients, requests):
+            return LoadStep(
+                clients, 1.0, latencies=Histogram.from_values([0.1] * requests)
+            )
+        steps = [step(1, 10), step(2, 19), step(4, 36), step(8, 38)]
+        self.assertEqual(get_saturation(steps).clients, 8)
+        self.assertIsNone(get_saturation(steps[:3]))
+        self.assertIsNone(get_saturation([]))
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_run(self):
+        with StandInServer(latency=0.01, body_size=1024) as server:
+            backend = MeasureBackend()
+            steps = LoadTest(backend, duration=0.3).run(
+                server.get_url(), [1, 4]
+            )
+        self.assertEqual([step.clients for step in steps], [1, 4])
+        for step in steps:
+            self.assertGreater(step.requests, 0)
+            self.assertEqual(step.errors, 0)
+            self.assertGreaterEqual(step.latencies.min, 0.01)
+        self.assertGreater(steps[1].throughput, steps[0].throughput)
+        self.assertFalse(backend.pool.idle)
+
+    def test_stop_on_errors(self):
+        with StandInServer(latency=0, failure_rate=1.0) as server:
+            steps = LoadTest(MeasureBackend(), duration=5).run(
+                server.get_url(), [2, 4]
+            )
+        self.assertEqual(len(steps), 1)
+        self.assertTrue(steps[0].stopped)
+        self.assertEqual(steps[0].requests, 0)
+        self.assertLess(steps[0].duration, 2)
+        self.assertIn('stopped: error rate', steps[0].to_text())
+
+    def test_backoff_after_error(self):
+        with socket.socket() as listener:
+            listener.bind(('127.0.0.1', 0))
+            port = listener.getsockname()[1]
+        url = f'http://127.0.0.1:{port}/'
+        with patch('website_measure.load.LOAD_ERROR_MIN_LOADS', 10 ** 6):
+            step = LoadTest(MeasureBackend(), duration=0.5).run_step(
+                MeasureBackend(), url, 1
+            )
+        self.assertFalse(step.stopped)
+        self.assertGreater(step.errors, 0)
+        self.assertLess(step.errors, 10)
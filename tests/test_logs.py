@@ -0,0 +1,75 @@
+import logging
+import os
+import queue
+import tempfile
+import unittest
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from unittest.mock import patch
+
+import website_measure
+from website_measure.logs import (
+    DroppingQueueHandler, get_file_handler, get_log_level, get_setting,
+)
+
+
+class TestDroppingQueueHandler(unittest.TestCase):
+    def test_enqueue_full_queue(self):
+        records = queue.Queue(1)
+        handler = DroppingQueueHandler(records)
+        record = logging.makeLogRecord({'msg': 'example'})
+        handler.emit(record)
+        handler.emit(record)
+        self.assertEqual(records.qsize(), 1)
+        self.assertEqual(handler.dropped, 1)
+
+
+class TestLogSettings(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'wlm.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_setting(self):
+        with patch.dict(os.environ, {'WLM_LOG_MAX_BYTES': '100'}):
+            self.assertEqual(get_setting('LOG_MAX_BYTES', 5), 100)
+        self.assertEqual(get_setting('NOT_SET_SETTING', 5), 5)
+
+    def test_get_file_handler(self):
+        handler = get_file_handler(self.file_path)
+        self.assertIsInstance(handler, RotatingFileHandler)
+        handler.close()
+        with patch.dict(os.environ, {'WLM_LOG_ROTATE_WHEN': 'midnight'}):
+            handler = get_file_handler(self.file_path)
+        self.assertIsInstance(handler, TimedRotatingFileHandler)
+        handler.close()
+
+    def test_configure_logging(self):
+        website_measure.configure_logging(self.file_path)
+        try:
+            self.assertIsInstance(
+                website_measure.logger.handlers[0], DroppingQueueHandler
+            )
+            website_measure.logger.info('example message')
+        finally:
+            website_measure.shutdown_logging()
+        self.assertEqual(website_measure.logger.handlers, [])
+        with open(self.file_path) as file:
+            self.assertIn('example message', file.read())
+
+    def test_get_log_level(self):
+        logger = logging.getLogger('wlm-test')
+        self.assertEqual(get_log_level(logger), 'INFO')
+        with patch.dict(os.environ, {'WLM_LOG_LEVEL': 'debug'}):
+            self.assertEqual(get_log_level(logger), 'DEBUG')
+        with patch.dict(os.environ, {'WLM_LOG_LEVEL': 'LOUD'}), \
+                self.assertLogs(logger, 'WARNING') as logs:
+            self.assertEqual(get_log_level(logger), 'INFO')
+        self.assertIn('LOUD', logs.output[0])
+
+    def test_set_log_level(self):
+        level = website_measure.logger.level
+        website_measure.set_log_level('DEBUG')
+        self.assertEqual(website_measure.logger.level, logging.DEBUG)
+        website_measure.logger.setLevel(level)
@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch
 
-from website_measure.constants import MAIL_SUBJECT, MAIL_TEMPLATE
+from website_measure.constants import (
+    DIGEST_SUBJECT, MAIL_SUBJECT, MAIL_TEMPLATE,
+)
 from website_measure.mail import MailSender
 
 
@@ -28,3 +30,14 @@ class TestMailSender(unittest.TestCase):
             self.main_website_place, self.all_websites, self.recipient_mail
         )
         self.assertTrue(mock.called)
+
+    def test_prepare_digest_message(self):
+        alerts = [{
+            'date': '2019-09-23 21:33:04', 'main_url': 'https://wp.pl',
+            'main_website_place': 2, 'all_websites': 3,
+        }]
+        message = self.mail_sender.prepare_digest_message(
+            alerts, self.recipient_mail
+        )
+        self.assertTrue(DIGEST_SUBJECT in message)
+        self.assertTrue('https://wp.pl is 2 of 3 tested pages' in message)
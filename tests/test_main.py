@@ -1,13 +1,21 @@
 import io
+import json
+import os
+import socket
 import sys
 import tempfile
 import unittest
-from time import time
-from unittest.mock import patch
+from time import sleep, time
+from unittest.mock import MagicMock, patch
 
-from website_measure.constants import RESULT_TEMPLATE
+from website_measure.backend import PhaseTiming
+from website_measure.config import BenchmarkGroup
+from website_measure.constants import DEFAULT_INTERVAL, RESULT_TEMPLATE
+from website_measure.histogram import Histogram
+from website_measure.load import LoadStep
 from website_measure.mail import MailSender
 from website_measure.main import WebsiteMeasure
+from website_measure.notify import Notification
 from website_measure.sms import DummySMSSender
 from website_measure.website import WebsiteMeasurement
 
@@ -104,6 +112,280 @@ class TestWebsiteMeasure(unittest.TestCase):
         self.assertEqual(parser.mail, None)
         self.assertEqual(parser.phone_number, self.phone_number)
 
+    def test_get_arguments_concurrency(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1, '-c', '4']
+        )
+        self.assertEqual(parser.concurrency, 4)
+
+    def test_get_arguments_invalid_concurrency(self):
+        with self.assertRaises(SystemExit):
+            self.measure.get_arguments(
+                ['-u', self.main_website, '-l', self.other_website_1,
+                 '-c', '0']
+            )
+
+    def test_get_arguments_processes(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1,
+             '--processes', '4']
+        )
+        self.assertEqual(parser.processes, 4)
+
+    @patch('website_measure.main.ProcessEngine')
+    def test_measure_urls_processes(self, mock_engine):
+        mock_engine.return_value.measure_all.side_effect = \
+            lambda urls, timeout: [
+                self.get_website_object(url) for url in urls
+            ]
+        self.measure.processes = 2
+        measured = self.measure.measure_urls(
+            [self.main_website, self.other_website_1, self.main_website]
+        )
+        self.assertEqual(
+            list(measured), [self.main_website, self.other_website_1]
+        )
+        mock_engine.assert_called_once_with(
+            self.measure.get_settings(), 2, self.measure.concurrency
+        )
+
+    def test_get_arguments_samples(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1,
+             '-s', '5', '-r', 'p95']
+        )
+        self.assertEqual(parser.samples, 5)
+        self.assertEqual(parser.rank_by, 'p95')
+
+    @patch.object(WebsiteMeasure, 'load_website')
+    def test_measure_load_time_samples(self, mock):
+        mock.side_effect = [
+            PhaseTiming(0, end_ns, download=end_ns)
+            for end_ns in (100_000_000, 300_000_000, 200_000_000)
+        ]
+        self.measure.samples = 3
+        measure = self.measure.measure_load_time(self.main_website)
+        self.assertEqual(mock.call_count, 3)
+        self.assertEqual(list(measure.samples), [0.1, 0.3, 0.2])
+        self.assertEqual(measure.get_statistic('median'), 0.2)
+        self.assertEqual(measure.get_statistic('min', 'download'), 0.1)
+
+    @patch.object(WebsiteMeasure, 'load_website')
+    def test_measure_load_time_both_modes(self, mock):
+        mock.return_value = PhaseTiming(0, 100_000_000)
+        self.measure.mode = 'both'
+        with patch.object(self.measure.backend, 'is_warm', return_value=True):
+            measure = self.measure.measure_load_time(self.main_website)
+        self.assertEqual(measure.mode, 'cold')
+        self.assertEqual(measure.variants['warm'].mode, 'warm')
+        self.assertEqual(
+            [call.args[1] for call in mock.call_args_list], [False, True]
+        )
+
+    @patch.object(WebsiteMeasure, 'load_website')
+    def test_measure_load_time_warm_primes_connection(self, mock):
+        mock.return_value = PhaseTiming(0, 100_000_000)
+        self.measure.mode = 'warm'
+        measure = self.measure.measure_load_time(self.main_website)
+        self.assertEqual(measure.mode, 'warm')
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(len(measure.samples), 1)
+
+    def test_get_arguments_max_bytes(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1,
+             '--max-bytes', '1024']
+        )
+        self.assertEqual(parser.max_bytes, 1024)
+
+    def test_get_arguments_interval(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1,
+             '--interval', '60', '--jitter', '5']
+        )
+        self.assertEqual(parser.interval, 60)
+        self.assertEqual(parser.jitter, 5)
+
+    @patch.object(WebsiteMeasure, 'run_round')
+    @patch('website_measure.main.Scheduler')
+    def test_run_serve(self, mock_scheduler, mock_round):
+        argv = ['wlm', 'serve', '-u', self.main_website,
+                '-l', self.other_website_1]
+        with patch.object(sys, 'argv', argv):
+            self.measure.run()
+        self.assertEqual(mock_scheduler.call_args.args[1], DEFAULT_INTERVAL)
+        self.assertTrue(mock_scheduler.return_value.run.called)
+        self.assertFalse(mock_round.called)
+
+    @patch.object(WebsiteMeasure, 'run_round')
+    def test_run_single_round(self, mock_round):
+        argv = ['wlm', '-u', self.main_website, '-l', self.other_website_1]
+        with patch.object(sys, 'argv', argv):
+            self.measure.run()
+        mock_round.assert_called_once_with([BenchmarkGroup(
+            None, self.main_website, [self.other_website_1]
+        )])
+
+    @patch.object(WebsiteMeasure, 'run_round')
+    def test_run_config(self, mock_round):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'groups.json')
+            with open(file_path, 'w') as file:
+                json.dump({'groups': [
+                    {'name': 'one', 'url': self.main_website,
+                     'competitors': [self.other_website_1]}
+                ]}, file)
+            argv = ['wlm', '--config', file_path, '-m', self.mail]
+            with patch.object(sys, 'argv', argv):
+                self.measure.run()
+        mock_round.assert_called_once_with([BenchmarkGroup(
+            'one', self.main_website, [self.other_website_1], self.mail
+        )])
+
+    def test_get_arguments_without_url(self):
+        with self.assertRaises(SystemExit), patch('sys.stderr'):
+            self.measure.get_arguments(['-l', self.other_website_1])
+
+    def test_get_arguments_config_with_urls(self):
+        for args in (['-u', self.main_website],
+                     ['-l', self.other_website_1],
+                     ['--list-file', 'urls.txt']):
+            with self.assertRaises(SystemExit), patch('sys.stderr'):
+                self.measure.get_arguments(['--config', 'wlm.json'] + args)
+        parsed = self.measure.get_arguments(['--config', 'wlm.json'])
+        self.assertEqual(parsed.config, 'wlm.json')
+
+    @patch.object(WebsiteMeasure, 'write_result')
+    @patch.object(WebsiteMeasure, 'print_result')
+    @patch.object(WebsiteMeasure, 'send_notifications')
+    @patch.object(WebsiteMeasure, 'measure_load_time')
+    def test_run_round_groups_share_measurements(self, mock, *_):
+        mock.side_effect = lambda url: self.get_website_object(url, 0, 0.1)
+        self.measure.history = MagicMock()
+        groups = [
+            BenchmarkGroup('one', self.main_website, [self.other_website_1]),
+            BenchmarkGroup('two', self.other_website_1, [self.main_website]),
+        ]
+        with patch('website_measure.main.WriteFile'):
+            self.measure.run_round(groups)
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(len(self.measure.history.add.call_args.args[1]), 2)
+        self.assertEqual(self.measure.result_data['group'], 'two')
+        self.assertEqual(self.measure.main_website.url, self.other_website_1)
+        self.assertIn('run_id', self.measure.result_data)
+
+    @patch.object(WebsiteMeasure, 'send_notifications')
+    @patch.object(WebsiteMeasure, 'measure_load_time')
+    def test_run_round_aggregates(self, mock, _):
+        mock.side_effect = lambda url: self.get_website_object(url, 0, 0.1)
+        self.measure.serve = True
+        groups = [
+            BenchmarkGroup('one', self.main_website, [self.other_website_1])
+        ]
+        with patch('website_measure.main.WriteFile'):
+            self.measure.run_round(groups)
+            self.measure.run_round(groups)
+        self.assertEqual(self.measure.aggregates[self.main_website].count, 2)
+        self.assertIn('samples: 2', self.measure.result_data['all_rounds'])
+        self.assertIn('all_rounds_histogram', self.measure.result_data)
+
+    def test_save_history(self):
+        self.measure.history = MagicMock()
+        run_id = self.measure.save_history(self.measure.websites_list, 100.0)
+        self.measure.history.add.assert_called_once_with(
+            run_id, self.measure.websites_list, 100.0
+        )
+
+    def test_get_arguments_list_file(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '--list-file', 'urls.txt',
+             '--list-file', '-']
+        )
+        self.assertEqual(parser.list, None)
+        self.assertEqual(parser.list_file, ['urls.txt', '-'])
+
+    def test_get_arguments_without_list(self):
+        with self.assertRaises(SystemExit):
+            self.measure.get_arguments(['-u', self.main_website])
+
+    def test_collect_urls(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1,
+             self.main_website, 'www', '--list-file', '-']
+        )
+        stdin = io.StringIO(f'{self.other_website_2}\n{self.other_website_1}')
+        with patch('sys.stdin', stdin), patch('sys.stderr', io.StringIO()):
+            urls = self.measure.collect_urls(parser, self.main_website)
+        self.assertEqual(urls, [self.other_website_1, self.other_website_2])
+
+    def test_get_arguments_log_level(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1,
+             '--log-level', 'debug']
+        )
+        self.assertEqual(parser.log_level, 'DEBUG')
+
+    def test_get_arguments_notify_timeout(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1,
+             '--notify-timeout', '0']
+        )
+        self.assertEqual(parser.notify_timeout, 0)
+
+    def test_close_dispatcher(self):
+        self.measure.dispatcher = MagicMock()
+        dispatcher = self.measure.dispatcher
+        self.measure.notify_timeout = 5
+        self.measure.close()
+        dispatcher.close.assert_called_once_with(5)
+        self.assertIsNone(self.measure.dispatcher)
+
+    def test_notify_cooldown_and_digest(self):
+        self.measure.main_website.ranking_place = 2
+        self.measure.dispatcher = MagicMock()
+        self.measure.alerts = MagicMock(digest_window=60)
+        self.measure.alerts.should_send.return_value = False
+        self.measure.notify('mail', self.mail)
+        self.measure.notify('sms', self.phone_number)
+        notification = self.measure.alerts.add_to_digest.call_args.args[0]
+        self.assertEqual(notification.main_url, self.main_website)
+        self.assertFalse(self.measure.dispatcher.send.called)
+
+    def test_mark_delivered(self):
+        self.measure.alerts = MagicMock()
+        mail = Notification('mail', 2, 3, self.mail)
+        self.measure.mark_delivered(mail)
+        self.measure.mark_delivered(Notification('digest', 0, 0, self.mail))
+        self.measure.alerts.mark_sent.assert_called_once_with(mail)
+
+    def test_get_arguments_metric(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1,
+             '--metric', 'ttfb']
+        )
+        self.assertEqual(parser.metric, 'ttfb')
+
+    @patch.object(WebsiteMeasure, 'measure_load_time')
+    def test_compare_websites_ranking(self, mock):
+        times = {
+            self.main_website: 0.3,
+            self.other_website_1: 0.1,
+            self.other_website_2: 0.2
+        }
+        mock.side_effect = lambda url: self.get_website_object(
+            url, 0, times[url]
+        )
+        self.measure.concurrency = 2
+        self.measure.compare_websites(
+            self.main_website, [self.other_website_1, self.other_website_2]
+        )
+        self.assertEqual(self.measure.main_website.url, self.main_website)
+        self.assertEqual(self.measure.main_website.ranking_place, 3)
+        self.assertEqual(
+            [page.url for page in self.measure.websites_list],
+            [self.other_website_1, self.other_website_2, self.main_website]
+        )
+
     def test_compare_websites(self):
         self.assertEqual(self.measure.result_data, None)
         websites = [self.other_website_1, self.other_website_2]
@@ -129,6 +411,169 @@ class TestWebsiteMeasure(unittest.TestCase):
         else:
             assert False
 
+    @patch.object(WebsiteMeasure, 'load_website')
+    def test_measure_load_time_failed(self, mock):
+        mock.side_effect = socket.timeout('timed out')
+        website = self.measure.measure_load_time(self.main_website)
+        self.assertEqual(website.error, 'timeout')
+
+    @patch.object(WebsiteMeasure, 'load_website')
+    def test_measure_urls_unexpected_error(self, mock):
+        def load_website(url, reuse=False, compress=True):
+            if url == self.other_website_1:
+                raise ValueError('unknown url type: ftp')
+            return PhaseTiming(0, 1000)
+        mock.side_effect = load_website
+        measured = self.measure.measure_urls(
+            [self.main_website, self.other_website_1]
+        )
+        self.assertFalse(measured[self.main_website].is_failed())
+        self.assertEqual(measured[self.other_website_1].error, 'error')
+
+    @patch.object(WebsiteMeasure, 'load_website')
+    def test_measure_urls_deadline(self, mock):
+        def load_website(url, reuse=False, compress=True):
+            if url == self.other_website_1:
+                sleep(0.5)
+            return PhaseTiming(0, 1000)
+        mock.side_effect = load_website
+        self.measure.deadline = 0.2
+        measured = self.measure.measure_urls(
+            [self.main_website, self.other_website_1]
+        )
+        self.assertFalse(measured[self.main_website].is_failed())
+        self.assertEqual(measured[self.other_website_1].error, 'deadline')
+        self.measure.rank_group(
+            measured, self.main_website, [self.other_website_1]
+        )
+        self.assertEqual(self.measure.main_website.ranking_place, 1)
+
+    @patch.object(WebsiteMeasure, 'load_website')
+    def test_measure_urls_adaptive(self, mock):
+        loads = {}
+
+        def load_website(url, reuse=False, compress=True):
+            loads[url] = loads.get(url, 0) + 1
+            if url == self.main_website:
+                return PhaseTiming(0, 10_000_000)
+            return PhaseTiming(0, (1 + loads[url] % 3) * 1_000_000_000)
+        mock.side_effect = load_website
+        self.measure.max_samples = 12
+        measured = self.measure.measure_urls(
+            [self.main_website, self.other_website_1, self.other_website_2]
+        )
+        main_website = measured[self.main_website]
+        self.assertEqual(len(main_website.samples), 5)
+        self.assertEqual(main_website.confidence, 0)
+        for url in (self.other_website_1, self.other_website_2):
+            self.assertEqual(len(measured[url].samples), 12)
+            self.assertGreater(measured[url].confidence, 0.05)
+        self.assertIn('confidence: ±0.0%', main_website.get_result_text())
+
+    @patch.object(WebsiteMeasure, 'load_website')
+    def test_measure_urls_adaptive_stopped(self, mock):
+        loads = {}
+
+        def load_website(url, reuse=False, compress=True):
+            loads[url] = loads.get(url, 0) + 1
+            if url == self.other_website_1 and loads[url] > 1:
+                raise socket.timeout('timed out')
+            return PhaseTiming(0, (1 + loads[url] % 3) * 1_000_000_000)
+        mock.side_effect = load_website
+        self.measure.max_samples = 9
+        measured = self.measure.measure_urls(
+            [self.main_website, self.other_website_1]
+        )
+        self.assertEqual(len(measured[self.other_website_1].samples), 1)
+        self.assertIsNone(measured[self.other_website_1].confidence_low)
+        self.assertEqual(len(measured[self.main_website].samples), 9)
+
+    @patch.object(WebsiteMeasure, 'fetch')
+    def test_measure_load_time_limits(self, mock):
+        def fetch(url, reuse=False, compress=True):
+            sleep(0.05)
+            return PhaseTiming(0, 1000)
+        mock.side_effect = fetch
+        settings = self.measure.get_settings()
+        settings['host_concurrency'] = 1
+        self.measure.apply_settings(settings)
+        measured = self.measure.measure_urls(
+            [self.main_website, self.main_website + '/a']
+        )
+        queue_times = sorted(
+            website.queue_time for website in measured.values()
+        )
+        self.assertLess(queue_times[0], 0.03)
+        self.assertGreater(queue_times[1], 0.03)
+        self.assertEqual(
+            [website.time for website in measured.values()], [1e-6, 1e-6]
+        )
+
+    @patch.object(WebsiteMeasure, 'load_website')
+    def test_measure_load_time_compression_both(self, mock):
+        mock.return_value = PhaseTiming(0, 1000, decoded_bytes=10)
+        self.measure.compression = 'both'
+        website = self.measure.measure_load_time(self.main_website)
+        self.assertEqual(website.decoded_bytes, 10)
+        self.assertEqual(
+            [call.args[2] for call in mock.call_args_list], [True, False]
+        )
+        self.assertEqual(list(website.variants), ['uncompressed'])
+
+    def test_get_arguments_timeouts(self):
+        parser = self.measure.get_arguments(
+            ['-u', self.main_website, '-l', self.other_website_1,
+             '--connect-timeout', '1', '--read-timeout', '2',
+             '--deadline', '60']
+        )
+        self.assertEqual(parser.connect_timeout, 1)
+        self.assertEqual(parser.read_timeout, 2)
+        self.assertEqual(parser.deadline, 60)
+
+    def test_apply_settings_dns(self):
+        settings = self.measure.get_settings()
+        settings['dns'] = 'cache'
+        self.measure.apply_settings(settings)
+        self.assertIsNotNone(self.measure.backend.resolver)
+        settings['dns'] = 'system'
+        self.measure.apply_settings(settings)
+        self.assertIsNone(self.measure.backend.resolver)
+
+    @patch('website_measure.resolver.Resolver.prefetch')
+    def test_prepare_dns(self, mock):
+        self.measure.prepare_dns([self.main_website])
+        mock.assert_not_called()
+        settings = self.measure.get_settings()
+        settings['dns'] = 'pre-resolve'
+        self.measure.apply_settings(settings)
+        self.measure.prepare_dns([self.main_website])
+        mock.assert_called_once_with(
+            [self.main_website], self.measure.concurrency
+        )
+
+    def test_get_arguments_load_test(self):
+        args = ['-u', self.main_website, '-l', self.other_website_1]
+        self.assertIsNone(self.measure.get_arguments(args).load_test)
+        parser = self.measure.get_arguments(args + ['--load-test'])
+        self.assertEqual(parser.load_test, [])
+        parser = self.measure.get_arguments(
+            args + ['--load-test', '1', '5', '--load-duration', '2']
+        )
+        self.assertEqual(parser.load_test, [1, 5])
+        self.assertEqual(parser.load_duration, 2)
+
+    def test_load_test_result(self):
+        self.measure.load_steps = [
+            LoadStep(1, 1.0, latencies=Histogram.from_values([0.1] * 10)),
+            LoadStep(2, 1.0, latencies=Histogram.from_values([0.2] * 10)),
+        ]
+        self.measure.prepare_additional_data()
+        self.assertEqual(self.measure.result_data['max_throughput'], 10)
+        self.assertEqual(self.measure.result_data['saturation'], '2 clients')
+        lines = self.measure.get_load_test_lines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn('throughput: 10.0 req/s', lines[1])
+
     def test_save_to_object(self):
         measure = self.measure.save_to_object(
             self.main_website, time(), time()
@@ -174,10 +619,64 @@ class TestWebsiteMeasure(unittest.TestCase):
         self.measure.send_notifications()
         self.assertFalse(mock.called)
 
+    @patch.object(MailSender, '__exit__')
+    @patch.object(MailSender, '__enter__', autospec=True)
     @patch.object(MailSender, 'send_message', create=True)
     @patch.object(DummySMSSender, 'send_message', create=True)
-    def test_send_notifications(self, mock_mail, mock_sms):
+    def test_send_notifications(self, mock_mail, mock_sms, mock_enter, _):
+        mock_enter.side_effect = lambda sender: sender
+        self.measure.main_website = self.get_website_object(
+            self.main_website, 0, 1
+        )
         self.measure.main_website.ranking_place = 2
+        self.measure.websites_list[0] = self.get_website_object(
+            self.other_website_1, 0, 0.4
+        )
         self.measure.send_notifications()
+        self.assertTrue(self.measure.dispatcher.wait(5))
         self.assertTrue(mock_mail.called)
         self.assertTrue(mock_sms.called)
+
+    @patch.object(WebsiteMeasure, 'notify')
+    def test_send_notifications_mail_only(self, mock):
+        self.measure.main_website = self.get_website_object(
+            self.main_website, 0, 1
+        )
+        self.measure.websites_list = [
+            self.get_website_object(self.other_website_1, 0, 0.6),
+            self.get_website_object(self.other_website_2, 0, 0.9),
+        ]
+        self.measure.send_notifications()
+        mock.assert_called_once_with('mail', None)
+
+    @patch.object(WebsiteMeasure, 'notify')
+    def test_send_notifications_ranked_first(self, mock):
+        main_website = self.get_website_object(self.main_website, 0, 1)
+        for value in (1, 1, 10):
+            main_website.add_sample(0, value)
+        competitor = self.get_website_object(self.other_website_1, 0, 1.5)
+        for _ in range(3):
+            competitor.add_sample(0, 1.5)
+        self.measure.main_website = main_website
+        self.measure.websites_list = [competitor]
+        self.measure.rank_by = 'median'
+        self.measure.prepare_additional_data()
+        self.assertEqual(main_website.ranking_place, 1)
+        self.measure.send_notifications()
+        mock.assert_not_called()
+
+        self.measure.policy.compare = MagicMock()
+        self.measure.send_notifications()
+        self.assertFalse(self.measure.policy.compare.called)
+
+    @patch.object(WebsiteMeasure, 'notify')
+    def test_send_notifications_not_significant(self, mock):
+        main_website = self.get_website_object(self.main_website, 0, 1)
+        competitor = self.get_website_object(self.other_website_1, 0, 1.1)
+        for value in (0.8, 1.2, 0.9, 1.3, 0.7, 5.0):
+            main_website.add_sample(0, value)
+            competitor.add_sample(0, value - 0.05)
+        self.measure.main_website = main_website
+        self.measure.websites_list = [competitor]
+        self.measure.send_notifications()
+        mock.assert_not_called()
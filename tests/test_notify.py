@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from website_measure.notify import Notification, NotificationDispatcher
+
+
+class TestNotificationDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = NotificationDispatcher(retries=2, backoff=0.001)
+        self.mail_sender = MagicMock()
+        self.mail_sender.send_message.return_value = True
+        self.sms_sender = MagicMock()
+        self.sms_sender.send_message.return_value = True
+        patch.object(
+            self.dispatcher, 'get_mail_sender', return_value=self.mail_sender
+        ).start()
+        self.dispatcher.sms_sender = self.sms_sender
+        self.addCleanup(patch.stopall)
+
+    def tearDown(self):
+        self.dispatcher.close(1)
+
+    def test_send(self):
+        self.dispatcher.send(Notification('mail', 2, 3, 'a@example.com'))
+        self.dispatcher.send(Notification('sms', 2, 3, '123123123'))
+        self.assertTrue(self.dispatcher.wait(5))
+        self.mail_sender.send_message.assert_called_once_with(
+            2, 3, 'a@example.com'
+        )
+        self.sms_sender.send_message.assert_called_once_with(
+            2, 3, '123123123'
+        )
+
+    def test_retry(self):
+        self.mail_sender.send_message.side_effect = [False, Exception, True]
+        notification = Notification('mail', 2, 3)
+        self.dispatcher.send(notification)
+        self.assertTrue(self.dispatcher.wait(5))
+        self.assertEqual(notification.attempts, 3)
+
+    def test_give_up_after_retries(self):
+        self.mail_sender.send_message.return_value = False
+        notification = Notification('mail', 2, 3)
+        self.dispatcher.send(notification)
+        self.assertTrue(self.dispatcher.wait(5))
+        self.assertEqual(notification.attempts, 3)
+
+    def test_on_delivered(self):
+        self.dispatcher.on_delivered = MagicMock()
+        self.mail_sender.send_message.side_effect = [True, False, False, False]
+        delivered = Notification('mail', 2, 3)
+        lost = Notification('mail', 3, 3)
+        self.dispatcher.send(delivered)
+        self.dispatcher.send(lost)
+        self.assertTrue(self.dispatcher.wait(5))
+        self.dispatcher.on_delivered.assert_called_once_with(delivered)
+
+    def test_mail_session_reused_with_keep_alive(self):
+        self.dispatcher.keep_alive = True
+        self.dispatcher.mail_sender = self.mail_sender
+        with patch.object(self.dispatcher, 'close_mail_sender') as close:
+            self.dispatcher.send(Notification('mail', 2, 3))
+            self.assertTrue(self.dispatcher.wait(5))
+            self.assertFalse(close.called)
+
+    def test_close_without_waiting(self):
+        self.mail_sender.send_message.return_value = False
+        self.dispatcher.backoff = 10
+        self.dispatcher.send(Notification('mail', 2, 3))
+        self.assertFalse(self.dispatcher.close(0))
+
+    def test_get_sms_sender_reused(self):
+        dispatcher = NotificationDispatcher()
+        self.assertIs(dispatcher.get_sms_sender(), dispatcher.get_sms_sender())
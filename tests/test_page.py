@@ -0,0 +1,152 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from website_measure.backend import MeasureBackend
+from website_measure.main import WebsiteMeasure
+from website_measure.page import PageLoader, get_resources
+
+HTML = b'''<html><head>
+<link rel="stylesheet" href="/style.css">
+<script src="app.js"></script>
+<script src="/async.js" async></script>
+</head><body>
+<img src="/image.png"><img src="/image.png#top"><img src="data:image/png,">
+<img src="/missing.png">
+</body></html>'''
+BROKEN_HTML = b'''<html><head>
+<link rel="stylesheet" href="/corrupt.css">
+</head><body><img src="/ftp.png"></body></html>'''
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        if self.path == '/missing.png':
+            self.send_error(404)
+            return
+        if self.path == '/ftp.png':
+            self.send_response(302)
+            self.send_header('Location', 'ftp://127.0.0.1/image.png')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/corrupt.css':
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', '7')
+            self.end_headers()
+            self.wfile.write(b'corrupt')
+            return
+        if self.path == '/broken':
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(BROKEN_HTML)))
+            self.end_headers()
+            self.wfile.write(BROKEN_HTML)
+            return
+        if self.path == '/':
+            body = HTML
+        else:
+            with Handler.lock:
+                Handler.running += 1
+                Handler.max_running = max(
+                    Handler.max_running, Handler.running
+                )
+            time.sleep(0.05)
+            with Handler.lock:
+                Handler.running -= 1
+            body = b'x' * 100
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPage(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.thread = threading.Thread(
+            target=cls.server.serve_forever, daemon=True
+        )
+        cls.thread.start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}/'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.max_running = 0
+
+    def test_get_resources(self):
+        resources = get_resources(HTML.decode(), 'https://wp.pl/page/')
+        self.assertEqual(
+            [(resource.url, resource.kind, resource.critical)
+             for resource in resources],
+            [
+                ('https://wp.pl/style.css', 'css', True),
+                ('https://wp.pl/page/app.js', 'js', True),
+                ('https://wp.pl/async.js', 'js', False),
+                ('https://wp.pl/image.png', 'img', False),
+                ('https://wp.pl/missing.png', 'img', False),
+            ]
+        )
+
+    def test_load(self):
+        with MeasureBackend() as backend:
+            loader = PageLoader(backend, parallelism=2)
+            page = loader.load(self.url)
+            loader.close()
+        self.assertEqual(len(page.resources), 5)
+        self.assertEqual(page.resources[-1].error, 'http')
+        self.assertEqual(page.get_bytes(), 400)
+        self.assertEqual(page.get_bytes(critical=True), 200)
+        self.assertEqual(Handler.max_running, 2)
+        self.assertGreater(page.end_time, page.document.end_time)
+        self.assertLess(page.document_time, page.end_time - page.start_time)
+        self.assertIsNone(page.document.body)
+
+    def test_load_broken_resources(self):
+        with MeasureBackend() as backend:
+            loader = PageLoader(backend)
+            page = loader.load(self.url + 'broken')
+            loader.close()
+        self.assertEqual(
+            [resource.error for resource in page.resources],
+            ['decode', 'error']
+        )
+
+    def test_measure_full_page(self):
+        measure = WebsiteMeasure()
+        measure.full_page = True
+        website = measure.measure_load_time(self.url)
+        measure.close()
+        self.assertEqual(website.resources, 5)
+        self.assertEqual(website.critical_resources, 2)
+        self.assertEqual(website.critical_bytes, 200)
+        self.assertEqual(website.failed_resources, 1)
+        self.assertEqual(website.bytes_transferred, len(HTML))
+        self.assertGreater(website.time, website.document_time)
+        website.ranking_place = 1
+        self.assertIn('resources: 5 (400 B) critical: 2', str(website))
+
+    def test_measure_full_page_host_concurrency(self):
+        measure = WebsiteMeasure()
+        settings = measure.get_settings()
+        settings.update(full_page=True, parallelism=6, host_concurrency=1)
+        measure.apply_settings(settings)
+        website = measure.measure_load_time(self.url)
+        measure.close()
+        self.assertEqual(website.resources, 5)
+        self.assertEqual(Handler.max_running, 1)
+        self.assertGreater(website.queue_time, 0.05)
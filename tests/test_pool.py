@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import MagicMock
+
+from website_measure.pool import ConnectionPool
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(max_idle=1)
+        self.key = ('https', 'wp.pl', 443)
+
+    def test_acquire_empty(self):
+        self.assertIsNone(self.pool.acquire(self.key))
+        self.assertFalse(self.pool.has_idle(self.key))
+
+    def test_release_acquire(self):
+        connection = MagicMock()
+        self.pool.release(self.key, connection)
+        self.assertTrue(self.pool.has_idle(self.key))
+        self.assertIs(self.pool.acquire(self.key), connection)
+        self.assertIsNone(self.pool.acquire(('https', 'onet.pl', 443)))
+
+    def test_release_full(self):
+        first, second = MagicMock(), MagicMock()
+        self.pool.release(self.key, first)
+        self.pool.release(self.key, second)
+        self.assertTrue(second.close.called)
+        self.assertFalse(first.close.called)
+
+    def test_close(self):
+        connection = MagicMock()
+        with self.pool:
+            self.pool.release(self.key, connection)
+        self.assertTrue(connection.close.called)
+        self.assertFalse(self.pool.has_idle(self.key))
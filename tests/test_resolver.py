@@ -0,0 +1,78 @@
+import socket
+import unittest
+from unittest.mock import MagicMock, patch
+
+from website_measure.resolver import Resolver
+
+ADDRESSES = [
+    (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '',
+     ('127.0.0.1', 80))
+]
+
+
+@patch('website_measure.resolver.get_dns_resolver', return_value=None)
+class TestResolver(unittest.TestCase):
+    def setUp(self):
+        self.resolver = Resolver(default_ttl=10)
+
+    @patch('website_measure.resolver.monotonic')
+    @patch('website_measure.resolver.socket.getaddrinfo')
+    def test_resolve_cache(self, mock_getaddrinfo, mock_monotonic, _):
+        mock_getaddrinfo.return_value = ADDRESSES
+        mock_monotonic.return_value = 100
+        self.assertEqual(self.resolver.resolve('wp.pl', 80), ADDRESSES)
+        mock_monotonic.return_value = 109
+        self.assertEqual(self.resolver.resolve('wp.pl', 80), ADDRESSES)
+        self.assertEqual(mock_getaddrinfo.call_count, 1)
+
+        self.resolver.resolve('wp.pl', 443)
+        self.assertEqual(mock_getaddrinfo.call_count, 2)
+        mock_monotonic.return_value = 111
+        self.resolver.resolve('wp.pl', 80)
+        self.assertEqual(mock_getaddrinfo.call_count, 3)
+
+    @patch('website_measure.resolver.socket.getaddrinfo')
+    def test_resolve_error_not_cached(self, mock_getaddrinfo, _):
+        mock_getaddrinfo.side_effect = socket.gaierror
+        with self.assertRaises(socket.gaierror):
+            self.resolver.resolve('wp.pl', 80)
+        self.assertEqual(self.resolver.cache, {})
+
+    def test_is_ip(self, _):
+        self.assertTrue(Resolver.is_ip('127.0.0.1'))
+        self.assertTrue(Resolver.is_ip('::1'))
+        self.assertFalse(Resolver.is_ip('wp.pl'))
+
+    @patch('website_measure.resolver.socket.getaddrinfo')
+    def test_prefetch(self, mock_getaddrinfo, _):
+        def getaddrinfo(host, port, **kwargs):
+            if host == 'invalid.test':
+                raise socket.gaierror
+            return ADDRESSES
+
+        mock_getaddrinfo.side_effect = getaddrinfo
+        failed = self.resolver.prefetch(
+            ['https://wp.pl/a', 'https://wp.pl/b', 'http://wp.pl:8080',
+             'http://invalid.test']
+        )
+        self.assertEqual(failed, ['invalid.test'])
+        self.assertEqual(
+            set(self.resolver.cache), {('wp.pl', 443), ('wp.pl', 8080)}
+        )
+        self.assertEqual(mock_getaddrinfo.call_count, 3)
+
+    @patch('website_measure.resolver.socket.getaddrinfo')
+    def test_hosts_without_records(self, mock_getaddrinfo, _):
+        try:
+            import dns.resolver
+        except ImportError:
+            self.skipTest('dnspython is not installed')
+        mock_getaddrinfo.return_value = ADDRESSES
+        self.resolver.dns_resolver = MagicMock()
+        self.resolver.dns_resolver.resolve.side_effect = dns.resolver.NXDOMAIN
+        self.assertEqual(
+            self.resolver.lookup('intranet', 80), (ADDRESSES, 10)
+        )
+        mock_getaddrinfo.assert_called_once_with(
+            'intranet', 80, type=socket.SOCK_STREAM
+        )
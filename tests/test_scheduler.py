@@ -0,0 +1,57 @@
+import threading
+import time
+import unittest
+
+from website_measure.scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    def test_run_until_stop(self):
+        calls = []
+
+        def round_function():
+            calls.append(time.monotonic())
+            if len(calls) == 3:
+                scheduler.stop()
+
+        scheduler = Scheduler(round_function, interval=0.01)
+        scheduler.run()
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(scheduler.rounds, 3)
+        self.assertGreaterEqual(calls[2] - calls[0], 0.015)
+
+    def test_round_exception_does_not_stop(self):
+        calls = []
+
+        def round_function():
+            calls.append(1)
+            if len(calls) == 2:
+                scheduler.stop()
+            raise ValueError
+
+        scheduler = Scheduler(round_function, interval=0.01)
+        scheduler.run()
+        self.assertEqual(scheduler.rounds, 2)
+
+    def test_get_next_tick_skips_overlapping_rounds(self):
+        scheduler = Scheduler(lambda: None, interval=10)
+        self.assertEqual(scheduler.get_next_tick(0, 5), 10)
+        self.assertEqual(scheduler.skipped, 0)
+        self.assertEqual(scheduler.get_next_tick(0, 25), 30)
+        self.assertEqual(scheduler.skipped, 2)
+
+    def test_stop_from_other_thread(self):
+        scheduler = Scheduler(lambda: None, interval=60)
+        thread = threading.Thread(target=scheduler.run)
+        thread.start()
+        time.sleep(0.05)
+        scheduler.stop()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(scheduler.rounds, 1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Scheduler(lambda: None, interval=0)
+        with self.assertRaises(ValueError):
+            Scheduler(lambda: None, interval=1, jitter=-1)
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Budgets of cold start, generous enough for slow CI machines
+IMPORT_BUDGET_US = 300_000  # cumulative import time of website_measure.main
+HELP_BUDGET_S = 2.0  # wall time of `wlm --help`
+# Heavy modules which must not be imported without notification
+LAZY_MODULES = ('twilio', 'smtplib', 'email.mime', 'sqlite3')
+
+
+def get_import_times(module: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup(unittest.TestCase):
+    def test_lazy_modules_not_imported(self):
+        times = get_import_times('website_measure.main')
+        for name in times:
+            for lazy_module in LAZY_MODULES:
+                self.assertFalse(
+                    name == lazy_module or
+                    name.startswith(f'{lazy_module}.'),
+                    f'{name} imported on startup'
+                )
+
+    def test_import_budget(self):
+        times = get_import_times('website_measure.main')
+        self.assertLess(times['website_measure.main'], IMPORT_BUDGET_US)
+
+    def test_import_without_side_effects(self):
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import website_measure, logging; '
+             'print(website_measure.logger.handlers)'],
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_import_with_invalid_log_level(self):
+        result = subprocess.run(
+            [sys.executable, '-c', 'import website_measure'],
+            capture_output=True, text=True,
+            env={**os.environ, 'WLM_LOG_LEVEL': 'LOUD'}
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_help_budget(self):
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import sys, time; start = time.perf_counter(); '
+             'sys.argv = ["wlm", "--help"]\n'
+             'try:\n'
+             '    from website_measure import run; run()\n'
+             'except SystemExit:\n'
+             '    print(time.perf_counter() - start)'],
+            capture_output=True, text=True, check=True
+        )
+        self.assertLess(float(result.stdout.splitlines()[-1]), HELP_BUDGET_S)
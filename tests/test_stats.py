@@ -0,0 +1,90 @@
+import unittest
+from array import array
+
+from website_measure import stats
+from website_measure.constants import STATISTICS
+
+
+class TestStats(unittest.TestCase):
+    def setUp(self):
+        self.values = array('d', [5.0, 1.0, 4.0, 2.0, 3.0])
+
+    def test_percentile(self):
+        ordered = sorted(self.values)
+        self.assertEqual(stats.percentile(ordered, 0), 1.0)
+        self.assertEqual(stats.percentile(ordered, 50), 3.0)
+        self.assertEqual(stats.percentile(ordered, 100), 5.0)
+        self.assertAlmostEqual(stats.percentile(ordered, 90), 4.6)
+
+    def test_percentile_empty(self):
+        with self.assertRaises(ValueError):
+            stats.percentile([], 50)
+
+    def test_mean(self):
+        self.assertEqual(stats.mean(self.values), 3.0)
+
+    def test_stddev(self):
+        self.assertAlmostEqual(stats.stddev(self.values), 1.5811388, 6)
+        self.assertEqual(stats.stddev(array('d', [1.0])), 0.0)
+
+    def test_confidence_interval(self):
+        values = array('d', range(1, 21))
+        self.assertEqual(
+            stats.confidence_interval(values, 'median'), (6.0, 15.0)
+        )
+        lower, upper = stats.confidence_interval(values, 'mean')
+        self.assertAlmostEqual((lower + upper) / 2, 10.5)
+        self.assertAlmostEqual(
+            upper - lower, 2 * 1.959964 * 5.91608 / 20 ** 0.5, 4
+        )
+        lower, upper = stats.confidence_interval(values, 'p90')
+        self.assertLessEqual(lower, stats.statistic(values, 'p90'))
+        self.assertGreaterEqual(upper, stats.statistic(values, 'p90'))
+        self.assertEqual(
+            stats.confidence_interval([1.0], 'median'),
+            (-float('inf'), float('inf'))
+        )
+        with self.assertRaises(KeyError):
+            stats.confidence_interval(values, 'max')
+
+    def test_reject_outliers(self):
+        values = [1.0, 1.1, 0.9, 1.0, 1.05, 10.0]
+        self.assertEqual(stats.reject_outliers(values), values[:-1])
+        self.assertEqual(
+            stats.reject_outliers([1.0, 1.0, 5.0]), [1.0, 1.0, 5.0]
+        )
+        self.assertAlmostEqual(stats.mad(values), 0.05)
+
+    def test_trimmed_mean(self):
+        values = [100.0] + [1.0] * 8 + [-100.0]
+        self.assertEqual(stats.trimmed_mean(values), 1.0)
+        self.assertEqual(stats.trimmed_mean([2.0]), 2.0)
+
+    def test_mann_whitney(self):
+        slower = [2.0, 2.1, 2.2, 2.3, 2.4, 2.5]
+        faster = [1.0, 1.1, 1.2, 1.3, 1.4, 1.5]
+        self.assertLess(stats.mann_whitney(slower, faster), 0.01)
+        self.assertGreater(stats.mann_whitney(faster, slower), 0.99)
+        self.assertEqual(stats.mann_whitney([1.0, 1.0], [1.0]), 1.0)
+        self.assertAlmostEqual(
+            stats.mann_whitney(slower, slower), 0.5, delta=0.1
+        )
+        with self.assertRaises(ValueError):
+            stats.mann_whitney([], faster)
+
+    def test_summarize(self):
+        summary = stats.summarize(self.values)
+        self.assertEqual(tuple(summary), STATISTICS)
+        self.assertEqual(summary['min'], 1.0)
+        self.assertEqual(summary['median'], 3.0)
+
+    def test_statistic(self):
+        summary = stats.summarize(self.values)
+        for name in STATISTICS:
+            self.assertAlmostEqual(
+                stats.statistic(self.values, name), summary[name]
+            )
+
+    def test_statistic_unknown(self):
+        with self.assertRaises(KeyError):
+            stats.statistic(self.values, 'p42')
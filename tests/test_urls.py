@@ -0,0 +1,73 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from website_measure.urls import (
+    UrlCollector, UrlList, normalize_url, read_urls,
+)
+
+
+class TestNormalizeUrl(unittest.TestCase):
+    def test_normalize_url(self):
+        examples = [
+            ('facebook.pl', 'http://facebook.pl'),
+            ('HTTPS://WWW.Facebook.PL/Path?Q=A',
+             'https://www.facebook.pl/Path?Q=A'),
+            ('https://wp.pl:443/', 'https://wp.pl/'),
+            ('http://127.0.0.1:8080', 'http://127.0.0.1:8080'),
+            ('  https://onet.pl  ', 'https://onet.pl'),
+        ]
+        for url, expected in examples:
+            self.assertEqual(normalize_url(url), expected)
+
+
+class TestReadUrls(unittest.TestCase):
+    def test_read_urls(self):
+        file = io.StringIO('https://wp.pl\n\n# comment\n onet.pl \n')
+        self.assertEqual(list(read_urls(file)), ['https://wp.pl', 'onet.pl'])
+
+
+class TestUrlCollector(unittest.TestCase):
+    def setUp(self):
+        self.collector = UrlCollector(exclude=['https://stackoverflow.com'])
+
+    def test_add_all(self):
+        self.collector.add_all([
+            'https://wp.pl', 'HTTPS://WP.PL/', 'onet.pl', 'www', '123123',
+            'https://stackoverflow.com/',
+        ])
+        self.assertEqual(
+            self.collector.result,
+            UrlList(
+                urls=['https://wp.pl', 'http://onet.pl'],
+                invalid=['www', '123123'],
+                duplicates=2
+            )
+        )
+
+    def test_add_file(self):
+        with tempfile.NamedTemporaryFile('w', delete=False) as file:
+            file.write('https://wp.pl\nhttps://onet.pl\nhttps://wp.pl\n')
+        try:
+            self.collector.add_file(file.name)
+        finally:
+            os.remove(file.name)
+        self.assertEqual(
+            self.collector.result.urls, ['https://wp.pl', 'https://onet.pl']
+        )
+
+    def test_add_file_stdin(self):
+        with patch('sys.stdin', io.StringIO('https://wp.pl\n')):
+            self.collector.add_file('-')
+        self.assertEqual(self.collector.result.urls, ['https://wp.pl'])
+
+    def test_report(self):
+        self.collector.add_all(['www', 'abc', 'https://wp.pl'])
+        stream = io.StringIO()
+        self.collector.report(stream)
+        self.assertEqual(
+            stream.getvalue(),
+            '[ERROR] 2 invalid URLs skipped:\nwww\nabc\n'
+        )
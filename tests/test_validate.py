@@ -38,3 +38,12 @@ class TestValidate(unittest.TestCase):
                     self.assertEqual(validate.is_valid(example[0]), example[1])
                 except ValueError:
                     self.assertFalse(example[1])
+
+    def test_matches(self):
+        for data_type in self.examples:
+            validate = Validate(data_type)
+            for example in self.examples[data_type]:
+                self.assertEqual(validate.matches(example[0]), example[1])
+
+    def test_compiled_once(self):
+        self.assertIs(Validate('url').regex, Validate('url').regex)
@@ -1,4 +1,5 @@
 import unittest
+from array import array
 
 from website_measure.constants import ROUND_VALUE
 from website_measure.website import WebsiteMeasurement
@@ -56,3 +57,124 @@ class TestWebsiteMeasurement(unittest.TestCase):
             ranked_objects[1].ranking_place <
             ranked_objects[2].ranking_place
         )
+
+    def test_samples(self):
+        for obj in self.all_objects:
+            self.assertIsInstance(obj.samples, array)
+            self.assertEqual(list(obj.samples), [obj.time])
+
+    def test_add_sample(self):
+        self.object_1.add_sample(1, 1.5)
+        self.object_1.add_sample(1, 4)
+        self.assertEqual(len(self.object_1.samples), 3)
+        self.assertEqual(self.object_1.get_statistic('min'), 0.5)
+        self.assertAlmostEqual(
+            self.object_1.get_statistic('median'), 1.22222
+        )
+        self.assertEqual(self.object_1.get_statistic('time'),
+                         self.object_1.time)
+        self.assertIn('samples: 3', str(self.object_1.get_sorted_ranking(
+            [self.object_1])[0]))
+
+    def test_get_sorted_ranking_statistic(self):
+        self.object_1.add_sample(1, 10)
+        self.object_1.add_sample(1, 10)
+        ranked_objects = WebsiteMeasurement.get_sorted_ranking(
+            self.all_objects, 'median'
+        )
+        self.assertEqual(ranked_objects[-1], self.object_1)
+        self.assertEqual(ranked_objects[-1].ranking_place, 3)
+
+    def test_phases(self):
+        website = WebsiteMeasurement('', 0, 1, dns=0.1, download=0.5)
+        website.add_sample(0, 2, {'dns': 0.3, 'download': 1.5})
+        self.assertTrue(website.has_phases())
+        self.assertFalse(self.object_1.has_phases())
+        self.assertEqual(list(website.get_samples('dns')), [0.1, 0.3])
+        self.assertEqual(website.get_statistic('time', 'dns'), 0.1)
+        self.assertEqual(website.get_statistic('mean', 'download'), 1.0)
+
+    def test_merge(self):
+        website = WebsiteMeasurement('', 0, 1, dns=0.25)
+        other = WebsiteMeasurement('', 0, 3, dns=0.5)
+        other.add_sample(0, 2)
+        website.merge(other)
+        self.assertEqual(list(website.samples), [1, 3, 2])
+        self.assertEqual(list(website.get_samples('dns')), [0.25, 0.5, 0])
+        self.assertEqual(len(website.byte_samples), 3)
+        self.assertEqual(website.time, 1)
+        self.assertIsNone(website.confidence)
+        website.confidence_low, website.confidence_high = 0.9, 1.1
+        self.assertAlmostEqual(website.confidence, 0.1)
+
+    def test_network(self):
+        website = WebsiteMeasurement('', 0, 1, dns=0.25)
+        website.add_sample(0, 2, {'dns': 0.5})
+        self.assertEqual(website.network, 0.75)
+        self.assertEqual(list(website.get_samples('network')), [0.75, 1.5])
+        self.assertEqual(website.get_statistic('mean', 'network'), 1.125)
+
+    def test_get_sorted_ranking_metric(self):
+        self.object_1.dns = 3
+        ranked_objects = WebsiteMeasurement.get_sorted_ranking(
+            self.all_objects, 'time', 'dns'
+        )
+        self.assertEqual(ranked_objects[-1], self.object_1)
+
+    def test_to_text(self):
+        website = WebsiteMeasurement('https://wp.pl', 0, 1, dns=0.1)
+        website.ranking_place = 1
+        self.assertIn('dns: 0.1', website.to_text())
+        self.assertIn('url: https://wp.pl', str(website))
+
+    def test_to_text_variants(self):
+        website = WebsiteMeasurement('https://wp.pl', 0, 1)
+        website.variants['warm'] = WebsiteMeasurement(
+            'https://wp.pl', 0, 0.5, mode='warm'
+        )
+        website.ranking_place = 1
+        text = website.to_text()
+        self.assertIn('cold: time: 1', text)
+        self.assertIn('warm: time: 0.5', text)
+        self.assertEqual(text.count('url:'), 1)
+
+    def test_throughput(self):
+        website = WebsiteMeasurement('', 0, 2, bytes_transferred=1000)
+        website.add_sample(0, 1, bytes_transferred=2000)
+        self.assertEqual(website.throughput, 500)
+        self.assertEqual(list(website.byte_samples), [1000, 2000])
+        self.assertEqual(WebsiteMeasurement('', 1, 1).throughput, 0.0)
+        website.ranking_place = 1
+        self.assertIn('bytes: 1000 throughput: 500 B/s', str(website))
+
+    def test_record(self):
+        website = WebsiteMeasurement(
+            'https://wp.pl', 0, 2, dns=0.5, bytes_transferred=1000
+        )
+        website.add_sample(0, 1, {'dns': 0.25}, 2000)
+        website.variants['warm'] = WebsiteMeasurement(
+            'https://wp.pl', 0, 0.5, mode='warm'
+        )
+        copied = WebsiteMeasurement.from_record(website.to_record())
+        self.assertEqual(copied.url, website.url)
+        self.assertEqual(copied.dns, 0.5)
+        self.assertEqual(copied.samples, website.samples)
+        self.assertEqual(copied.phase_samples, website.phase_samples)
+        self.assertEqual(copied.byte_samples, website.byte_samples)
+        self.assertEqual(copied.histogram.count, 2)
+        self.assertEqual(copied.histogram.max, 2)
+        self.assertEqual(copied.variants['warm'].mode, 'warm')
+        self.assertEqual(copied.variants['warm'].time, 0.5)
+
+    def test_from_error(self):
+        failed = WebsiteMeasurement.from_error('https://wp.pl', 'timeout')
+        self.assertTrue(failed.is_failed())
+        self.assertEqual(len(failed.samples), 0)
+        websites = WebsiteMeasurement.get_sorted_ranking(
+            [failed, WebsiteMeasurement('https://onet.pl', 0, 1)], 'median'
+        )
+        self.assertEqual(websites[1], failed)
+        self.assertEqual(failed.ranking_place, 2)
+        self.assertIn('failed: timeout', failed.to_text())
+        copied = WebsiteMeasurement.from_record(failed.to_record())
+        self.assertEqual(copied.error, 'timeout')
@@ -1,14 +1,43 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import patch
 
 from website_measure.write import WriteFile
 
 
 class TestWriteFile(unittest.TestCase):
     def setUp(self):
-        self.write = WriteFile()
+        self.directory = tempfile.TemporaryDirectory()
+        self.write = WriteFile('log.txt', self.directory.name)
 
-    @patch('builtins.open', create=True)
-    def test_append(self, mock):
-        self.write.append('example')
-        self.assertTrue(mock.called)
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self):
+        with open(self.write.file_path) as file:
+            return file.read()
+
+    def test_append(self):
+        with self.write as write_file:
+            write_file.append('example\n')
+            write_file.append('example 2\n')
+        self.assertEqual(self.read(), 'example\nexample 2\n')
+        self.assertEqual(os.listdir(self.directory.name), ['log.txt'])
+
+    def test_replace_old_file(self):
+        with self.write as write_file:
+            write_file.append('old')
+        with self.write as write_file:
+            write_file.append('new')
+            self.assertEqual(self.read(), 'old')
+        self.assertEqual(self.read(), 'new')
+
+    def test_exception_keeps_old_file(self):
+        with self.write as write_file:
+            write_file.append('old')
+        with self.assertRaises(ValueError):
+            with self.write as write_file:
+                write_file.append('new')
+                raise ValueError
+        self.assertEqual(self.read(), 'old')
+        self.assertEqual(os.listdir(self.directory.name), ['log.txt'])
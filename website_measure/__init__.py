@@ -1,27 +1,68 @@
+import atexit
 import logging
 import os
 import time
 
-from website_measure.constants import LOG_FORMAT
-
-# Set and create directions for non-relative files
+# Set directions for non-relative files, created when they are used
 SRC_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.normpath(os.path.join(SRC_DIR, ".."))
 LOG_DIR_PATH = os.path.join(ROOT_DIR, 'logs')
 LOG_FILE_PATH = os.path.join(
     LOG_DIR_PATH, 'wlm_{}.log'.format(time.strftime("%Y_%m_%d")),
 )
-try:
-    os.mkdir(LOG_DIR_PATH)
-except FileExistsError:
-    pass
 
-# Configure logger for app
+# Logger for app, handlers and level are set by configure_logging()
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-file_handler = logging.FileHandler(LOG_FILE_PATH)
-file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-logger.addHandler(file_handler)
+log_listener = None
+
+
+def configure_logging(file_path: str = LOG_FILE_PATH) -> None:
+    """
+    Create log direction and start non-blocking logging pipeline: app
+    logger puts records to bounded queue, background thread writes them to
+    rotating log file. Settings in constants.py and WLM_LOG_* environment
+    variables, invalid WLM_LOG_LEVEL is logged and LOG_LEVEL is used.
+    Called on start of the app instead of on import, so importing the
+    package does not touch file system.
+
+    :param file_path: str
+    :return: None
+    """
+    global log_listener
+    if log_listener is not None:
+        return
+    from website_measure.logs import get_log_level, start_queue_logging
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    log_listener = start_queue_logging(logger, file_path)
+    logger.setLevel(get_log_level(logger))
+    atexit.register(shutdown_logging)
+
+
+def set_log_level(level: str) -> None:
+    """
+    Change level of app logger, example: 'DEBUG'.
+
+    :param level: str
+    :return: None
+    """
+    logger.setLevel(level)
+
+
+def shutdown_logging() -> None:
+    """
+    Write queued records, stop background thread and remove handlers.
+
+    :return: None
+    """
+    global log_listener
+    if log_listener is None:
+        return
+    log_listener.stop()
+    for handler in (*log_listener.handlers, *logger.handlers):
+        handler.close()
+    logger.handlers.clear()
+    log_listener = None
 
 
 def run():
@@ -0,0 +1,198 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from time import time
+from typing import Dict, List, Optional
+
+from website_measure import LOG_DIR_PATH, logger
+from website_measure.constants import ALERTS_FILE_NAME, DEFAULT_ALERT_COOLDOWN
+from website_measure.notify import Notification
+
+
+class AlertCache:
+    """
+    Cooldown of repeated alerts and digest of mail alerts.
+    The same alert (main url, kind, recipient) is not sent again before
+    cooldown seconds pass. With digest window mail alerts are collected
+    and sent as one message per recipient once per window.
+    State is kept in JSON file, so it survives restarts.
+    Alert is remembered as sent by mark_sent() after delivery, so failed
+    delivery does not start cooldown.
+    """
+    def __init__(
+            self,
+            file_path: str = os.path.join(LOG_DIR_PATH, ALERTS_FILE_NAME),
+            cooldown: float = DEFAULT_ALERT_COOLDOWN,
+            digest_window: Optional[float] = None
+    ):
+        """
+        self.file_path - path of JSON state file
+        self.cooldown - seconds between the same alerts, 0 - no cooldown
+        self.digest_window - seconds between digest messages, None - no
+        digest
+        self.sent - unix time of last sent alert by alert key
+        self.digest - mail alerts waiting for digest by recipient
+        self.digest_started - unix time of first alert in current window
+        self.lock - lock of state shared with notification worker thread
+
+        :param file_path: str
+        :param cooldown: float
+        :param digest_window: Optional[float]
+        """
+        self.file_path = file_path
+        self.cooldown = cooldown
+        self.digest_window = digest_window
+        self.sent: Dict[str, float] = {}
+        self.digest: Dict[str, List[dict]] = {}
+        self.digest_started: Optional[float] = None
+        self.lock = threading.RLock()
+        self.load()
+
+    @staticmethod
+    def get_key(notification: Notification) -> str:
+        """
+        Key of alert: main url, kind and recipient.
+
+        :param notification: Notification
+        :return: str
+        """
+        return '|'.join((
+            notification.main_url,
+            notification.kind,
+            notification.recipient or ''
+        ))
+
+    def load(self) -> None:
+        """
+        Read state from self.file_path, missing or broken file means empty
+        state.
+
+        :return: None
+        """
+        try:
+            with open(self.file_path) as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            logger.error(f'\n[ERROR][AlertCache][load]\n{e}')
+            return
+        self.sent = state.get('sent', {})
+        self.digest = state.get('digest', {})
+        self.digest_started = state.get('digest_started')
+
+    def save(self, now: float = None) -> None:
+        """
+        Atomically replace self.file_path with current state.
+        Alerts older than cooldown are forgotten.
+
+        :param now: float, unix time
+        :return: None
+        """
+        now = time() if now is None else now
+        self.sent = {
+            key: sent_at for key, sent_at in self.sent.items()
+            if now - sent_at < self.cooldown
+        }
+        directory = os.path.dirname(self.file_path)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(
+            prefix='.alerts.', suffix='.tmp', dir=directory
+        )
+        with os.fdopen(descriptor, 'w') as file:
+            json.dump({
+                'sent': self.sent,
+                'digest': self.digest,
+                'digest_started': self.digest_started,
+            }, file)
+        os.replace(temp_path, self.file_path)
+
+    def should_send(
+            self, notification: Notification, now: float = None
+    ) -> bool:
+        """
+        True if the same alert was not sent during cooldown.
+        Notification is not remembered, call mark_sent() after delivery.
+
+        :param notification: Notification
+        :param now: float, unix time
+        :return: bool
+        """
+        now = time() if now is None else now
+        key = self.get_key(notification)
+        with self.lock:
+            sent_at = self.sent.get(key)
+        if sent_at is not None and now - sent_at < self.cooldown:
+            logger.info(
+                f'\n[INFO][AlertCache][should_send]'
+                f'\nAlert {key} in cooldown'
+            )
+            return False
+        return True
+
+    def mark_sent(self, notification: Notification, now: float = None) -> None:
+        """
+        Remember delivered notification, the same alert is in cooldown from
+        now, thread safe.
+
+        :param notification: Notification
+        :param now: float, unix time
+        :return: None
+        """
+        now = time() if now is None else now
+        with self.lock:
+            self.sent[self.get_key(notification)] = now
+            self.save(now)
+
+    def add_to_digest(
+            self, notification: Notification, now: float = None
+    ) -> None:
+        """
+        Collect mail alert for next digest message, alerts in cooldown are
+        skipped.
+
+        :param notification: Notification
+        :param now: float, unix time
+        :return: None
+        """
+        now = time() if now is None else now
+        if self.cooldown and not self.should_send(notification, now):
+            return
+        with self.lock:
+            if self.cooldown:
+                self.sent[self.get_key(notification)] = now
+            if self.digest_started is None:
+                self.digest_started = now
+            self.digest.setdefault(notification.recipient or '', []).append({
+                'date': str(datetime.fromtimestamp(now)),
+                'main_url': notification.main_url,
+                'main_website_place': notification.main_website_place,
+                'all_websites': notification.all_websites,
+            })
+            self.save(now)
+
+    def pop_digests(self, now: float = None) -> List[Notification]:
+        """
+        Digest notifications, one for every recipient, if digest window
+        passed. Collected alerts are removed.
+
+        :param now: float, unix time
+        :return: List[Notification]
+        """
+        now = time() if now is None else now
+        if self.digest_window is None or self.digest_started is None or \
+                now - self.digest_started < self.digest_window:
+            return []
+        with self.lock:
+            digests = [
+                Notification(
+                    'digest', 0, 0, recipient or None, alerts=alerts
+                )
+                for recipient, alerts in self.digest.items()
+            ]
+            self.digest = {}
+            self.digest_started = None
+            self.save(now)
+        return digests
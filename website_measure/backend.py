@@ -0,0 +1,511 @@
+import http.client
+import socket
+import ssl
+import threading
+import urllib.error
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from website_measure.constants import (
+    CHUNK_SIZE, DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, MAX_REDIRECTS,
+    PHASES, USER_AGENT,
+)
+from website_measure.decode import (
+    DecodeError, get_accept_encoding, get_decoder,
+)
+from website_measure.pool import ConnectionPool, PoolKey
+from website_measure.resolver import Resolver
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError,
+    ConnectionAbortedError,
+)
+NS_IN_SECOND = 1_000_000_000
+
+
+def get_error_kind(error: BaseException) -> str:
+    """
+    Kind of error raised by website load, one of ERROR_KINDS.
+
+    :param error: BaseException
+    :return: str
+    """
+    if isinstance(error, (urllib.error.HTTPError, http.client.HTTPException)):
+        return 'http'
+    if isinstance(error, DecodeError):
+        return 'decode'
+    if isinstance(error, socket.timeout):
+        return 'timeout'
+    if isinstance(error, socket.gaierror):
+        return 'dns'
+    if isinstance(error, (ssl.SSLError, ssl.CertificateError)):
+        return 'tls'
+    if isinstance(error, OSError):
+        return 'connect'
+    return 'error'
+
+
+@dataclass
+class PhaseTiming:
+    """
+    Dataclass object with durations of single website load phases.
+    All values in nanoseconds from monotonic perf_counter_ns clock,
+    body_bytes - number of body bytes read (on the wire), decoded_bytes -
+    number of body bytes after decompression, decode - time of
+    decompression (part of download), url - url after redirects,
+    body - decoded body of the last response if it was kept, None - not
+    kept, queue - waiting for free slot of host before load (not part of
+    load time).
+    """
+    start_ns: int
+    end_ns: int = 0
+    dns: int = 0
+    connect: int = 0
+    tls: int = 0
+    ttfb: int = 0
+    download: int = 0
+    body_bytes: int = 0
+    decoded_bytes: int = 0
+    decode: int = 0
+    url: str = ''
+    body: Optional[bytearray] = None
+    queue: int = 0
+
+    @property
+    def start_time(self) -> float:
+        """
+        Start of load in seconds.
+
+        :return: float
+        """
+        return self.start_ns / NS_IN_SECOND
+
+    @property
+    def end_time(self) -> float:
+        """
+        End of load in seconds.
+
+        :return: float
+        """
+        return self.end_ns / NS_IN_SECOND
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        """
+        Durations of PHASES in seconds.
+
+        :return: Dict[str, float]
+        """
+        return {
+            phase: getattr(self, phase) / NS_IN_SECOND for phase in PHASES
+        }
+
+    @property
+    def decompress_time(self) -> float:
+        """
+        Time of body decompression in seconds.
+
+        :return: float
+        """
+        return self.decode / NS_IN_SECOND
+
+    @property
+    def queue_time(self) -> float:
+        """
+        Time of waiting for free slot of host in seconds.
+
+        :return: float
+        """
+        return self.queue / NS_IN_SECOND
+
+
+class MeasureBackend:
+    """
+    Load website with plain sockets and http.client and measure every
+    phase of loading separately: DNS lookup, TCP connect, TLS handshake,
+    time to first byte and download of body.
+    Redirects are followed, phases of all hops are summed up.
+    With reuse connections are kept alive in self.pool and reused by next
+    loads of the same host (phases dns, connect and tls are then 0).
+    Body is drained in CHUNK_SIZE chunks into reusable per thread buffer,
+    so memory use does not depend on size of website.
+    With compress gzip, deflate (and br with installed brotli) encodings
+    are accepted and body is decompressed as a stream, like in browsers.
+    """
+    def __init__(
+            self,
+            ssl_context: ssl.SSLContext = None,
+            pool: ConnectionPool = None,
+            max_bytes: int = None,
+            connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+            read_timeout: float = DEFAULT_READ_TIMEOUT,
+            resolver: Resolver = None
+    ):
+        """
+        self.ssl_context - context used for TLS handshakes, default context
+        is created with first https load
+        self.pool - idle keep-alive connections for warm loads
+        self.max_bytes - stop reading body after max_bytes, None - read all
+        self.connect_timeout - seconds to open TCP connection, None - no
+        limit
+        self.read_timeout - seconds of TLS handshake or waiting for single
+        read of response, None - no limit
+        self.resolver - Resolver with cache of addresses, None - resolve
+        every load with system resolver
+        self.local - thread local storage of read buffers
+
+        :param ssl_context: ssl.SSLContext
+        :param pool: ConnectionPool
+        :param max_bytes: int
+        :param connect_timeout: float
+        :param read_timeout: float
+        :param resolver: Resolver
+        """
+        self._ssl_context = ssl_context
+        self.pool = pool or ConnectionPool()
+        self.max_bytes = max_bytes
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.resolver = resolver
+        self.local = threading.local()
+
+    def __enter__(self):
+        """
+        Context manager method.
+
+        :return: self
+        """
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        """
+        Context manager method.
+        Close pooled connections.
+        """
+        self.close()
+
+    @property
+    def ssl_context(self) -> ssl.SSLContext:
+        """
+        Context used for TLS handshakes.
+        Loading of system certificates is postponed until the first https
+        load.
+
+        :return: ssl.SSLContext
+        """
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    @ssl_context.setter
+    def ssl_context(self, ssl_context: ssl.SSLContext) -> None:
+        """
+        Set context used for TLS handshakes.
+
+        :param ssl_context: ssl.SSLContext
+        :return: None
+        """
+        self._ssl_context = ssl_context
+
+    def close(self) -> None:
+        """
+        Close pooled connections.
+
+        :return: None
+        """
+        self.pool.close()
+
+    def fetch(
+            self,
+            url: str,
+            reuse: bool = False,
+            keep_body: bool = False,
+            compress: bool = True
+    ) -> PhaseTiming:
+        """
+        Load website html and measure time of all phases.
+        With reuse take connection from self.pool and keep it alive after
+        load.
+        With keep_body body of the last response is kept in timing.body.
+        With compress accept compressed body.
+
+        :param url: str
+        :param reuse: bool
+        :param keep_body: bool
+        :param compress: bool
+        :return: PhaseTiming
+        """
+        timing = PhaseTiming(start_ns=perf_counter_ns())
+        for _ in range(MAX_REDIRECTS + 1):
+            if keep_body:
+                timing.body = bytearray()
+            status, headers = self.fetch_once(url, timing, reuse, compress)
+            location = headers.get('Location')
+            if status not in REDIRECT_STATUSES or not location:
+                break
+            url = urljoin(url, location)
+        else:
+            raise urllib.error.HTTPError(
+                url, status, 'too many redirects', headers, None
+            )
+        timing.end_ns = perf_counter_ns()
+        timing.url = url
+        return timing
+
+    def is_warm(self, url: str) -> bool:
+        """
+        True if self.pool has idle connection to host of url.
+
+        :param url: str
+        :return: bool
+        """
+        parts = urlsplit(url)
+        return self.pool.has_idle(self.get_key(parts))
+
+    def fetch_once(
+            self,
+            url: str,
+            timing: PhaseTiming,
+            reuse: bool = False,
+            compress: bool = True
+    ) -> Tuple[int, http.client.HTTPMessage]:
+        """
+        Single GET request without following redirects.
+        Add durations of phases to timing.
+        Pooled connection closed by server in the meantime is replaced with
+        new one, time of failed try is not counted.
+
+        :param url: str
+        :param timing: PhaseTiming
+        :param reuse: bool
+        :param compress: bool
+        :return: Tuple[int, http.client.HTTPMessage]
+        """
+        parts = urlsplit(url)
+        key = self.get_key(parts)
+        connection = self.pool.acquire(key) if reuse else None
+        if connection is not None:
+            mark = perf_counter_ns()
+            try:
+                return self.request(
+                    connection, key, parts, timing, reuse, compress
+                )
+            except STALE_CONNECTION_ERRORS:
+                timing.start_ns += perf_counter_ns() - mark
+
+        connection = self.open_connection(key, timing)
+        return self.request(connection, key, parts, timing, reuse, compress)
+
+    def open_connection(
+            self, key: PoolKey, timing: PhaseTiming
+    ) -> http.client.HTTPConnection:
+        """
+        Resolve host (with self.resolver if set), open TCP connection and
+        make TLS handshake for https.
+        Add durations of dns, connect and tls phases to timing.
+
+        :param key: PoolKey
+        :param timing: PhaseTiming
+        :return: http.client.HTTPConnection
+        """
+        scheme, host, port = key
+        mark = perf_counter_ns()
+        if self.resolver is not None:
+            addresses = self.resolver.resolve(host, port)
+        else:
+            addresses = socket.getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+        mark = self._add_phase(timing, 'dns', mark)
+
+        sock = self.connect(addresses, self.connect_timeout)
+        sock.settimeout(self.read_timeout)
+        mark = self._add_phase(timing, 'connect', mark)
+
+        if scheme == 'https':
+            try:
+                sock = self.ssl_context.wrap_socket(
+                    sock, server_hostname=host
+                )
+            except BaseException:
+                sock.close()
+                raise
+            self._add_phase(timing, 'tls', mark)
+
+        connection = http.client.HTTPConnection(host, port)
+        connection.sock = sock
+        return connection
+
+    def request(
+            self,
+            connection: http.client.HTTPConnection,
+            key: PoolKey,
+            parts,
+            timing: PhaseTiming,
+            reuse: bool,
+            compress: bool = True
+    ) -> Tuple[int, http.client.HTTPMessage]:
+        """
+        Send GET request and read whole response on open connection.
+        Add durations of ttfb and download phases to timing.
+        Connection goes back to self.pool with reuse, otherwise (or if body
+        was cut by self.max_bytes) is closed.
+
+        :param connection: http.client.HTTPConnection
+        :param key: PoolKey
+        :param parts: urllib.parse.SplitResult
+        :param timing: PhaseTiming
+        :param reuse: bool
+        :param compress: bool
+        :return: Tuple[int, http.client.HTTPMessage]
+        """
+        mark = perf_counter_ns()
+        try:
+            connection.request(
+                'GET', self.get_path(parts), headers={
+                    'Host': parts.netloc.rsplit('@', 1)[-1],
+                    'User-Agent': USER_AGENT,
+                    'Accept': '*/*',
+                    'Accept-Encoding':
+                        get_accept_encoding() if compress else 'identity',
+                    'Connection': 'keep-alive' if reuse else 'close',
+                }
+            )
+            response = connection.getresponse()
+            mark = self._add_phase(timing, 'ttfb', mark)
+
+            complete = self.read_body(response, timing)
+            self._add_phase(timing, 'download', mark)
+        except BaseException:
+            connection.close()
+            raise
+
+        if reuse and complete and not response.will_close:
+            self.pool.release(key, connection)
+        else:
+            connection.close()
+
+        if response.status >= 400:
+            raise urllib.error.HTTPError(
+                parts.geturl(), response.status, response.reason,
+                response.headers, None
+            )
+        return response.status, response.headers
+
+    def read_body(
+            self, response: http.client.HTTPResponse, timing: PhaseTiming
+    ) -> bool:
+        """
+        Drain response body in chunks into reusable buffer, count read bytes
+        in timing.body_bytes.
+        Compressed body is decompressed chunk by chunk, decoded bytes are
+        counted in timing.decoded_bytes and time of decompression in
+        timing.decode. Decoded body is copied to timing.body if it is kept.
+        Return False if reading was stopped by self.max_bytes before end of
+        body.
+
+        :param response: http.client.HTTPResponse
+        :param timing: PhaseTiming
+        :return: bool
+        """
+        view = self.get_buffer()
+        decoder = get_decoder(response.getheader('Content-Encoding'))
+        while True:
+            size = CHUNK_SIZE
+            if self.max_bytes is not None:
+                size = min(size, self.max_bytes - timing.body_bytes)
+                if size <= 0:
+                    return response.isclosed()
+            read = response.readinto(view[:size])
+            if not read:
+                if decoder is not None:
+                    mark = perf_counter_ns()
+                    timing.decoded_bytes += decoder.flush(timing.body)
+                    self._add_phase(timing, 'decode', mark)
+                return True
+            timing.body_bytes += read
+            if decoder is None:
+                timing.decoded_bytes += read
+                if timing.body is not None:
+                    timing.body += view[:read]
+                continue
+            mark = perf_counter_ns()
+            timing.decoded_bytes += decoder.decode(view[:read], timing.body)
+            self._add_phase(timing, 'decode', mark)
+
+    def get_buffer(self) -> memoryview:
+        """
+        Reusable CHUNK_SIZE buffer of current thread.
+
+        :return: memoryview
+        """
+        view = getattr(self.local, 'buffer', None)
+        if view is None:
+            view = self.local.buffer = memoryview(bytearray(CHUNK_SIZE))
+        return view
+
+    @staticmethod
+    def get_key(parts) -> PoolKey:
+        """
+        Pool key (scheme, host, port) of split url.
+        Raise ValueError for not http(s) urls.
+
+        :param parts: urllib.parse.SplitResult
+        :return: PoolKey
+        """
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f'unknown url type: {parts.geturl()!r}')
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        return parts.scheme, parts.hostname, port
+
+    @staticmethod
+    def connect(addresses: list, timeout: float = None) -> socket.socket:
+        """
+        Open TCP connection to the first reachable resolved address.
+
+        :param addresses: list, result of socket.getaddrinfo
+        :param timeout: float, seconds for every address, None - no limit
+        :return: socket.socket
+        """
+        error = OSError('no addresses to connect')
+        for family, socktype, proto, _, address in addresses:
+            sock = socket.socket(family, socktype, proto)
+            sock.settimeout(timeout)
+            try:
+                sock.connect(address)
+                return sock
+            except OSError as e:
+                error = e
+                sock.close()
+        raise error
+
+    @staticmethod
+    def get_path(parts) -> str:
+        """
+        Request target (path with query) of split url.
+
+        :param parts: urllib.parse.SplitResult
+        :return: str
+        """
+        path = parts.path or '/'
+        if parts.query:
+            path += f'?{parts.query}'
+        return path
+
+    @staticmethod
+    def _add_phase(timing: PhaseTiming, phase: str, mark: int) -> int:
+        """
+        Add time elapsed since mark to phase of timing.
+        Return new mark.
+
+        :param timing: PhaseTiming
+        :param phase: str
+        :param mark: int
+        :return: int
+        """
+        now = perf_counter_ns()
+        setattr(timing, phase, getattr(timing, phase) + now - mark)
+        return now
@@ -0,0 +1,397 @@
+import argparse
+import random
+import ssl
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter, sleep
+from typing import List, Optional
+
+from website_measure import stats
+from website_measure.backend import MeasureBackend
+from website_measure.constants import (
+    BENCHMARK_BODY_SIZE, BENCHMARK_CONCURRENCY_LEVELS, BENCHMARK_LATENCY,
+    BENCHMARK_URLS, CHUNK_SIZE, ROUND_VALUE,
+)
+from website_measure.engine import MeasureEngine
+from website_measure.main import WebsiteMeasure, positive_int
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Respond to every GET with body of server.body_size bytes after
+    server.latency seconds, sent with server.bandwidth bytes per second.
+    Part of requests (server.failure_rate) fails with 500 response.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        sleep(server.latency)
+        if server.should_fail():
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(server.body_size))
+        self.end_headers()
+        sent = 0
+        while sent < server.body_size:
+            size = min(CHUNK_SIZE, server.body_size - sent)
+            if server.bandwidth:
+                sleep(size / server.bandwidth)
+            self.wfile.write(server.body[:size])
+            sent += size
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Local HTTP (or HTTPS with certfile) server standing in for measured
+    websites, with injected latency, bandwidth, body size and failures.
+    TLS handshake runs in handler thread, so slow handshake does not stop
+    accepting of other connections.
+    """
+    daemon_threads = True
+
+    def __init__(
+            self,
+            latency: float = BENCHMARK_LATENCY,
+            bandwidth: Optional[float] = None,
+            body_size: int = BENCHMARK_BODY_SIZE,
+            failure_rate: float = 0.0,
+            certfile: str = None,
+            keyfile: str = None,
+            seed: int = None
+    ):
+        """
+        self.latency - seconds of server think time before response
+        self.bandwidth - bytes per second of body, None - no limit
+        self.body_size - bytes of response body
+        self.failure_rate - part of requests answered with 500 response
+        self.body - bytes sent as body
+        self.random - random generator of failures
+        self.lock - lock of self.random shared by handler threads
+        self.context - TLS context of HTTPS server, None - HTTP
+        self.scheme - http or https with certfile
+        self.thread - thread serving requests, started by start()
+
+        :param latency: float
+        :param bandwidth: Optional[float]
+        :param body_size: int
+        :param failure_rate: float
+        :param certfile: str, certificate of HTTPS server, None - HTTP
+        :param keyfile: str
+        :param seed: int, seed of failures
+        """
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.body_size = body_size
+        self.failure_rate = failure_rate
+        self.body = b'x' * min(CHUNK_SIZE, body_size)
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.context = None
+        self.scheme = 'http'
+        if certfile:
+            self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.context.load_cert_chain(certfile, keyfile)
+            self.scheme = 'https'
+        self.thread = None
+
+    def __enter__(self):
+        """
+        Context manager method.
+        Start serving in background thread.
+
+        :return: self
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        """
+        Context manager method.
+        Stop serving and close socket.
+        """
+        self.shutdown()
+        self.server_close()
+
+    def start(self) -> None:
+        """
+        Serve requests in background thread.
+
+        :return: None
+        """
+        self.thread = threading.Thread(
+            target=self.serve_forever, name='wlm-stand-in', daemon=True
+        )
+        self.thread.start()
+
+    def finish_request(self, request, client_address) -> None:
+        """
+        Handle accepted connection in handler thread, wrapped with TLS for
+        HTTPS server.
+
+        :param request: socket.socket
+        :param client_address: tuple
+        :return: None
+        """
+        if self.context is None:
+            super().finish_request(request, client_address)
+            return
+        with self.context.wrap_socket(request, server_side=True) as tls:
+            super().finish_request(tls, client_address)
+
+    def should_fail(self) -> bool:
+        """
+        True if request has to fail, thread safe.
+
+        :return: bool
+        """
+        with self.lock:
+            return self.random.random() < self.failure_rate
+
+    def get_url(self, path: str = '/') -> str:
+        """
+        Url of server with path, HTTPS certificate has to be issued for
+        127.0.0.1 (IP subjectAltName).
+
+        :param path: str
+        :return: str
+        """
+        return f'{self.scheme}://127.0.0.1:{self.server_address[1]}{path}'
+
+    def get_ground_truth(self) -> float:
+        """
+        Injected load time of single request in seconds.
+
+        :return: float
+        """
+        if not self.bandwidth:
+            return self.latency
+        return self.latency + self.body_size / self.bandwidth
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Dataclass object with result of benchmark at one concurrency level.
+    """
+    concurrency: int
+    loads: int
+    failures: int
+    wall_time: float
+    ground_truth: float
+    mean_error: float
+    p95_error: float
+    overhead: float
+
+    @property
+    def throughput(self) -> float:
+        """
+        Measured urls per second.
+
+        :return: float
+        """
+        if self.wall_time <= 0:
+            return 0.0
+        return self.loads / self.wall_time
+
+    def to_text(self) -> str:
+        """
+        Text with all results, times in milliseconds.
+
+        :return: str
+        """
+        return (
+            f'concurrency: {self.concurrency} \t| '
+            f'loads: {self.loads} failures: {self.failures} \t| '
+            f'throughput: {round(self.throughput, ROUND_VALUE)} urls/s \t| '
+            f'error mean: {round(self.mean_error * 1000, ROUND_VALUE)} ms '
+            f'p95: {round(self.p95_error * 1000, ROUND_VALUE)} ms \t| '
+            f'overhead: {round(self.overhead * 1000, ROUND_VALUE)} ms/load'
+        )
+
+
+def run_benchmark(
+        server: StandInServer,
+        concurrency: int,
+        urls: int = BENCHMARK_URLS,
+        samples: int = 1,
+        ssl_context: ssl.SSLContext = None
+) -> BenchmarkResult:
+    """
+    Measure urls of running server with WebsiteMeasure at concurrency level.
+    Every sample is measured as separate load, so failures count failed
+    samples.
+    Measurement error is difference of measured load time and injected
+    ground truth, overhead is time of worker threads spent in successful
+    loads outside of measured load time (validation, pool, bookkeeping),
+    per load.
+
+    :param server: StandInServer
+    :param concurrency: int
+    :param urls: int, number of distinct urls
+    :param samples: int, samples of every url
+    :param ssl_context: ssl.SSLContext, trusting server certificate
+    :return: BenchmarkResult
+    """
+    measure = WebsiteMeasure()
+    measure.backend = MeasureBackend(ssl_context=ssl_context)
+    measure.samples = 1
+    busy = []
+
+    def measure_url(url: str):
+        start = perf_counter()
+        website = measure.measure_load_time(url)
+        busy.append((website, perf_counter() - start))
+        return website
+
+    loads = urls * samples
+    with MeasureEngine(measure_url, concurrency) as engine:
+        start = perf_counter()
+        engine.measure_all(
+            [server.get_url(f'/{index % urls}') for index in range(loads)]
+        )
+        wall_time = perf_counter() - start
+    measure.backend.close()
+
+    ground_truth = server.get_ground_truth()
+    measured = [
+        (website, seconds) for website, seconds in busy
+        if not website.is_failed()
+    ]
+    times = [value for website, _ in measured for value in website.samples]
+    errors = [value - ground_truth for value in times] or [0.0]
+    overhead = sum(seconds for _, seconds in measured) - sum(times)
+    return BenchmarkResult(
+        concurrency,
+        loads,
+        loads - len(times),
+        wall_time,
+        ground_truth,
+        stats.mean(errors),
+        stats.percentile(sorted(errors), 95),
+        max(0.0, overhead) / max(1, len(times))
+    )
+
+
+def get_arguments(args: list = None) -> argparse.Namespace:
+    """
+    Uses argparse to get benchmark settings from terminal.
+
+    :param args: list
+    :return: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark wlm against local server with injected '
+                    'latency, runs offline.'
+    )
+    parser.add_argument(
+        '--latency',
+        help=f'seconds before response (default: {BENCHMARK_LATENCY})',
+        type=float,
+        default=BENCHMARK_LATENCY
+    )
+    parser.add_argument(
+        '--bandwidth',
+        help='bytes per second of response body (default: no limit)',
+        type=float,
+        default=None
+    )
+    parser.add_argument(
+        '--body-size',
+        help=f'bytes of response body (default: {BENCHMARK_BODY_SIZE})',
+        type=int,
+        default=BENCHMARK_BODY_SIZE
+    )
+    parser.add_argument(
+        '--failure-rate',
+        help='part of requests answered with 500 response (default: 0)',
+        type=float,
+        default=0.0
+    )
+    parser.add_argument(
+        '--urls',
+        help=f'number of measured urls (default: {BENCHMARK_URLS})',
+        type=positive_int,
+        default=BENCHMARK_URLS
+    )
+    parser.add_argument(
+        '-s',
+        '--samples',
+        help='measurements of every url (default: 1)',
+        type=positive_int,
+        default=1
+    )
+    parser.add_argument(
+        '-c',
+        '--concurrency',
+        help='concurrency levels (default: '
+             f'{" ".join(map(str, BENCHMARK_CONCURRENCY_LEVELS))})',
+        nargs='+',
+        type=positive_int,
+        default=list(BENCHMARK_CONCURRENCY_LEVELS)
+    )
+    parser.add_argument(
+        '--certfile',
+        help='certificate (with key) of 127.0.0.1, serve HTTPS',
+        type=str,
+        default=None
+    )
+    parser.add_argument(
+        '--keyfile',
+        help='key of --certfile certificate',
+        type=str,
+        default=None
+    )
+    return parser.parse_args(args)
+
+
+def main(args: list = None) -> List[BenchmarkResult]:
+    """
+    Start stand-in server and print benchmark result of every concurrency
+    level.
+
+    usage: wlm-benchmark [-h] [--latency LATENCY] [--bandwidth BANDWIDTH]
+                         [--body-size BODY_SIZE]
+                         [--failure-rate FAILURE_RATE] [--urls URLS]
+                         [-s SAMPLES] [-c CONCURRENCY [CONCURRENCY ...]]
+                         [--certfile CERTFILE] [--keyfile KEYFILE]
+
+    :param args: list
+    :return: List[BenchmarkResult]
+    """
+    parsed = get_arguments(args)
+    ssl_context = None
+    if parsed.certfile:
+        ssl_context = ssl.create_default_context(cafile=parsed.certfile)
+
+    results = []
+    with StandInServer(
+            parsed.latency,
+            parsed.bandwidth,
+            parsed.body_size,
+            parsed.failure_rate,
+            parsed.certfile,
+            parsed.keyfile
+    ) as server:
+        print(
+            f'ground truth: '
+            f'{round(server.get_ground_truth() * 1000, ROUND_VALUE)} ms'
+        )
+        for concurrency in parsed.concurrency:
+            result = run_benchmark(
+                server, concurrency, parsed.urls, parsed.samples, ssl_context
+            )
+            print(result.to_text())
+            results.append(result)
+    return results
+
+
+if __name__ == '__main__':
+    main()
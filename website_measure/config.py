@@ -0,0 +1,111 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from website_measure import logger
+from website_measure.urls import UrlCollector, normalize_url
+from website_measure.validate import Validate
+
+
+@dataclass
+class BenchmarkGroup:
+    """
+    Dataclass object with main website, its competitors and recipients of
+    notifications.
+    """
+    name: str
+    url: str
+    competitors: List[str] = field(default_factory=list)
+    mail: Optional[str] = None
+    phone_number: Optional[str] = None
+
+
+def read_config_file(file_path: str) -> dict:
+    """
+    Read JSON, TOML (python>=3.11 or tomli) or YAML (PyYAML) config file,
+    format is chosen with file extension.
+
+    :param file_path: str
+    :return: dict
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.json':
+        with open(file_path) as file:
+            return json.load(file)
+    if extension == '.toml':
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError('TOML config requires python>=3.11 or tomli')
+        with open(file_path, 'rb') as file:
+            return tomllib.load(file)
+    if extension in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError('YAML config requires PyYAML')
+        with open(file_path) as file:
+            return yaml.safe_load(file)
+    raise ValueError(f'unknown config file format: {file_path}')
+
+
+def load_config(
+        file_path: str,
+        default_mail: str = None,
+        default_phone_number: str = None
+) -> List[BenchmarkGroup]:
+    """
+    Load benchmark groups from config file:
+        groups:
+          - name: shop
+            url: https://example.com/shop
+            competitors: [https://wp.pl, https://onet.pl]
+            mail: mail@example.com         # optional
+            phone_number: 123123123        # optional
+    Urls are validated and normalized, invalid competitor urls are reported
+    and skipped. Invalid main url, mail or phone number raises ValueError.
+
+    :param file_path: str
+    :param default_mail: str, used for groups without mail
+    :param default_phone_number: str, used for groups without phone number
+    :return: List[BenchmarkGroup]
+    """
+    config = read_config_file(file_path) or {}
+    groups = []
+    for index, data in enumerate(config.get('groups') or []):
+        if not data.get('url'):
+            raise ValueError(f'group {index + 1} without url in {file_path}')
+        Validate('url').is_valid(data['url'])
+        url = normalize_url(data['url'])
+
+        collector = UrlCollector(exclude=[url])
+        collector.add_all(data.get('competitors') or [])
+        collector.report()
+
+        mail = data.get('mail') or default_mail
+        if mail:
+            Validate('mail').is_valid(mail)
+        phone_number = str(data.get('phone_number') or '') or \
+            default_phone_number
+        if phone_number:
+            Validate('phone_number').is_valid(phone_number)
+
+        groups.append(BenchmarkGroup(
+            str(data.get('name') or url),
+            url,
+            collector.result.urls,
+            mail,
+            phone_number
+        ))
+
+    if not groups:
+        raise ValueError(f'no benchmark groups in {file_path}')
+    logger.info(
+        f'\n[INFO][load_config]'
+        f'\nLoaded {len(groups)} benchmark groups from {file_path}'
+    )
+    return groups
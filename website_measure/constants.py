@@ -33,3 +33,127 @@ REGEX_VALIDATION = {
 }
 
 ROUND_VALUE = 3  # 0.33333 -> 0.333
+
+DEFAULT_CONCURRENCY = 10  # max websites measured at the same time
+DEFAULT_PROCESSES = 1  # worker processes, 1 - measure in main process
+# Seconds to wait for records of worker after deadline, and for running
+# workers on close, before they are abandoned
+PROCESS_GRACE_TIMEOUT = 5.0
+
+DEFAULT_SAMPLES = 1  # measurements of every website in one run
+# Statistics available for ranking, computed from all samples of website
+STATISTICS = ('min', 'median', 'mean', 'p90', 'p95', 'p99', 'stddev')
+DEFAULT_STATISTIC = 'median'
+
+# Phases of single website load, measured separately by MeasureBackend
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'download')
+# 'time' - total load time of all phases, 'network' - total time without dns
+METRICS = ('time', 'network') + PHASES
+DEFAULT_METRIC = 'time'
+USER_AGENT = 'wlm/1.0 (Website Load Measure)'
+MAX_REDIRECTS = 10
+
+# cold - new connection for every sample, warm - reuse pooled connection,
+# both - cold and warm samples reported side by side
+MODES = ('cold', 'warm', 'both')
+DEFAULT_MODE = 'cold'
+MAX_IDLE_CONNECTIONS = 4  # idle keep-alive connections kept per host
+
+CHUNK_SIZE = 64 * 1024  # bytes read from response body at once
+# on - accept compressed body (like browsers), off - uncompressed body,
+# both - compressed and uncompressed reported side by side
+COMPRESSION_MODES = ('on', 'off', 'both')
+DEFAULT_COMPRESSION = 'on'
+# Full page load, resources of one origin loaded at the same time (like
+# browsers)
+DEFAULT_PARALLELISM = 6
+# system - resolve every load with system resolver, cache - in-process cache
+# honoring TTL of records (dnspython) or DNS_DEFAULT_TTL, pre-resolve -
+# cache filled with all hosts before measurement
+DNS_MODES = ('system', 'cache', 'pre-resolve')
+DEFAULT_DNS = 'system'
+DNS_DEFAULT_TTL = 300  # seconds of caching addresses without known TTL
+# Limits of loads of one origin (--host-concurrency, --host-rate) are off
+# by default, token bucket of origin starts DEFAULT_RATE_BURST loads at once
+DEFAULT_RATE_BURST = 1
+# Load test of main website (--load-test), steps of ramp with number of
+# virtual clients, every step runs DEFAULT_LOAD_DURATION seconds
+DEFAULT_LOAD_RAMP = (1, 2, 4, 8, 16)
+DEFAULT_LOAD_DURATION = 10.0
+# Step is saturated when throughput grows less than this part of linear
+# scaling
+LOAD_SATURATION_GAIN = 0.2
+# Client waits LOAD_ERROR_BACKOFF seconds after failed load, doubled after
+# every next failure up to LOAD_MAX_BACKOFF, step (and ramp) stops when more
+# than LOAD_MAX_ERROR_RATE of at least LOAD_ERROR_MIN_LOADS loads failed
+LOAD_ERROR_BACKOFF = 0.05
+LOAD_MAX_BACKOFF = 1.0
+LOAD_MAX_ERROR_RATE = 0.5
+LOAD_ERROR_MIN_LOADS = 10
+DEFAULT_CONNECT_TIMEOUT = 10.0  # seconds to open TCP connection
+DEFAULT_READ_TIMEOUT = 30.0  # seconds of TLS handshake or single read
+# Kinds of errors of failed measurements, 'decode' - corrupt compressed
+# body, 'deadline' - not finished before end of run deadline
+ERROR_KINDS = (
+    'dns', 'connect', 'tls', 'timeout', 'http', 'decode', 'deadline', 'error'
+)
+
+DEFAULT_INTERVAL = 300  # seconds between benchmark rounds of `wlm serve`
+DEFAULT_JITTER = 0  # max random delay of round start in seconds
+
+HISTORY_FILE_NAME = 'history.sqlite3'
+HISTORY_BATCH_SIZE = 500  # rows written to history store in one transaction
+
+DEFAULT_SCHEME = 'http'  # added to urls without scheme, like browsers do
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+INVALID_URLS_TEMPLATE = '[ERROR] {count} invalid URLs skipped:'
+
+# Logging pipeline, every value can be overridden with environment variable
+# of the same name prefixed with WLM_, example: WLM_LOG_LEVEL=DEBUG
+LOG_LEVEL = 'INFO'
+LOG_QUEUE_SIZE = 10000  # records waiting for writer, next ones are dropped
+LOG_MAX_BYTES = 10 * 1024 * 1024  # size based rotation of log file
+LOG_BACKUP_COUNT = 5
+# Time based rotation instead of size, example: 'midnight'
+LOG_ROTATE_WHEN = ''
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+NOTIFY_RETRIES = 3  # retries of failed notification
+NOTIFY_BACKOFF = 1.0  # seconds before first retry, doubled for next ones
+DEFAULT_NOTIFY_TIMEOUT = 30.0  # seconds to wait for delivery before exit
+
+ALERTS_FILE_NAME = 'alerts.json'  # cooldown and digest state of alerts
+DEFAULT_ALERT_COOLDOWN = 0  # seconds between the same alerts, 0 - disabled
+# Alert decisions on samples: mail when main website is slower than
+# competitor by MAIL_RATIO, sms by SMS_RATIO, confirmed with Mann-Whitney
+# test on significance level ALERT_ALPHA with enough samples
+DEFAULT_MAIL_RATIO = 1.0
+DEFAULT_SMS_RATIO = 2.0
+DEFAULT_ALERT_ALPHA = 0.05
+ALERT_MIN_SAMPLES = 5  # samples of both websites needed for the test
+OUTLIER_THRESHOLD = 3.5  # modified z-score (MAD) of rejected samples
+TRIM_PROPORTION = 0.1  # part of samples cut from each end of trimmed mean
+DIGEST_SUBJECT = 'digest from Website Load Measure app'
+DIGEST_TEMPLATE = '''
+{alerts_number} alerts since {since}:\n
+{alerts}
+'''
+DIGEST_LINE_TEMPLATE = '{date}\t{main_url} is {main_website_place} of ' \
+                       '{all_websites} tested pages'
+
+# Defaults of `wlm-benchmark` suite with local stand-in server
+BENCHMARK_LATENCY = 0.05  # seconds before response
+BENCHMARK_BODY_SIZE = 16 * 1024  # bytes
+BENCHMARK_URLS = 50  # measured urls at every concurrency level
+BENCHMARK_CONCURRENCY_LEVELS = (1, 5, 10, 25)
+
+# Adaptive sampling (--max-samples), website is sampled until confidence
+# interval of ranking statistic is narrow or separated from neighbours
+ADAPTIVE_CONFIDENCE = 0.95  # confidence level of intervals
+ADAPTIVE_MIN_SAMPLES = 5  # samples before interval is trusted
+DEFAULT_CONFIDENCE_WIDTH = 0.05  # half-width of interval, part of value
+
+# Latency histograms: buckets keep HISTOGRAM_DIGITS significant digits,
+# values are counted in HISTOGRAM_UNIT seconds (microseconds)
+HISTOGRAM_DIGITS = 2
+HISTOGRAM_UNIT = 1e-6
@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from website_measure import stats
+from website_measure.constants import (
+    ALERT_MIN_SAMPLES, DEFAULT_ALERT_ALPHA, DEFAULT_MAIL_RATIO,
+    DEFAULT_METRIC, DEFAULT_SMS_RATIO,
+)
+from website_measure.website import WebsiteMeasurement
+
+
+@dataclass
+class Comparison:
+    """
+    Dataclass object with comparison of main website and one competitor.
+    ratio - robust estimate of main website time divided by competitor
+    time, mail and sms - slowdown by mail and sms ratio is real, p-values
+    of slowdown tests are None if there were not enough samples.
+    """
+    url: str
+    ratio: float
+    mail: bool
+    sms: bool
+    mail_p_value: Optional[float] = None
+    sms_p_value: Optional[float] = None
+
+
+class AlertPolicy:
+    """
+    Decide if main website is really slower than competitors.
+    Samples of both websites are cleaned of outliers (MAD), compared with
+    trimmed means and, with at least ALERT_MIN_SAMPLES samples of both,
+    slowdown by ratio is confirmed with one-sided Mann-Whitney test of main
+    samples against competitor samples multiplied by ratio.
+    With fewer samples outliers can not be detected, so medians of all
+    samples are compared.
+    """
+    def __init__(
+            self,
+            mail_ratio: float = DEFAULT_MAIL_RATIO,
+            sms_ratio: float = DEFAULT_SMS_RATIO,
+            alpha: float = DEFAULT_ALERT_ALPHA,
+            metric: str = DEFAULT_METRIC
+    ):
+        """
+        self.mail_ratio - slowdown of main website which sends mail
+        self.sms_ratio - slowdown of main website which sends sms
+        self.alpha - significance level of slowdown test
+        self.metric - total time or phase compared, one of METRICS
+
+        :param mail_ratio: float
+        :param sms_ratio: float
+        :param alpha: float
+        :param metric: str
+        """
+        self.mail_ratio = mail_ratio
+        self.sms_ratio = sms_ratio
+        self.alpha = alpha
+        self.metric = metric
+
+    def compare(
+            self, main: WebsiteMeasurement, page: WebsiteMeasurement
+    ) -> Comparison:
+        """
+        Compare samples of main website and competitor.
+
+        :param main: WebsiteMeasurement
+        :param page: WebsiteMeasurement
+        :return: Comparison
+        """
+        main_samples = main.get_samples(self.metric)
+        page_samples = page.get_samples(self.metric)
+        if min(len(main_samples), len(page_samples)) < ALERT_MIN_SAMPLES:
+            ratio = self.get_ratio(
+                stats.statistic(main_samples, 'median'),
+                stats.statistic(page_samples, 'median')
+            )
+            return Comparison(
+                page.url, ratio,
+                ratio > self.mail_ratio, ratio >= self.sms_ratio
+            )
+
+        main_samples = stats.reject_outliers(main_samples)
+        page_samples = stats.reject_outliers(page_samples)
+        ratio = self.get_ratio(
+            stats.trimmed_mean(main_samples), stats.trimmed_mean(page_samples)
+        )
+
+        mail_p_value = self.test(main_samples, page_samples, self.mail_ratio)
+        sms_p_value = self.test(main_samples, page_samples, self.sms_ratio)
+        return Comparison(
+            page.url, ratio,
+            ratio > self.mail_ratio and mail_p_value < self.alpha,
+            ratio >= self.sms_ratio and sms_p_value < self.alpha,
+            mail_p_value, sms_p_value
+        )
+
+    @staticmethod
+    def get_ratio(main_time: float, page_time: float) -> float:
+        """
+        Main website time divided by competitor time, 1.0 for competitor
+        without time.
+
+        :param main_time: float
+        :param page_time: float
+        :return: float
+        """
+        return main_time / page_time if page_time > 0 else 1.0
+
+    @staticmethod
+    def test(
+            main_samples: List[float],
+            page_samples: List[float],
+            slowdown: float
+    ) -> float:
+        """
+        P-value of main website being slower than competitor times
+        slowdown.
+
+        :param main_samples: List[float]
+        :param page_samples: List[float]
+        :param slowdown: float
+        :return: float
+        """
+        return stats.mann_whitney(
+            main_samples, [value * slowdown for value in page_samples]
+        )
+
+    def compare_all(
+            self,
+            main: WebsiteMeasurement,
+            pages: List[WebsiteMeasurement]
+    ) -> List[Comparison]:
+        """
+        Compare main website with all competitors which did not fail.
+        Main website itself is skipped when pages contain it.
+
+        :param main: WebsiteMeasurement
+        :param pages: List[WebsiteMeasurement]
+        :return: List[Comparison]
+        """
+        return [
+            self.compare(main, page) for page in pages
+            if page is not main and not page.is_failed()
+        ]
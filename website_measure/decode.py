@@ -0,0 +1,176 @@
+import zlib
+from functools import lru_cache
+from typing import Optional
+
+from website_measure.constants import CHUNK_SIZE
+
+
+@lru_cache(maxsize=None)
+def get_brotli():
+    """
+    Brotli module (brotli or brotlicffi), None if not installed.
+    Imported only once, with first compressed load.
+
+    :return: module or None
+    """
+    try:
+        import brotli
+    except ImportError:
+        try:
+            import brotlicffi as brotli
+        except ImportError:
+            return None
+    return brotli
+
+
+class DecodeError(ValueError):
+    """
+    Compressed body is corrupt or truncated.
+    """
+
+
+def get_accept_encoding() -> str:
+    """
+    Value of Accept-Encoding header with all supported encodings, br only
+    with installed brotli.
+
+    :return: str
+    """
+    if get_brotli() is None:
+        return 'gzip, deflate'
+    return 'gzip, deflate, br'
+
+
+class StreamDecoder:
+    """
+    Decompress response body chunk by chunk, like a browser.
+    Decoded data is only counted (and optionally copied to sink), so memory
+    use does not depend on size of body.
+    Errors of zlib and brotli are raised as DecodeError.
+    """
+    def __init__(self, encoding: str):
+        """
+        self.encoding - Content-Encoding of response: gzip, deflate or br
+        self.decompressor - zlib or brotli decompressor
+        self.started - True after first chunk, deflate without zlib header
+        is detected with first chunk
+
+        :param encoding: str
+        """
+        self.encoding = encoding
+        self.started = False
+        if encoding in ('gzip', 'x-gzip'):
+            self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            self.decompressor = zlib.decompressobj()
+        elif encoding == 'br' and get_brotli() is not None:
+            self.decompressor = get_brotli().Decompressor()
+        else:
+            raise ValueError(f'unsupported content encoding: {encoding!r}')
+
+    def decode(self, data: bytes, sink: Optional[bytearray] = None) -> int:
+        """
+        Decompress chunk of body.
+        Return number of decoded bytes, which are added to sink if passed.
+
+        :param data: bytes
+        :param sink: Optional[bytearray]
+        :return: int
+        """
+        try:
+            return self.decode_chunk(data, sink)
+        except self.get_errors() as e:
+            raise DecodeError(f'corrupt {self.encoding} body: {e}') from e
+
+    def decode_chunk(self, data: bytes, sink: Optional[bytearray]) -> int:
+        """
+        Decompress chunk of body with zlib or brotli, deflate without zlib
+        header is detected with first chunk.
+
+        :param data: bytes
+        :param sink: Optional[bytearray]
+        :return: int
+        """
+        if self.encoding == 'br':
+            return self.add(self.decompressor.process(bytes(data)), sink)
+
+        if not self.started and self.encoding == 'deflate':
+            self.started = True
+            try:
+                return self.decode_zlib(data, sink)
+            except zlib.error:
+                self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        self.started = True
+        return self.decode_zlib(data, sink)
+
+    def decode_zlib(self, data: bytes, sink: Optional[bytearray]) -> int:
+        """
+        Decompress chunk with zlib in CHUNK_SIZE pieces.
+
+        :param data: bytes
+        :param sink: Optional[bytearray]
+        :return: int
+        """
+        decoded = 0
+        while data:
+            decoded += self.add(
+                self.decompressor.decompress(data, CHUNK_SIZE), sink
+            )
+            data = self.decompressor.unconsumed_tail
+        return decoded
+
+    def flush(self, sink: Optional[bytearray] = None) -> int:
+        """
+        Decompress rest of buffered data after end of body.
+        Raise DecodeError if compressed stream did not end.
+
+        :param sink: Optional[bytearray]
+        :return: int
+        """
+        if self.encoding == 'br' or not self.started:
+            return 0
+        try:
+            data = self.decompressor.flush()
+        except zlib.error as e:
+            raise DecodeError(f'corrupt {self.encoding} body: {e}') from e
+        if not self.decompressor.eof:
+            raise DecodeError(f'truncated {self.encoding} body')
+        return self.add(data, sink)
+
+    def get_errors(self) -> tuple:
+        """
+        Exception types of decompressor.
+
+        :return: tuple
+        """
+        if self.encoding == 'br':
+            return (get_brotli().error,)
+        return (zlib.error,)
+
+    @staticmethod
+    def add(data: bytes, sink: Optional[bytearray]) -> int:
+        """
+        Add decoded data to sink if passed, return its length.
+
+        :param data: bytes
+        :param sink: Optional[bytearray]
+        :return: int
+        """
+        if sink is not None:
+            sink += data
+        return len(data)
+
+
+def get_decoder(encoding: Optional[str]) -> Optional[StreamDecoder]:
+    """
+    Decoder of Content-Encoding, None for identity or not supported
+    encoding (body is counted as not compressed).
+
+    :param encoding: Optional[str]
+    :return: Optional[StreamDecoder]
+    """
+    encoding = (encoding or '').strip().lower()
+    if encoding in ('gzip', 'x-gzip', 'deflate') or \
+            (encoding == 'br' and get_brotli() is not None):
+        return StreamDecoder(encoding)
+    return None
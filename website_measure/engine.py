@@ -0,0 +1,297 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import monotonic
+from typing import Callable, List, Optional
+
+from website_measure import logger
+from website_measure.constants import (
+    DEFAULT_CONCURRENCY, DEFAULT_PROCESSES, PROCESS_GRACE_TIMEOUT,
+)
+from website_measure.website import WebsiteMeasurement
+
+# WebsiteMeasure of worker process, created by init_worker
+worker_measure = None
+
+
+class MeasureEngine:
+    """
+    Measure many websites concurrently with a bounded thread pool.
+    Threads are kept between calls of measure_all until close().
+    """
+    def __init__(
+            self,
+            measure: Callable[[str], WebsiteMeasurement],
+            concurrency: int = DEFAULT_CONCURRENCY
+    ):
+        """
+        self.measure - callable measuring single url, example:
+        WebsiteMeasure.measure_load_time
+        self.concurrency - max number of websites measured at the same time
+        self.executor - thread pool created with first measure_all call
+
+        :param measure: Callable[[str], WebsiteMeasurement]
+        :param concurrency: int
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.measure = measure
+        self.concurrency = concurrency
+        self.executor = None
+
+    def __enter__(self):
+        """
+        Context manager method.
+
+        :return: self
+        """
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        """
+        Context manager method.
+        Stop threads.
+        """
+        self.close()
+
+    def measure_all(
+            self, urls: List[str], timeout: float = None
+    ) -> List[Optional[WebsiteMeasurement]]:
+        """
+        Measure all passed urls in parallel.
+        Every url is measured by its own call of self.measure, so timing of
+        one website does not include time of the others.
+        Results keep order of passed urls, first raised exception is
+        re-raised. Urls not measured within timeout seconds are None.
+
+        :param urls: List[str]
+        :param timeout: float, None - no limit
+        :return: List[Optional[WebsiteMeasurement]]
+        """
+        if not urls:
+            return []
+
+        logger.info(
+            f'\n[INFO][MeasureEngine][measure_all]'
+            f'\nMeasure {len(urls)} websites with up to '
+            f'{self.concurrency} workers'
+        )
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix='wlm-measure'
+            )
+        futures = [self.executor.submit(self.measure, url) for url in urls]
+        return get_results(futures, timeout)
+
+    def close(self) -> None:
+        """
+        Stop threads of self.executor.
+
+        :return: None
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+def get_results(futures: list, timeout: float = None) -> list:
+    """
+    Wait up to timeout seconds for futures and return their results in
+    order, None for not finished ones (which are cancelled if not started).
+    First raised exception is re-raised.
+
+    :param futures: List[concurrent.futures.Future]
+    :param timeout: float, None - no limit
+    :return: list
+    """
+    done, not_done = wait(futures, timeout)
+    for future in not_done:
+        future.cancel()
+    return [future.result() if future in done else None for future in futures]
+
+
+def init_worker(settings: dict, concurrency: int) -> None:
+    """
+    Initializer of worker process.
+    Create own WebsiteMeasure with own MeasureBackend (connection pool) and
+    own MeasureEngine threads, so measurements of workers are independent.
+
+    :param settings: dict, WebsiteMeasure.get_settings() of coordinator
+    :param concurrency: int, max websites measured at the same time by
+    this worker
+    :return: None
+    """
+    global worker_measure
+    from website_measure.main import WebsiteMeasure
+    worker_measure = WebsiteMeasure()
+    worker_measure.apply_settings(settings)
+    worker_measure.engine = MeasureEngine(
+        worker_measure.measure_load_time, concurrency
+    )
+
+
+def measure_shard(
+        urls: List[str], timeout: float = None
+) -> List[Optional[tuple]]:
+    """
+    Measure shard of urls in worker process within timeout seconds (None -
+    round deadline from settings), sampling stops at the deadline.
+    Return compact records of WebsiteMeasurement.to_record() of every url,
+    None for urls not measured in time, so finished urls are kept.
+
+    :param urls: List[str]
+    :param timeout: float
+    :return: List[Optional[tuple]]
+    """
+    if timeout is None:
+        timeout = worker_measure.deadline
+    worker_measure.deadline_at = None
+    if timeout is not None:
+        worker_measure.deadline_at = monotonic() + timeout
+    worker_measure.prepare_dns(urls)
+    return [
+        None if website is None else website.to_record()
+        for website in worker_measure.engine.measure_all(urls, timeout)
+    ]
+
+
+class ProcessEngine:
+    """
+    Measure many websites with pool of worker processes.
+    Coordinator shards urls across workers, every worker measures its shard
+    with own threads and connection pool and sends back compact records,
+    which are merged in order of passed urls.
+    Worker processes are kept between calls of measure_all until close().
+    """
+    def __init__(
+            self,
+            settings: dict,
+            processes: int = DEFAULT_PROCESSES,
+            concurrency: int = DEFAULT_CONCURRENCY
+    ):
+        """
+        self.settings - measurement settings passed to every worker
+        self.processes - number of worker processes
+        self.concurrency - max number of websites measured at the same time
+        by all workers, split evenly between workers
+        self.executor - process pool created with first measure_all call
+        self.futures - shards submitted with the last measure_all call
+
+        :param settings: dict, WebsiteMeasure.get_settings()
+        :param processes: int
+        :param concurrency: int
+        """
+        if processes < 1:
+            raise ValueError('processes must be at least 1')
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.settings = settings
+        self.processes = processes
+        self.concurrency = concurrency
+        self.executor = None
+        self.futures = []
+
+    def __enter__(self):
+        """
+        Context manager method.
+
+        :return: self
+        """
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        """
+        Context manager method.
+        Stop worker processes.
+        """
+        self.close()
+
+    def get_shards(self, urls: List[str]) -> List[List[str]]:
+        """
+        Split urls round robin into up to self.processes not empty shards.
+
+        :param urls: List[str]
+        :return: List[List[str]]
+        """
+        shards = [urls[index::self.processes] for index in
+                  range(self.processes)]
+        return [shard for shard in shards if shard]
+
+    def measure_all(
+            self, urls: List[str], timeout: float = None
+    ) -> List[Optional[WebsiteMeasurement]]:
+        """
+        Measure all passed urls in worker processes.
+        Results keep order of passed urls, first raised exception is
+        re-raised. Timeout is passed to workers, urls not measured within
+        timeout seconds are None. Records of worker are awaited
+        PROCESS_GRACE_TIMEOUT seconds after timeout, shard of worker which
+        did not answer in time is None.
+
+        :param urls: List[str]
+        :param timeout: float, None - no limit
+        :return: List[Optional[WebsiteMeasurement]]
+        """
+        if not urls:
+            return []
+
+        logger.info(
+            f'\n[INFO][ProcessEngine][measure_all]'
+            f'\nMeasure {len(urls)} websites with {self.processes} '
+            f'processes and up to {self.concurrency} workers'
+        )
+        if self.executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+                initargs=(
+                    self.settings,
+                    max(1, -(-self.concurrency // self.processes))
+                )
+            )
+        shards = self.get_shards(urls)
+        self.futures = [
+            self.executor.submit(measure_shard, shard, timeout)
+            for shard in shards
+        ]
+        if timeout is not None:
+            timeout += PROCESS_GRACE_TIMEOUT
+        measured = {}
+        for shard, records in zip(shards, get_results(self.futures, timeout)):
+            for url, record in zip(shard, records or []):
+                if record is not None:
+                    measured[url] = WebsiteMeasurement.from_record(record)
+        return [measured.get(url) for url in urls]
+
+    def close(self, timeout: float = PROCESS_GRACE_TIMEOUT) -> None:
+        """
+        Stop worker processes of self.executor without waiting for
+        measurements: waiting shards are cancelled and workers still
+        running after timeout seconds are terminated.
+
+        :param timeout: float
+        :return: None
+        """
+        if self.executor is None:
+            return
+        _, running = wait(self.futures, timeout)
+        processes = list((getattr(self.executor, '_processes', None) or
+                          {}).values())
+        if sys.version_info >= (3, 9):
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            for future in self.futures:
+                future.cancel()
+            self.executor.shutdown(wait=False)
+        if running:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            logger.warning(
+                f'\n[WARNING][ProcessEngine][close]'
+                f'\nTerminated workers with {len(running)} running shards'
+            )
+        self.executor = None
+        self.futures = []
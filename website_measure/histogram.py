@@ -0,0 +1,261 @@
+import base64
+import math
+import struct
+import zlib
+from array import array
+from typing import Dict, Iterable
+
+from website_measure.constants import HISTOGRAM_DIGITS, HISTOGRAM_UNIT
+
+# digits, unit, count, min, max, total, sum of squares
+HEADER = struct.Struct('<Bdqdddd')
+
+
+class Histogram:
+    """
+    Log-bucketed histogram of latencies (HDR histogram style).
+    Values are counted in buckets with relative width below
+    10 ** -self.digits, so memory does not depend on number of recorded
+    values and percentiles are exact within that precision. Count, min,
+    max, mean and stddev are exact.
+    Histograms with the same precision are merged by adding counts.
+    """
+    def __init__(
+            self,
+            digits: int = HISTOGRAM_DIGITS,
+            unit: float = HISTOGRAM_UNIT
+    ):
+        """
+        self.digits - significant decimal digits of bucketed values
+        self.unit - seconds of the smallest distinguished value
+        self.sub_buckets - buckets of every power of two, values lower
+        than self.sub_buckets units are counted exactly
+        self.half - half of self.sub_buckets
+        self.magnitude - log2 of self.sub_buckets
+        self.counts - counts of values by bucket index, only used buckets
+        self.count - number of recorded values
+        self.min, self.max - the lowest and the highest recorded value
+        self.total, self.squares - sum and sum of squares of values
+
+        :param digits: int
+        :param unit: float
+        """
+        if not 0 < digits <= 5:
+            raise ValueError('digits must be between 1 and 5')
+        self.digits = digits
+        self.unit = unit
+        self.sub_buckets = 2 ** math.ceil(math.log2(2 * 10 ** digits))
+        self.half = self.sub_buckets // 2
+        self.magnitude = self.sub_buckets.bit_length() - 1
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+        self.squares = 0.0
+
+    def __len__(self):
+        """
+        Number of recorded values.
+
+        :return: int
+        """
+        return self.count
+
+    @classmethod
+    def from_values(
+            cls, values: Iterable[float], digits: int = HISTOGRAM_DIGITS
+    ) -> 'Histogram':
+        """
+        Histogram with all values recorded.
+
+        :param values: Iterable[float]
+        :param digits: int
+        :return: Histogram
+        """
+        histogram = cls(digits)
+        for value in values:
+            histogram.record(value)
+        return histogram
+
+    def get_index(self, value: float) -> int:
+        """
+        Index of bucket of value in seconds.
+
+        :param value: float
+        :return: int
+        """
+        units = max(0, int(value / self.unit + 0.5))
+        if units < self.sub_buckets:
+            return units
+        shift = units.bit_length() - self.magnitude
+        return (shift + 1) * self.half + (units >> shift) - self.half
+
+    def get_value(self, index: int) -> float:
+        """
+        Middle of bucket of index in seconds.
+
+        :param index: int
+        :return: float
+        """
+        if index < self.sub_buckets:
+            return index * self.unit
+        shift = index // self.half - 1
+        lower = (index % self.half + self.half) << shift
+        return (lower + ((1 << shift) - 1) / 2) * self.unit
+
+    def record(self, value: float, count: int = 1) -> None:
+        """
+        Count value in seconds.
+
+        :param value: float
+        :param count: int
+        :return: None
+        """
+        index = self.get_index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.total += value * count
+        self.squares += value * value * count
+
+    def merge(self, other: 'Histogram') -> None:
+        """
+        Add counts of other histogram with the same precision.
+
+        :param other: Histogram
+        :return: None
+        """
+        if (other.digits, other.unit) != (self.digits, self.unit):
+            raise ValueError('histograms have different precision')
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self.squares += other.squares
+
+    def percentile(self, percent: float) -> float:
+        """
+        Value below which percent of recorded values are, within
+        precision of buckets.
+
+        :param percent: float, 0 - 100
+        :return: float
+        """
+        if not self.count:
+            raise ValueError('percentile of empty histogram')
+        if percent <= 0:
+            return self.min
+        if percent >= 100:
+            return self.max
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self.get_value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """
+        Exact mean of recorded values.
+
+        :return: float
+        """
+        if not self.count:
+            raise ValueError('mean of empty histogram')
+        return self.total / self.count
+
+    @property
+    def stddev(self) -> float:
+        """
+        Sample standard deviation of recorded values, 0.0 for less than 2
+        values.
+
+        :return: float
+        """
+        if self.count < 2:
+            return 0.0
+        variance = (self.squares - self.total ** 2 / self.count) / \
+            (self.count - 1)
+        return math.sqrt(max(0.0, variance))
+
+    def summarize(self) -> Dict[str, float]:
+        """
+        All STATISTICS of recorded values.
+
+        :return: Dict[str, float]
+        """
+        return {
+            'min': self.min,
+            'median': self.percentile(50),
+            'mean': self.mean,
+            'p90': self.percentile(90),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'stddev': self.stddev,
+        }
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact serialization: header with exact values and compressed
+        pairs of bucket index delta and count.
+
+        :return: bytes
+        """
+        pairs = array('q')
+        previous = 0
+        for index in sorted(self.counts):
+            pairs.extend((index - previous, self.counts[index]))
+            previous = index
+        header = HEADER.pack(
+            self.digits, self.unit, self.count, self.min, self.max,
+            self.total, self.squares
+        )
+        return header + zlib.compress(pairs.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Histogram':
+        """
+        Histogram serialized with to_bytes().
+
+        :param data: bytes
+        :return: Histogram
+        """
+        digits, unit, count, minimum, maximum, total, squares = \
+            HEADER.unpack_from(data)
+        histogram = cls(digits, unit)
+        histogram.count = count
+        histogram.min = minimum
+        histogram.max = maximum
+        histogram.total = total
+        histogram.squares = squares
+        pairs = array('q')
+        pairs.frombytes(zlib.decompress(data[HEADER.size:]))
+        index = 0
+        for delta, bucket_count in zip(pairs[::2], pairs[1::2]):
+            index += delta
+            histogram.counts[index] = bucket_count
+        return histogram
+
+    def to_text(self) -> str:
+        """
+        to_bytes() serialization as base64 text, for text result file.
+
+        :return: str
+        """
+        return base64.b64encode(self.to_bytes()).decode('ascii')
+
+    @classmethod
+    def from_text(cls, text: str) -> 'Histogram':
+        """
+        Histogram serialized with to_text().
+
+        :param text: str
+        :return: Histogram
+        """
+        return cls.from_bytes(base64.b64decode(text))
@@ -0,0 +1,317 @@
+import os
+import queue
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from website_measure import LOG_DIR_PATH, logger
+from website_measure.constants import (
+    HISTORY_BATCH_SIZE, HISTORY_FILE_NAME, PHASES,
+)
+from website_measure.histogram import Histogram
+from website_measure.website import WebsiteMeasurement
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS samples (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    measured_at REAL NOT NULL,
+    mode TEXT NOT NULL,
+    sample INTEGER NOT NULL,
+    time REAL NOT NULL,
+    {', '.join(f'{phase} REAL NOT NULL' for phase in PHASES)},
+    bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_url_measured_at
+    ON samples (url, measured_at);
+CREATE INDEX IF NOT EXISTS samples_run_id ON samples (run_id);
+CREATE TABLE IF NOT EXISTS histograms (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    measured_at REAL NOT NULL,
+    mode TEXT NOT NULL,
+    histogram BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS histograms_url_measured_at
+    ON histograms (url, measured_at);
+'''
+COLUMNS = (
+    'run_id', 'url', 'measured_at', 'mode', 'sample', 'time', *PHASES,
+    'bytes',
+)
+INSERT = f'INSERT INTO samples ({", ".join(COLUMNS)}) ' \
+         f'VALUES ({", ".join("?" for _ in COLUMNS)})'
+INSERT_HISTOGRAM = 'INSERT INTO histograms ' \
+                   '(run_id, url, measured_at, mode, histogram) ' \
+                   'VALUES (?, ?, ?, ?, ?)'
+
+
+@dataclass
+class HistorySample:
+    """
+    Dataclass object with single sample read from history store.
+    """
+    run_id: str
+    url: str
+    measured_at: float
+    mode: str
+    sample: int
+    time: float
+    dns: float
+    connect: float
+    tls: float
+    ttfb: float
+    download: float
+    bytes: int
+
+
+class HistoryStore:
+    """
+    Persistent append-only history of all measurement samples in SQLite
+    database, with compact histogram of load times of every measurement.
+    Without self.keep_samples only histograms are saved, so size of
+    history does not grow with number of samples.
+    Samples are written in batches by background thread, so saving does not
+    slow down measurement. Queries use (url, measured_at) index.
+    """
+    def __init__(
+            self,
+            file_path: str = os.path.join(LOG_DIR_PATH, HISTORY_FILE_NAME),
+            batch_size: int = HISTORY_BATCH_SIZE,
+            keep_samples: bool = True
+    ):
+        """
+        self.file_path - path of SQLite database file
+        self.batch_size - max rows written in one transaction
+        self.keep_samples - save every sample next to histograms
+        self.queue - rows waiting for writer thread
+        self.writer - background writer thread, started by open()
+
+        :param file_path: str
+        :param batch_size: int
+        :param keep_samples: bool
+        """
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.keep_samples = keep_samples
+        self.queue = queue.Queue()
+        self.writer = None
+
+    def __enter__(self):
+        """
+        Context manager method.
+        Create database and start writer thread.
+
+        :return: self
+        """
+        self.open()
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        """
+        Context manager method.
+        Write waiting rows and stop writer thread.
+        """
+        self.close()
+
+    def open(self) -> None:
+        """
+        Create database schema and start writer thread.
+
+        :return: None
+        """
+        if self.writer is not None:
+            return
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+        self.writer = threading.Thread(
+            target=self.write_rows, name='wlm-history', daemon=True
+        )
+        self.writer.start()
+
+    def close(self) -> None:
+        """
+        Write waiting rows and stop writer thread.
+
+        :return: None
+        """
+        if self.writer is None:
+            return
+        self.queue.put(None)
+        self.writer.join()
+        self.writer = None
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        New connection to database.
+
+        :return: sqlite3.Connection
+        """
+        return sqlite3.connect(self.file_path)
+
+    def add(
+            self,
+            run_id: str,
+            websites: Iterable[WebsiteMeasurement],
+            measured_at: float
+    ) -> None:
+        """
+        Queue all samples (if self.keep_samples) and histograms of
+        websites (with variants) to write.
+
+        :param run_id: str
+        :param websites: Iterable[WebsiteMeasurement]
+        :param measured_at: float, unix timestamp
+        :return: None
+        """
+        for website in websites:
+            for measurement in (website, *website.variants.values()):
+                if measurement.is_failed():
+                    continue
+                self.queue.put((INSERT_HISTOGRAM, (
+                    run_id, measurement.url, measured_at, measurement.mode,
+                    measurement.histogram.to_bytes()
+                )))
+                if not self.keep_samples:
+                    continue
+                for row in self.get_rows(run_id, measurement, measured_at):
+                    self.queue.put((INSERT, row))
+
+    @staticmethod
+    def get_rows(
+            run_id: str, website: WebsiteMeasurement, measured_at: float
+    ) -> Iterable[tuple]:
+        """
+        Database rows with all samples of website.
+
+        :param run_id: str
+        :param website: WebsiteMeasurement
+        :param measured_at: float
+        :return: Iterable[tuple]
+        """
+        phase_samples = [website.phase_samples[phase] for phase in PHASES]
+        for index, sample in enumerate(website.samples):
+            yield (
+                run_id, website.url, measured_at, website.mode, index,
+                sample, *(samples[index] for samples in phase_samples),
+                website.byte_samples[index],
+            )
+
+    def flush(self) -> None:
+        """
+        Wait until all queued rows are written.
+
+        :return: None
+        """
+        self.queue.join()
+
+    def write_rows(self) -> None:
+        """
+        Writer thread loop.
+        Take (statement, row) items from self.queue and insert them in
+        batches of self.batch_size rows, until None is queued.
+
+        :return: None
+        """
+        connection = self.connect()
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [item for item in batch if item is not None]
+            running = len(rows) == len(batch)
+            try:
+                with connection:
+                    for statement in (INSERT, INSERT_HISTOGRAM):
+                        connection.executemany(statement, [
+                            row for item_statement, row in rows
+                            if item_statement == statement
+                        ])
+            except sqlite3.Error as e:
+                logger.error(
+                    f'\n[ERROR][HistoryStore][write_rows]'
+                    f'\nLost {len(rows)} rows\n{e}'
+                )
+            for _ in batch:
+                self.queue.task_done()
+        connection.close()
+
+    def query(
+            self,
+            url: str,
+            start: Optional[float] = None,
+            end: Optional[float] = None
+    ) -> List[HistorySample]:
+        """
+        All samples of url measured between start and end (unix timestamps,
+        inclusive, None - without limit), oldest first.
+
+        :param url: str
+        :param start: Optional[float]
+        :param end: Optional[float]
+        :return: List[HistorySample]
+        """
+        sql = f'SELECT {", ".join(COLUMNS)} FROM samples ' \
+              f'WHERE url = ? AND measured_at BETWEEN ? AND ? ' \
+              f'ORDER BY measured_at, id'
+        parameters = (
+            url,
+            float('-inf') if start is None else start,
+            float('inf') if end is None else end,
+        )
+        connection = self.connect()
+        try:
+            return [
+                HistorySample(*row)
+                for row in connection.execute(sql, parameters)
+            ]
+        finally:
+            connection.close()
+
+    def query_histogram(
+            self,
+            url: str,
+            start: Optional[float] = None,
+            end: Optional[float] = None,
+            mode: Optional[str] = None
+    ) -> Histogram:
+        """
+        Histogram of all load times of url (in mode, None - all modes)
+        measured between start and end, merged from histograms of every
+        measurement.
+
+        :param url: str
+        :param start: Optional[float]
+        :param end: Optional[float]
+        :param mode: Optional[str]
+        :return: Histogram
+        """
+        sql = 'SELECT histogram FROM histograms ' \
+              'WHERE url = ? AND measured_at BETWEEN ? AND ?'
+        parameters = [
+            url,
+            float('-inf') if start is None else start,
+            float('inf') if end is None else end,
+        ]
+        if mode is not None:
+            sql += ' AND mode = ?'
+            parameters.append(mode)
+        histogram = Histogram()
+        connection = self.connect()
+        try:
+            for data, in connection.execute(sql, parameters):
+                histogram.merge(Histogram.from_bytes(data))
+        finally:
+            connection.close()
+        return histogram
@@ -0,0 +1,175 @@
+import threading
+from contextlib import contextmanager
+from time import monotonic, perf_counter_ns, sleep
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from website_measure.constants import DEFAULT_RATE_BURST
+
+
+class TokenBucket:
+    """
+    Token bucket limiting rate of requests, thread safe.
+    Tokens are reserved in order of calls, so waiting threads are served
+    first come, first served.
+    """
+    def __init__(self, rate: float, burst: int = DEFAULT_RATE_BURST):
+        """
+        self.rate - tokens added per second
+        self.burst - max tokens collected while bucket is not used
+        self.tokens - available tokens, negative - reserved by waiting
+        threads
+        self.updated - monotonic time of last refill
+        self.lock - lock of self.tokens
+
+        :param rate: float
+        :param burst: int
+        """
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token, return seconds to wait before it is available.
+
+        :return: float
+        """
+        with self.lock:
+            now = monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self) -> None:
+        """
+        Wait for one token.
+
+        :return: None
+        """
+        wait = self.reserve()
+        if wait > 0:
+            sleep(wait)
+
+
+class HostLimiter:
+    """
+    Limits of loads of every origin (scheme, host and port): max loads at
+    the same time and max loads per second (token bucket), and global max
+    of loads in flight.
+    Slots are taken in order: origin slot, origin token, global slot.
+    """
+    def __init__(
+            self,
+            host_concurrency: Optional[int] = None,
+            host_rate: Optional[float] = None,
+            in_flight: Optional[int] = None,
+            burst: int = DEFAULT_RATE_BURST
+    ):
+        """
+        self.host_concurrency - max loads of one origin at the same time,
+        None - no limit
+        self.host_rate - max loads of one origin per second, None - no
+        limit
+        self.burst - loads of one origin started at once after idle time
+        self.in_flight - semaphore of all loads, None - no limit
+        self.semaphores - semaphores of origins
+        self.buckets - token buckets of origins
+        self.lock - lock of self.semaphores and self.buckets creation
+
+        :param host_concurrency: Optional[int]
+        :param host_rate: Optional[float]
+        :param in_flight: Optional[int]
+        :param burst: int
+        """
+        self.host_concurrency = host_concurrency
+        self.host_rate = host_rate
+        self.burst = burst
+        self.in_flight = None
+        if in_flight is not None:
+            self.in_flight = threading.BoundedSemaphore(in_flight)
+        self.semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_origin(url: str) -> str:
+        """
+        Origin of url: scheme, host and port.
+
+        :param url: str
+        :return: str
+        """
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        return f'{parts.scheme}://{parts.hostname}:{port}'
+
+    def get_semaphore(
+            self, origin: str
+    ) -> Optional[threading.BoundedSemaphore]:
+        """
+        Semaphore of origin, created with first load.
+
+        :param origin: str
+        :return: Optional[threading.BoundedSemaphore]
+        """
+        if self.host_concurrency is None:
+            return None
+        with self.lock:
+            if origin not in self.semaphores:
+                self.semaphores[origin] = threading.BoundedSemaphore(
+                    self.host_concurrency
+                )
+            return self.semaphores[origin]
+
+    def get_bucket(self, origin: str) -> Optional[TokenBucket]:
+        """
+        Token bucket of origin, created with first load.
+
+        :param origin: str
+        :return: Optional[TokenBucket]
+        """
+        if self.host_rate is None:
+            return None
+        with self.lock:
+            if origin not in self.buckets:
+                self.buckets[origin] = TokenBucket(self.host_rate, self.burst)
+            return self.buckets[origin]
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[int]:
+        """
+        Context manager waiting for free slot of url origin, yield
+        nanoseconds of waiting in queue.
+
+        :param url: str
+        :return: Iterator[int]
+        """
+        origin = self.get_origin(url)
+        semaphore = self.get_semaphore(origin)
+        bucket = self.get_bucket(origin)
+        start_ns = perf_counter_ns()
+        if semaphore is not None:
+            semaphore.acquire()
+        try:
+            if bucket is not None:
+                bucket.acquire()
+            if self.in_flight is not None:
+                self.in_flight.acquire()
+            try:
+                yield perf_counter_ns() - start_ns
+            finally:
+                if self.in_flight is not None:
+                    self.in_flight.release()
+        finally:
+            if semaphore is not None:
+                semaphore.release()
@@ -0,0 +1,222 @@
+import http.client
+import threading
+from dataclasses import dataclass, field
+from time import monotonic, perf_counter_ns
+from typing import List, Optional
+
+from website_measure import logger
+from website_measure.backend import NS_IN_SECOND, MeasureBackend
+from website_measure.constants import (
+    DEFAULT_LOAD_DURATION, LOAD_ERROR_BACKOFF, LOAD_ERROR_MIN_LOADS,
+    LOAD_MAX_BACKOFF, LOAD_MAX_ERROR_RATE, LOAD_SATURATION_GAIN, ROUND_VALUE,
+)
+from website_measure.histogram import Histogram
+from website_measure.pool import ConnectionPool
+
+
+@dataclass
+class LoadStep:
+    """
+    Dataclass object with result of one step of load test: clients loading
+    url in loop for duration seconds.
+    Latencies of successful loads are counted in constant-memory
+    Histogram, in seconds.
+    stopped - step was stopped before end because of error rate
+    """
+    clients: int
+    duration: float
+    errors: int = 0
+    stopped: bool = False
+    latencies: Histogram = field(
+        default_factory=Histogram, repr=False, metadata={'unit': 'seconds'}
+    )
+
+    @property
+    def requests(self) -> int:
+        """
+        Number of successful loads.
+
+        :return: int
+        """
+        return self.latencies.count
+
+    @property
+    def throughput(self) -> float:
+        """
+        Successful loads per second.
+
+        :return: float
+        """
+        if self.duration <= 0:
+            return 0.0
+        return self.requests / self.duration
+
+    def to_text(self) -> str:
+        """
+        Text with clients, throughput, percentiles of latency and
+        histogram serialized as base64, times in seconds.
+
+        :return: str
+        """
+        parts = [
+            f'clients: {self.clients}',
+            f'requests: {self.requests} errors: {self.errors}',
+            f'throughput: {round(self.throughput, ROUND_VALUE)} req/s',
+        ]
+        if self.stopped:
+            parts.append('stopped: error rate')
+        if self.latencies:
+            parts.append(' '.join(
+                f'p{percent}: '
+                f'{round(self.latencies.percentile(percent), ROUND_VALUE)}'
+                for percent in (50, 95, 99)
+            ))
+            parts.append(f'histogram: {self.latencies.to_text()}')
+        return ' \t| '.join(parts)
+
+
+def get_saturation(steps: List[LoadStep]) -> Optional[LoadStep]:
+    """
+    First step of ramp which gained less than LOAD_SATURATION_GAIN of
+    throughput gain expected with linear scaling of previous step to more
+    clients, None if throughput was still growing.
+
+    :param steps: List[LoadStep]
+    :return: Optional[LoadStep]
+    """
+    for previous, step in zip(steps, steps[1:]):
+        expected = previous.throughput * step.clients / previous.clients
+        gain = step.throughput - previous.throughput
+        if gain < (expected - previous.throughput) * LOAD_SATURATION_GAIN:
+            return step
+    return None
+
+
+class LoadTest:
+    """
+    Load test of single url: every step of ramp runs given number of
+    virtual clients loading url in loop, over pooled keep-alive
+    connections, for self.duration seconds.
+    Client backs off after failed load, step with error rate above
+    LOAD_MAX_ERROR_RATE is stopped together with rest of ramp.
+    """
+    def __init__(
+            self,
+            backend: MeasureBackend,
+            duration: float = DEFAULT_LOAD_DURATION
+    ):
+        """
+        self.backend - MeasureBackend with settings (TLS, timeouts) copied
+        to backend of load test, which has own pool of connections
+        self.duration - seconds of every step
+
+        :param backend: MeasureBackend
+        :param duration: float
+        """
+        self.backend = backend
+        self.duration = duration
+
+    def run(
+            self, url: str, ramp: List[int], compress: bool = True
+    ) -> List[LoadStep]:
+        """
+        Run all steps of ramp one by one, until step stopped because of
+        errors.
+
+        :param url: str
+        :param ramp: List[int], clients of every step
+        :param compress: bool
+        :return: List[LoadStep]
+        """
+        steps = []
+        with MeasureBackend(
+                self.backend.ssl_context,
+                ConnectionPool(max_idle=max(ramp)),
+                self.backend.max_bytes,
+                self.backend.connect_timeout,
+                self.backend.read_timeout,
+                self.backend.resolver
+        ) as backend:
+            for clients in ramp:
+                steps.append(self.run_step(backend, url, clients, compress))
+                logger.info(
+                    f'\n[INFO][LoadTest][run]'
+                    f'\n{url} {steps[-1].to_text()}'
+                )
+                if steps[-1].stopped:
+                    logger.warning(
+                        f'\n[WARNING][LoadTest][run]'
+                        f'\n{url} ramp stopped at {clients} clients, more '
+                        f'than {LOAD_MAX_ERROR_RATE:.0%} of loads failed'
+                    )
+                    break
+        return steps
+
+    def run_step(
+            self,
+            backend: MeasureBackend,
+            url: str,
+            clients: int,
+            compress: bool = True
+    ) -> LoadStep:
+        """
+        Run clients threads loading url until end of step.
+        After failed load client waits with exponential backoff, all
+        clients stop when error rate of step is above LOAD_MAX_ERROR_RATE.
+
+        :param backend: MeasureBackend
+        :param url: str
+        :param clients: int
+        :param compress: bool
+        :return: LoadStep
+        """
+        step = LoadStep(clients, self.duration)
+        lock = threading.Lock()
+        stopped = threading.Event()
+        end = monotonic() + self.duration
+        counts = {'loads': 0, 'errors': 0}
+
+        def count(failed: bool) -> None:
+            with lock:
+                counts['loads'] += 1
+                counts['errors'] += failed
+                if counts['loads'] >= LOAD_ERROR_MIN_LOADS and \
+                        counts['errors'] > \
+                        counts['loads'] * LOAD_MAX_ERROR_RATE:
+                    stopped.set()
+
+        def client() -> None:
+            latencies = Histogram()
+            errors = 0
+            backoff = LOAD_ERROR_BACKOFF
+            while monotonic() < end and not stopped.is_set():
+                try:
+                    timing = backend.fetch(url, True, compress=compress)
+                except (OSError, http.client.HTTPException):
+                    errors += 1
+                    count(True)
+                    stopped.wait(min(backoff, max(0.0, end - monotonic())))
+                    backoff = min(backoff * 2, LOAD_MAX_BACKOFF)
+                    continue
+                backoff = LOAD_ERROR_BACKOFF
+                count(False)
+                latencies.record(
+                    (timing.end_ns - timing.start_ns) / NS_IN_SECOND
+                )
+            with lock:
+                step.latencies.merge(latencies)
+                step.errors += errors
+
+        start_ns = perf_counter_ns()
+        threads = [
+            threading.Thread(
+                target=client, name=f'wlm-load-{index}', daemon=True
+            ) for index in range(clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        step.duration = (perf_counter_ns() - start_ns) / NS_IN_SECOND
+        step.stopped = stopped.is_set()
+        return step
@@ -0,0 +1,114 @@
+import logging
+import logging.handlers
+import os
+import queue
+
+from website_measure.constants import (
+    LOG_BACKUP_COUNT, LOG_FORMAT, LOG_LEVEL, LOG_LEVELS, LOG_MAX_BYTES,
+    LOG_QUEUE_SIZE, LOG_ROTATE_WHEN,
+)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler which never blocks caller thread.
+    Records which do not fit in full queue are dropped and counted.
+    """
+    def __init__(self, records: queue.Queue):
+        """
+        self.dropped - number of dropped records
+
+        :param records: queue.Queue
+        """
+        super().__init__(records)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Put record to queue without waiting.
+
+        :param record: logging.LogRecord
+        :return: None
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def get_setting(name: str, default):
+    """
+    Value of logging setting from WLM_<name> environment variable converted
+    to type of default value, or default value.
+
+    :param name: str
+    :param default: str or int
+    :return: str or int
+    """
+    value = os.environ.get(f'WLM_{name}')
+    if value is None:
+        return default
+    return type(default)(value)
+
+
+def get_log_level(logger: logging.Logger) -> str:
+    """
+    Level of app logger from WLM_LOG_LEVEL environment variable or
+    LOG_LEVEL. Invalid value is logged as warning and LOG_LEVEL is used.
+
+    :param logger: logging.Logger
+    :return: str
+    """
+    level = get_setting('LOG_LEVEL', LOG_LEVEL).upper()
+    if level not in LOG_LEVELS:
+        logger.warning(
+            f'\n[WARNING][get_log_level]'
+            f'\nInvalid WLM_LOG_LEVEL {level!r}, {LOG_LEVEL} used instead'
+        )
+        return LOG_LEVEL
+    return level
+
+
+def get_file_handler(file_path: str) -> logging.Handler:
+    """
+    Rotating file handler of log file.
+    Rotates by time if LOG_ROTATE_WHEN is set, otherwise by size.
+
+    :param file_path: str
+    :return: logging.Handler
+    """
+    backup_count = get_setting('LOG_BACKUP_COUNT', LOG_BACKUP_COUNT)
+    when = get_setting('LOG_ROTATE_WHEN', LOG_ROTATE_WHEN)
+    if when:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            file_path, when=when, backupCount=backup_count, delay=True
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            file_path,
+            maxBytes=get_setting('LOG_MAX_BYTES', LOG_MAX_BYTES),
+            backupCount=backup_count,
+            delay=True
+        )
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+def start_queue_logging(
+        logger: logging.Logger, file_path: str
+) -> logging.handlers.QueueListener:
+    """
+    Connect logger with bounded queue and start background thread writing
+    records from queue to rotating log file.
+
+    :param logger: logging.Logger
+    :param file_path: str
+    :return: logging.handlers.QueueListener
+    """
+    records = queue.Queue(get_setting('LOG_QUEUE_SIZE', LOG_QUEUE_SIZE))
+    listener = logging.handlers.QueueListener(
+        records, get_file_handler(file_path), respect_handler_level=True
+    )
+    logger.addHandler(DroppingQueueHandler(records))
+    listener.start()
+    return listener
@@ -2,10 +2,14 @@ import os
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import List
 
 from dotenv import load_dotenv
 from website_measure import logger
-from website_measure.constants import MAIL_SUBJECT, MAIL_TEMPLATE
+from website_measure.constants import (
+    DIGEST_LINE_TEMPLATE, DIGEST_SUBJECT, DIGEST_TEMPLATE, MAIL_SUBJECT,
+    MAIL_TEMPLATE,
+)
 
 load_dotenv()
 
@@ -84,10 +88,43 @@ class MailSender:
         text = MAIL_TEMPLATE.format(
             main_website_place=main_website_place, all_websites=all_websites
         )
+        return self.build_message(text, MAIL_SUBJECT, recipient_mail)
+
+    def prepare_digest_message(
+            self, alerts: List[dict], recipient_mail: str
+    ) -> str:
+        """
+        Prepare one email message with many alerts.
+        Fill DIGEST_TEMPLATE with DIGEST_LINE_TEMPLATE line for every alert.
+
+        :param alerts: List[dict], keys of DIGEST_LINE_TEMPLATE
+        :param recipient_mail: str
+        :return: str
+        """
+        text = DIGEST_TEMPLATE.format(
+            alerts_number=len(alerts),
+            since=alerts[0]['date'] if alerts else '-',
+            alerts='\n'.join(
+                DIGEST_LINE_TEMPLATE.format(**alert) for alert in alerts
+            )
+        )
+        return self.build_message(text, DIGEST_SUBJECT, recipient_mail)
+
+    def build_message(
+            self, text: str, subject: str, recipient_mail: str
+    ) -> str:
+        """
+        MIME message with plain text.
+
+        :param text: str
+        :param subject: str
+        :param recipient_mail: str
+        :return: str
+        """
         message = MIMEMultipart()
         message['From'] = self.mail
         message['To'] = recipient_mail
-        message['Subject'] = MAIL_SUBJECT
+        message['Subject'] = subject
         message.attach(MIMEText(text, 'plain'))
         return message.as_string()
 
@@ -96,15 +133,16 @@ class MailSender:
             main_website_place: int,
             all_websites: int,
             recipient_mail: str
-    ) -> None:
+    ) -> bool:
         """
         Send prepared message to recipient_mail email address or address
         from .env file.
+        Return True if message was sent.
 
         :param main_website_place: int
         :param all_websites: int
         :param recipient_mail: str
-        :return: None
+        :return: bool
         """
         if not recipient_mail:
             recipient_mail = os.environ.get('DEFAULT_RECIPIENT_MAIL_ADDRESS')
@@ -112,14 +150,44 @@ class MailSender:
         message = self.prepare_message(
             main_website_place, all_websites, recipient_mail
         )
+        return self.send(message, MAIL_SUBJECT, recipient_mail)
+
+    def send_digest(self, alerts: List[dict], recipient_mail: str) -> bool:
+        """
+        Send one message with many alerts to recipient_mail email address
+        or address from .env file.
+        Return True if message was sent.
+
+        :param alerts: List[dict]
+        :param recipient_mail: str
+        :return: bool
+        """
+        if not recipient_mail:
+            recipient_mail = os.environ.get('DEFAULT_RECIPIENT_MAIL_ADDRESS')
+
+        message = self.prepare_digest_message(alerts, recipient_mail)
+        return self.send(message, DIGEST_SUBJECT, recipient_mail)
+
+    def send(self, message: str, subject: str, recipient_mail: str) -> bool:
+        """
+        Send prepared message with open server session.
+        Return True if message was sent.
+
+        :param message: str
+        :param subject: str
+        :param recipient_mail: str
+        :return: bool
+        """
         try:
             self.server.sendmail(self.mail, recipient_mail, message)
             logger.info(
-                f'\n[INFO][MailSender][send_message]'
-                f'\nEmail to {recipient_mail}\nMessage: {message}'
+                f'\n[INFO][MailSender][send]'
+                f'\nEmail to {recipient_mail}\nSubject: {subject}'
             )
+            return True
         except Exception as e:
             logger.info(
-                f'\n[ERROR][MailSender][send_message]'
-                f'\nEmail to {recipient_mail}\nMessage: {message}\n{e}'
+                f'\n[ERROR][MailSender][send]'
+                f'\nEmail to {recipient_mail}\nSubject: {subject}\n{e}'
             )
+            return False
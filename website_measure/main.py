@@ -1,15 +1,43 @@
 import argparse
+import copy
 import datetime
+import os
 import sys
-import urllib.request
-from time import time
-from typing import List
+import threading
+import uuid
+from time import monotonic, time
+from typing import Dict, List, Union
 
 from dotenv import load_dotenv
-from website_measure import logger
-from website_measure.constants import RESULT_TEMPLATE
-from website_measure.mail import MailSender
-from website_measure.sms import DummySMSSender
+from website_measure import (
+    LOG_DIR_PATH, configure_logging, logger, set_log_level, stats,
+)
+from website_measure.backend import (
+    MeasureBackend, PhaseTiming, get_error_kind,
+)
+from website_measure.config import BenchmarkGroup, load_config
+from website_measure.constants import (
+    ADAPTIVE_MIN_SAMPLES, ALERT_MIN_SAMPLES, COMPRESSION_MODES,
+    DEFAULT_ALERT_ALPHA, DEFAULT_ALERT_COOLDOWN, DEFAULT_COMPRESSION,
+    DEFAULT_CONCURRENCY, DEFAULT_CONFIDENCE_WIDTH, DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DNS, DEFAULT_INTERVAL, DEFAULT_JITTER, DEFAULT_LOAD_DURATION,
+    DEFAULT_LOAD_RAMP, DEFAULT_MAIL_RATIO, DEFAULT_METRIC, DEFAULT_MODE,
+    DEFAULT_NOTIFY_TIMEOUT, DEFAULT_PARALLELISM, DEFAULT_PORTS,
+    DEFAULT_PROCESSES, DEFAULT_READ_TIMEOUT, DEFAULT_SAMPLES,
+    DEFAULT_SMS_RATIO, DEFAULT_STATISTIC, DNS_DEFAULT_TTL, DNS_MODES,
+    HISTORY_FILE_NAME, LOG_LEVELS, METRICS, MODES, RESULT_TEMPLATE,
+    ROUND_VALUE, STATISTICS,
+)
+from website_measure.decision import AlertPolicy
+from website_measure.engine import MeasureEngine, ProcessEngine
+from website_measure.histogram import Histogram
+from website_measure.limits import HostLimiter
+from website_measure.load import LoadStep, LoadTest, get_saturation
+from website_measure.notify import Notification, NotificationDispatcher
+from website_measure.page import PageLoader, PageTiming
+from website_measure.resolver import Resolver
+from website_measure.scheduler import Scheduler
+from website_measure.urls import UrlCollector, normalize_url
 from website_measure.validate import Validate
 from website_measure.website import WebsiteMeasurement
 from website_measure.write import WriteFile
@@ -17,6 +45,38 @@ from website_measure.write import WriteFile
 load_dotenv()
 
 
+def positive_int(value: str) -> int:
+    """
+    Argparse type for integer arguments which have to be greater than 0.
+
+    :param value: str
+    :return: int
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid int value: {value!r}')
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'value has to be >= 1: {value}')
+    return number
+
+
+def positive_float(value: str) -> float:
+    """
+    Argparse type for float arguments which have to be greater than 0.
+
+    :param value: str
+    :return: float
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid float value: {value!r}')
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f'value has to be > 0: {value}')
+    return number
+
+
 class WebsiteMeasure:
     """
     Main class of website load measure app.
@@ -29,12 +89,96 @@ class WebsiteMeasure:
         self.main_website - website url from parsed data
         self.websites_list - website urls from parsed data
         self.result_data - comparision result
+        self.concurrency - max number of websites measured at the same time
+        self.processes - number of worker processes measuring websites, 1 -
+        measure in main process
+        self.samples - number of measurements of every website, with
+        adaptive sampling number of samples added in every sampling round
+        self.max_samples - budget of samples of every website in adaptive
+        sampling, None - fixed number of self.samples
+        self.confidence_width - half-width of confidence interval (part of
+        statistic value) which ends adaptive sampling of website
+        self.rank_by - statistic of samples used for ranking
+        self.metric - total load time or single phase used for ranking
+        self.mode - cold (new connection), warm (pooled connection) or both
+        self.backend - MeasureBackend loading websites phase by phase
+        self.engine - MeasureEngine created with first comparison, kept
+        between rounds of `wlm serve`
+        self.history - HistoryStore saving all samples, None - disabled
+        self.aggregates - histograms of load times of every url from all
+        rounds of `wlm serve`
+        self.dispatcher - NotificationDispatcher created with first
+        notification
+        self.notify_timeout - seconds to wait for delivery of notifications
+        before exit, None - no limit
+        self.serve - True in daemon mode
+        self.alerts - AlertCache with cooldown and digest of alerts, None -
+        every alert is sent
+        self.policy - AlertPolicy deciding if main website is really slower
+        than competitors
+        self.group_name - name of benchmark group from config file, None -
+        single group from command line
+        self.deadline - seconds of measurement of all websites in round,
+        websites not measured in time are failed, None - no limit
+        self.deadline_at - monotonic time of end of current round deadline
+        self.full_page - load html document with all its stylesheets,
+        scripts and images
+        self.parallelism - max resources of one origin loaded at the same
+        time in full page mode
+        self.page_loader - PageLoader created with first full page load
+        self.page_loader_lock - lock of self.page_loader creation by
+        measure threads
+        self.compression - on (accept compressed body), off or both
+        self.dns - system (resolve every load), cache (cache addresses for
+        TTL) or pre-resolve (resolve all hosts before measurement)
+        self.host_concurrency - max loads of one host at the same time,
+        None - no limit
+        self.host_rate - max loads of one host per second, None - no limit
+        self.in_flight - max loads at the same time, None - no limit
+        self.limiter - HostLimiter of loads, None - without limits
+        self.load_ramp - clients of every step of load test of main
+        website, None - no load test
+        self.load_duration - seconds of every step of load test
+        self.load_steps - load test steps of current main website
         """
         self.mail = None
         self.sms = None
         self.main_website = None
         self.websites_list = None
         self.result_data = None
+        self.concurrency = DEFAULT_CONCURRENCY
+        self.processes = DEFAULT_PROCESSES
+        self.samples = DEFAULT_SAMPLES
+        self.max_samples = None
+        self.confidence_width = DEFAULT_CONFIDENCE_WIDTH
+        self.rank_by = DEFAULT_STATISTIC
+        self.metric = DEFAULT_METRIC
+        self.mode = DEFAULT_MODE
+        self.backend = MeasureBackend()
+        self.engine = None
+        self.history = None
+        self.aggregates: Dict[str, Histogram] = {}
+        self.dispatcher = None
+        self.notify_timeout = DEFAULT_NOTIFY_TIMEOUT
+        self.serve = False
+        self.alerts = None
+        self.policy = AlertPolicy()
+        self.group_name = None
+        self.deadline = None
+        self.deadline_at = None
+        self.full_page = False
+        self.parallelism = DEFAULT_PARALLELISM
+        self.page_loader = None
+        self.page_loader_lock = threading.Lock()
+        self.compression = DEFAULT_COMPRESSION
+        self.dns = DEFAULT_DNS
+        self.host_concurrency = None
+        self.host_rate = None
+        self.in_flight = None
+        self.limiter = None
+        self.load_ramp = None
+        self.load_duration = DEFAULT_LOAD_DURATION
+        self.load_steps = None
 
     def __exit__(self, **kwargs):
         """
@@ -49,13 +193,22 @@ class WebsiteMeasure:
         Logging to logger start info.
         Gets arguments by get_arguments method and validate
         mail/phone_number if passed.
-        Compare loading time of collected websites.
-        Send notifications and save results of measurement.
+        Benchmark groups are loaded from --config file or created from
+        -u and -l/--list-file arguments.
+        Run single benchmark round or, for `wlm serve` and --interval,
+        rounds on schedule until SIGTERM.
 
         :return: None
         """
-        logger.info(f'\nApplication started!\n{str(sys.argv[1:])}')
-        parsed = self.get_arguments(sys.argv[1:])
+        args = sys.argv[1:]
+        configure_logging()
+        logger.info(f'\nApplication started!\n{str(args)}')
+        serve = args[:1] == ['serve']
+        if serve:
+            args = args[1:]
+        parsed = self.get_arguments(args)
+        if parsed.log_level:
+            set_log_level(parsed.log_level)
 
         if parsed.mail:
             Validate('mail').is_valid(parsed.mail)
@@ -65,12 +218,230 @@ class WebsiteMeasure:
             Validate('phone_number').is_valid(parsed.phone_number)
             self.sms = parsed.phone_number
 
-        self.compare_websites(
-            parsed.url, parsed.list
+        if parsed.config:
+            groups = load_config(parsed.config, self.mail, self.sms)
+        else:
+            Validate('url').is_valid(parsed.url)
+            main_url = normalize_url(parsed.url)
+            groups = [BenchmarkGroup(
+                None,
+                main_url,
+                self.collect_urls(parsed, main_url),
+                self.mail,
+                self.sms
+            )]
+
+        self.concurrency = parsed.concurrency
+        self.processes = parsed.processes
+        self.rank_by = parsed.rank_by
+        self.metric = parsed.metric
+        self.max_samples = parsed.max_samples
+        self.confidence_width = parsed.confidence_width
+        if parsed.load_test is not None:
+            self.load_ramp = parsed.load_test or list(DEFAULT_LOAD_RAMP)
+        self.load_duration = parsed.load_duration
+        self.apply_settings({
+            'samples': parsed.samples,
+            'mode': parsed.mode,
+            'max_bytes': parsed.max_bytes,
+            'connect_timeout': parsed.connect_timeout,
+            'read_timeout': parsed.read_timeout,
+            'deadline': parsed.deadline,
+            'full_page': parsed.full_page,
+            'parallelism': parsed.parallelism,
+            'compression': parsed.compression,
+            'dns': parsed.dns,
+            'host_concurrency': parsed.host_concurrency,
+            'host_rate': parsed.host_rate,
+            'in_flight': parsed.in_flight,
+        })
+        self.notify_timeout = parsed.notify_timeout
+        self.policy = AlertPolicy(
+            parsed.mail_ratio, parsed.sms_ratio, parsed.alpha, parsed.metric
         )
-        self.send_notifications()
-        self.print_result()
-        self.write_result_to_file()
+        if parsed.alert_cooldown or parsed.digest_window:
+            from website_measure.alerts import AlertCache
+            self.alerts = AlertCache(
+                cooldown=parsed.alert_cooldown,
+                digest_window=parsed.digest_window
+            )
+        if parsed.history:
+            from website_measure.history import HistoryStore
+            self.history = HistoryStore(
+                parsed.history, keep_samples=not parsed.history_histograms
+            )
+            self.history.open()
+
+        interval = parsed.interval
+        if serve and interval is None:
+            interval = DEFAULT_INTERVAL
+        self.serve = bool(interval)
+        try:
+            if self.serve:
+                Scheduler(
+                    lambda: self.run_round(groups),
+                    interval,
+                    parsed.jitter
+                ).run()
+            else:
+                self.run_round(groups)
+        finally:
+            self.close()
+
+    def get_settings(self) -> dict:
+        """
+        Measurement settings needed to measure single website, passed to
+        worker processes.
+
+        :return: dict
+        """
+        return {
+            'samples': self.samples,
+            'mode': self.mode,
+            'max_bytes': self.backend.max_bytes,
+            'connect_timeout': self.backend.connect_timeout,
+            'read_timeout': self.backend.read_timeout,
+            'deadline': self.deadline,
+            'full_page': self.full_page,
+            'parallelism': self.parallelism,
+            'compression': self.compression,
+            'dns': self.dns,
+            'host_concurrency': self.host_concurrency,
+            'host_rate': self.host_rate,
+            'in_flight': self.in_flight,
+        }
+
+    def apply_settings(self, settings: dict) -> None:
+        """
+        Set measurement settings from get_settings() dictionary.
+        Resolver with cache is set to self.backend if dns is not 'system',
+        HostLimiter is created if any limit of loads is set.
+
+        :param settings: dict
+        :return: None
+        """
+        self.samples = settings['samples']
+        self.mode = settings['mode']
+        self.backend.max_bytes = settings['max_bytes']
+        self.backend.connect_timeout = settings['connect_timeout']
+        self.backend.read_timeout = settings['read_timeout']
+        self.deadline = settings['deadline']
+        self.full_page = settings['full_page']
+        self.parallelism = settings['parallelism']
+        self.compression = settings['compression']
+        self.dns = settings['dns']
+        if self.dns == 'system':
+            self.backend.resolver = None
+        elif self.backend.resolver is None:
+            self.backend.resolver = Resolver()
+        self.host_concurrency = settings['host_concurrency']
+        self.host_rate = settings['host_rate']
+        self.in_flight = settings['in_flight']
+        self.limiter = None
+        if self.host_concurrency or self.host_rate or self.in_flight:
+            self.limiter = HostLimiter(
+                self.host_concurrency, self.host_rate, self.in_flight
+            )
+        if self.page_loader is not None:
+            self.page_loader.limiter = self.limiter
+
+    @staticmethod
+    def collect_urls(parsed: argparse.Namespace, main_url: str) -> List[str]:
+        """
+        Collect competitor urls from -l/--list and --list-file files (or
+        stdin).
+        Urls are validated, normalized and deduplicated, main website url is
+        skipped. All invalid urls are reported at once.
+
+        :param parsed: argparse.Namespace
+        :param main_url: str
+        :return: List[str]
+        """
+        collector = UrlCollector(exclude=[main_url])
+        collector.add_all(parsed.list or [])
+        for file_path in parsed.list_file or []:
+            collector.add_file(file_path)
+        collector.report()
+        return collector.result.urls
+
+    def run_round(self, groups: List[BenchmarkGroup]) -> None:
+        """
+        Single benchmark round.
+        Every distinct url of all groups is measured once, then loading
+        time of every group websites is compared with shared measurements.
+        Histograms of measurements are merged into self.aggregates.
+        With self.load_ramp main websites are load tested after
+        measurement.
+        Send notifications and save results of measurement, results of all
+        groups are written to one file.
+
+        :param groups: List[BenchmarkGroup]
+        :return: None
+        """
+        measured_at = time()
+        measured = self.measure_urls([
+            url for group in groups for url in [group.url, *group.competitors]
+        ])
+        run_id = None
+        if self.history is not None:
+            run_id = self.save_history(list(measured.values()), measured_at)
+        for url, website in measured.items():
+            if not website.is_failed():
+                self.aggregates.setdefault(url, Histogram()).merge(
+                    website.histogram
+                )
+        load_tests = {}
+        if self.load_ramp:
+            for url in dict.fromkeys(group.url for group in groups):
+                load_tests[url] = self.run_load_test(url)
+
+        with WriteFile() as write_file:
+            for group in groups:
+                self.group_name = group.name
+                self.load_steps = load_tests.get(group.url)
+                self.mail = group.mail
+                self.sms = group.phone_number
+                self.rank_group(measured, group.url, group.competitors)
+                if run_id is not None:
+                    self.result_data['run_id'] = run_id
+                self.send_notifications()
+                self.print_result()
+                self.write_result(write_file)
+
+    def close(self) -> None:
+        """
+        Stop measure threads, write waiting history, wait up to
+        self.notify_timeout for notifications and close pooled connections.
+
+        :return: None
+        """
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+        if self.dispatcher is not None:
+            self.dispatcher.close(self.notify_timeout)
+            self.dispatcher = None
+        if self.history is not None:
+            self.history.close()
+        if self.page_loader is not None:
+            self.page_loader.close()
+            self.page_loader = None
+        self.backend.close()
+
+    def save_history(
+            self, websites: List[WebsiteMeasurement], measured_at: float
+    ) -> str:
+        """
+        Queue all samples of measured websites to self.history under new
+        run id.
+
+        :param websites: List[WebsiteMeasurement]
+        :param measured_at: float, unix timestamp of round start
+        :return: str, run id
+        """
+        run_id = uuid.uuid4().hex
+        self.history.add(run_id, websites, measured_at)
+        return run_id
 
     def get_arguments(self, args: list) -> argparse.Namespace:
         """
@@ -79,8 +450,34 @@ class WebsiteMeasure:
         additional mail address and phone number.
         Default mail address and phone number for notification in .env file.
 
-        usage: wlm [-h] -u URL -l LIST [LIST ...] [-m MAIL] [-p PHONE_NUMBER]
-        the following arguments are required: -u/--url, -l/--list
+        usage: wlm [serve] [-h] [-u URL] [-l LIST [LIST ...]]
+                   [--list-file LIST_FILE] [--config CONFIG]
+                   [-m MAIL] [-p PHONE_NUMBER]
+                   [-c CONCURRENCY] [--processes PROCESSES]
+                   [-s SAMPLES] [--max-samples MAX_SAMPLES]
+                   [--confidence-width CONFIDENCE_WIDTH]
+                   [-r {min,median,...}]
+                   [--metric {time,network,dns,connect,tls,ttfb,download}]
+                   [--mode {cold,warm,both}] [--max-bytes MAX_BYTES]
+                   [--connect-timeout CONNECT_TIMEOUT]
+                   [--read-timeout READ_TIMEOUT] [--deadline DEADLINE]
+                   [--full-page] [--parallelism PARALLELISM]
+                   [--compression {on,off,both}]
+                   [--dns {system,cache,pre-resolve}]
+                   [--host-concurrency HOST_CONCURRENCY]
+                   [--host-rate HOST_RATE] [--in-flight IN_FLIGHT]
+                   [--interval INTERVAL] [--jitter JITTER]
+                   [--history [HISTORY]] [--history-histograms]
+                   [--log-level LOG_LEVEL]
+                   [--notify-timeout NOTIFY_TIMEOUT]
+                   [--alert-cooldown ALERT_COOLDOWN]
+                   [--digest-window DIGEST_WINDOW]
+                   [--mail-ratio MAIL_RATIO] [--sms-ratio SMS_RATIO]
+                   [--alpha ALPHA]
+                   [--load-test [CLIENTS ...]]
+                   [--load-duration LOAD_DURATION]
+        the following arguments are required: -u/--url and
+        -l/--list or --list-file, or --config
 
         :param args: list()
         :return: argparse.Namespace
@@ -92,7 +489,7 @@ class WebsiteMeasure:
             '-u',
             '--url',
             help='URL of main website',
-            required=True,
+            required=False,
             type=str
         )
         parser.add_argument(
@@ -100,7 +497,24 @@ class WebsiteMeasure:
             '--list',
             nargs='+',
             help='URLs of websites to compare',
-            required=True
+            required=False
+        )
+        parser.add_argument(
+            '--list-file',
+            action='append',
+            help='file with URLs of websites to compare, one per line, '
+                 '"-" reads stdin (can be used many times)',
+            required=False,
+            type=str
+        )
+        parser.add_argument(
+            '--config',
+            help='JSON, TOML or YAML file with benchmark groups, every '
+                 'group has main website url, competitors urls and optional '
+                 'mail and phone number',
+            required=False,
+            type=str,
+            default=None
         )
         parser.add_argument(
             '-m',
@@ -118,49 +532,675 @@ class WebsiteMeasure:
             type=str,
             default=None
         )
-        return parser.parse_args(args)
+        parser.add_argument(
+            '-c',
+            '--concurrency',
+            help='max number of websites measured at the same time '
+                 f'(default: {DEFAULT_CONCURRENCY})',
+            required=False,
+            type=positive_int,
+            default=DEFAULT_CONCURRENCY
+        )
+        parser.add_argument(
+            '--processes',
+            help='number of worker processes sharing websites to measure, '
+                 'every process has own connections and threads '
+                 f'(default: {DEFAULT_PROCESSES} - no worker processes)',
+            required=False,
+            type=positive_int,
+            default=DEFAULT_PROCESSES
+        )
+        parser.add_argument(
+            '-s',
+            '--samples',
+            help='number of measurements of every website '
+                 f'(default: {DEFAULT_SAMPLES})',
+            required=False,
+            type=positive_int,
+            default=DEFAULT_SAMPLES
+        )
+        parser.add_argument(
+            '--max-samples',
+            help='adaptive sampling: add SAMPLES samples to websites until '
+                 'confidence interval of ranking statistic is narrow or '
+                 'separated from neighbours in ranking, up to MAX_SAMPLES '
+                 'samples of every website (default: fixed SAMPLES)',
+            required=False,
+            type=positive_int,
+            default=None
+        )
+        parser.add_argument(
+            '--confidence-width',
+            help='half-width of confidence interval, as part of statistic '
+                 'value, which ends adaptive sampling of website '
+                 f'(default: {DEFAULT_CONFIDENCE_WIDTH})',
+            required=False,
+            type=positive_float,
+            default=DEFAULT_CONFIDENCE_WIDTH
+        )
+        parser.add_argument(
+            '-r',
+            '--rank-by',
+            help='statistic of samples used for ranking '
+                 f'(default: {DEFAULT_STATISTIC})',
+            required=False,
+            choices=STATISTICS,
+            default=DEFAULT_STATISTIC
+        )
+        parser.add_argument(
+            '--metric',
+            help='total load time or single load phase used for ranking '
+                 f'(default: {DEFAULT_METRIC})',
+            required=False,
+            choices=METRICS,
+            default=DEFAULT_METRIC
+        )
+        parser.add_argument(
+            '--mode',
+            help='cold - new connection for every sample, warm - reuse '
+                 'keep-alive connection, both - cold and warm side by side '
+                 f'(default: {DEFAULT_MODE})',
+            required=False,
+            choices=MODES,
+            default=DEFAULT_MODE
+        )
+        parser.add_argument(
+            '--max-bytes',
+            help='stop reading website body after MAX_BYTES bytes '
+                 '(default: read whole body)',
+            required=False,
+            type=positive_int,
+            default=None
+        )
+        parser.add_argument(
+            '--connect-timeout',
+            help='seconds to open connection to website '
+                 f'(default: {DEFAULT_CONNECT_TIMEOUT})',
+            required=False,
+            type=positive_float,
+            default=DEFAULT_CONNECT_TIMEOUT
+        )
+        parser.add_argument(
+            '--read-timeout',
+            help='seconds of TLS handshake or waiting for website response '
+                 f'data (default: {DEFAULT_READ_TIMEOUT})',
+            required=False,
+            type=positive_float,
+            default=DEFAULT_READ_TIMEOUT
+        )
+        parser.add_argument(
+            '--deadline',
+            help='seconds to measure all websites, websites not measured in '
+                 'time are reported as failed (default: no limit)',
+            required=False,
+            type=positive_float,
+            default=None
+        )
+        parser.add_argument(
+            '--full-page',
+            help='load html document with all its stylesheets, scripts and '
+                 'images, time is load of whole page',
+            required=False,
+            action='store_true'
+        )
+        parser.add_argument(
+            '--parallelism',
+            help='max resources of one origin loaded at the same time in '
+                 f'full page mode (default: {DEFAULT_PARALLELISM})',
+            required=False,
+            type=positive_int,
+            default=DEFAULT_PARALLELISM
+        )
+        parser.add_argument(
+            '--compression',
+            help='on - accept gzip/deflate (br with brotli) compressed body '
+                 'like browsers, off - uncompressed body, both - compressed '
+                 f'and uncompressed side by side (default: '
+                 f'{DEFAULT_COMPRESSION})',
+            required=False,
+            choices=COMPRESSION_MODES,
+            default=DEFAULT_COMPRESSION
+        )
+        parser.add_argument(
+            '--dns',
+            help='system - resolve host with every load, cache - cache '
+                 'addresses for TTL of records (with dnspython) or '
+                 f'{DNS_DEFAULT_TTL} s, pre-resolve - resolve all hosts '
+                 'before measurement, use with --metric network to rank '
+                 f'without DNS time (default: {DEFAULT_DNS})',
+            required=False,
+            choices=DNS_MODES,
+            default=DEFAULT_DNS
+        )
+        parser.add_argument(
+            '--host-concurrency',
+            help='max loads of one host (origin) at the same time, waiting '
+                 'for free slot is not part of load time (default: no limit)',
+            required=False,
+            type=positive_int,
+            default=None
+        )
+        parser.add_argument(
+            '--host-rate',
+            help='max loads of one host (origin) per second '
+                 '(default: no limit)',
+            required=False,
+            type=positive_float,
+            default=None
+        )
+        parser.add_argument(
+            '--in-flight',
+            help='max loads of all websites at the same time '
+                 '(default: no limit)',
+            required=False,
+            type=positive_int,
+            default=None
+        )
+        parser.add_argument(
+            '--interval',
+            help='run benchmark rounds every INTERVAL seconds until SIGTERM '
+                 f'(`wlm serve` default: {DEFAULT_INTERVAL})',
+            required=False,
+            type=positive_float,
+            default=None
+        )
+        parser.add_argument(
+            '--jitter',
+            help='max random delay of round start in seconds '
+                 f'(default: {DEFAULT_JITTER})',
+            required=False,
+            type=float,
+            default=DEFAULT_JITTER
+        )
+        parser.add_argument(
+            '--history',
+            help='save all samples to SQLite history database '
+                 f'(default path: logs/{HISTORY_FILE_NAME})',
+            required=False,
+            nargs='?',
+            type=str,
+            const=os.path.join(LOG_DIR_PATH, HISTORY_FILE_NAME),
+            default=None
+        )
+        parser.add_argument(
+            '--history-histograms',
+            help='save only histograms of load times to history database, '
+                 'not every sample',
+            required=False,
+            action='store_true'
+        )
+        parser.add_argument(
+            '--log-level',
+            help='level of service logs (default: WLM_LOG_LEVEL environment '
+                 'variable or INFO)',
+            required=False,
+            type=str.upper,
+            choices=LOG_LEVELS,
+            default=None
+        )
+        parser.add_argument(
+            '--notify-timeout',
+            help='seconds to wait for delivery of notifications before exit, '
+                 f'0 - do not wait (default: {DEFAULT_NOTIFY_TIMEOUT})',
+            required=False,
+            type=float,
+            default=DEFAULT_NOTIFY_TIMEOUT
+        )
+        parser.add_argument(
+            '--alert-cooldown',
+            help='seconds before the same alert (main website, kind, '
+                 'recipient) is sent again, 0 - no cooldown '
+                 f'(default: {DEFAULT_ALERT_COOLDOWN})',
+            required=False,
+            type=float,
+            default=DEFAULT_ALERT_COOLDOWN
+        )
+        parser.add_argument(
+            '--digest-window',
+            help='collect mail alerts and send one digest mail every '
+                 'DIGEST_WINDOW seconds',
+            required=False,
+            type=positive_float,
+            default=None
+        )
+        parser.add_argument(
+            '--mail-ratio',
+            help='send mail if main website is slower than competitor by '
+                 f'this ratio (default: {DEFAULT_MAIL_RATIO})',
+            required=False,
+            type=positive_float,
+            default=DEFAULT_MAIL_RATIO
+        )
+        parser.add_argument(
+            '--sms-ratio',
+            help='send sms if main website is slower than competitor by '
+                 f'this ratio (default: {DEFAULT_SMS_RATIO} - twice as slow)',
+            required=False,
+            type=positive_float,
+            default=DEFAULT_SMS_RATIO
+        )
+        parser.add_argument(
+            '--alpha',
+            help='significance level of slowdown test, used with at least '
+                 f'{ALERT_MIN_SAMPLES} samples (default: '
+                 f'{DEFAULT_ALERT_ALPHA})',
+            required=False,
+            type=positive_float,
+            default=DEFAULT_ALERT_ALPHA
+        )
+        parser.add_argument(
+            '--load-test',
+            help='load test main website after measurement: every step '
+                 'runs CLIENTS virtual clients loading it in loop (default '
+                 f'ramp: {" ".join(map(str, DEFAULT_LOAD_RAMP))})',
+            required=False,
+            nargs='*',
+            type=positive_int,
+            metavar='CLIENTS',
+            default=None
+        )
+        parser.add_argument(
+            '--load-duration',
+            help='seconds of every step of load test '
+                 f'(default: {DEFAULT_LOAD_DURATION})',
+            required=False,
+            type=positive_float,
+            default=DEFAULT_LOAD_DURATION
+        )
+        parsed = parser.parse_args(args)
+        if parsed.config:
+            if parsed.url or parsed.list or parsed.list_file:
+                parser.error(
+                    'argument --config: not allowed with -u/--url, '
+                    '-l/--list or --list-file, add websites to config groups'
+                )
+            return parsed
+        if not parsed.url:
+            parser.error(
+                'the following arguments are required: -u/--url or --config'
+            )
+        if not parsed.list and not parsed.list_file:
+            parser.error(
+                'the following arguments are required: -l/--list or '
+                '--list-file'
+            )
+        return parsed
 
     def compare_websites(
             self, page_one_url: str, pages_urls: List[str]
     ) -> None:
         """
-        Measure load time for passed websites and save to object
-        attributes.
+        Measure load time for passed websites concurrently (up to
+        self.concurrency at the same time) and save to object attributes.
         Prepare load measure data.
 
         :param page_one_url: str
         :param pages_urls: str
         :return: None
         """
-        self.main_website = self.measure_load_time(page_one_url)
-        self.websites_list = [
-            self.measure_load_time(page) for page in pages_urls
+        measured = self.measure_urls([page_one_url, *pages_urls])
+        self.rank_group(measured, page_one_url, pages_urls)
+
+    def measure_urls(self, urls: List[str]) -> Dict[str, WebsiteMeasurement]:
+        """
+        Measure every distinct url once, concurrently (up to
+        self.concurrency at the same time), with more than one of
+        self.processes urls are sharded across worker processes.
+        Urls not measured before self.deadline are failed with 'deadline'
+        error. With self.max_samples urls are sampled adaptively.
+
+        :param urls: List[str]
+        :return: Dict[str, WebsiteMeasurement], measurements by url
+        """
+        if self.engine is None and self.processes > 1:
+            self.engine = ProcessEngine(
+                self.get_settings(), self.processes, self.concurrency
+            )
+        elif self.engine is None:
+            self.engine = MeasureEngine(
+                self.measure_load_time, self.concurrency
+            )
+        urls = list(dict.fromkeys(urls))
+        if isinstance(self.engine, MeasureEngine):
+            self.prepare_dns(urls)
+        if self.deadline is not None:
+            self.deadline_at = monotonic() + self.deadline
+        measured = self.measure_batch(urls)
+        if self.max_samples is not None:
+            self.sample_adaptive(measured)
+        return measured
+
+    def measure_batch(
+            self, urls: List[str]
+    ) -> Dict[str, WebsiteMeasurement]:
+        """
+        Measure distinct urls self.samples times with self.engine, urls not
+        measured before end of round deadline are failed with 'deadline'
+        error.
+
+        :param urls: List[str]
+        :return: Dict[str, WebsiteMeasurement], measurements by url
+        """
+        timeout = None
+        if self.deadline_at is not None:
+            timeout = max(0.0, self.deadline_at - monotonic())
+        measured = self.engine.measure_all(urls, timeout)
+        mode = 'warm' if self.mode == 'warm' else 'cold'
+        return {
+            url: website or WebsiteMeasurement.from_error(
+                url, 'deadline', mode
+            ) for url, website in zip(urls, measured)
+        }
+
+    def sample_adaptive(
+            self, measured: Dict[str, WebsiteMeasurement]
+    ) -> None:
+        """
+        Add self.samples samples to websites which are not settled, in
+        rounds, until all are settled, have self.max_samples samples or
+        deadline of round passes. Samples of every round are measured
+        concurrently and merged into measured websites.
+        Websites which failed in later round keep collected samples and are
+        not sampled again.
+
+        :param measured: Dict[str, WebsiteMeasurement]
+        :return: None
+        """
+        stopped = set()
+        rounds = 0
+        while self.deadline_at is None or monotonic() < self.deadline_at:
+            urls = [
+                url for url in self.get_unsettled(measured)
+                if url not in stopped
+            ]
+            if not urls:
+                break
+            rounds += 1
+            for url, website in self.measure_batch(urls).items():
+                if website.is_failed():
+                    stopped.add(url)
+                else:
+                    measured[url].merge(website)
+        self.get_unsettled(measured)
+        samples = sum(len(website.samples) for website in measured.values())
+        logger.info(
+            f'\n[INFO][WebsiteMeasure][sample_adaptive]'
+            f'\n{rounds} sampling rounds, {samples} samples of '
+            f'{len(measured)} websites'
+        )
+
+    def get_unsettled(
+            self, measured: Dict[str, WebsiteMeasurement]
+    ) -> List[str]:
+        """
+        Set confidence interval of ranking statistic to every measured
+        website and return urls of websites which need more samples.
+        Website is settled when it has at least ADAPTIVE_MIN_SAMPLES samples
+        and its interval is narrower than self.confidence_width or does not
+        overlap intervals of its neighbours in ranking. Neighbour without
+        interval (single sample, stopped after failed round) overlaps.
+        Websites without budget for next self.samples samples are settled
+        too.
+
+        :param measured: Dict[str, WebsiteMeasurement]
+        :return: List[str]
+        """
+        websites = [
+            website for website in measured.values()
+            if not website.is_failed()
         ]
+        statistic = 'median' if self.rank_by == 'time' else self.rank_by
+        for website in websites:
+            if len(website.samples) > 1:
+                website.confidence_low, website.confidence_high = \
+                    stats.confidence_interval(
+                        website.get_samples(self.metric), statistic
+                    )
+        websites.sort(
+            key=lambda website: website.get_statistic(statistic, self.metric)
+        )
+
+        unsettled = []
+        for index, website in enumerate(websites):
+            if len(website.samples) + self.samples > self.max_samples:
+                continue
+            if len(website.samples) >= ADAPTIVE_MIN_SAMPLES:
+                if website.confidence <= self.confidence_width:
+                    continue
+                neighbours = websites[max(0, index - 1):index] + \
+                    websites[index + 1:index + 2]
+                if all(
+                        neighbour.confidence_low is not None and (
+                            neighbour.confidence_high < website.confidence_low
+                            or neighbour.confidence_low >
+                            website.confidence_high
+                        ) for neighbour in neighbours
+                ):
+                    continue
+            unsettled.append(website.url)
+        return unsettled
+
+    def prepare_dns(self, urls: List[str]) -> None:
+        """
+        In pre-resolve dns mode resolve hosts of all urls before
+        measurement.
+
+        :param urls: List[str]
+        :return: None
+        """
+        if self.dns == 'pre-resolve':
+            self.backend.resolver.prefetch(urls, self.concurrency)
+
+    def run_load_test(self, url: str) -> List[LoadStep]:
+        """
+        Load test url with all steps of self.load_ramp.
+
+        :param url: str
+        :return: List[LoadStep]
+        """
+        return LoadTest(self.backend, self.load_duration).run(
+            url, self.load_ramp, self.compression != 'off'
+        )
+
+    def rank_group(
+            self,
+            measured: Dict[str, WebsiteMeasurement],
+            page_one_url: str,
+            pages_urls: List[str]
+    ) -> None:
+        """
+        Rank main website and its competitors with shared measurements.
+        Measurements are copied, so every group has own ranking places.
+        Prepare load measure data.
+
+        :param measured: Dict[str, WebsiteMeasurement]
+        :param page_one_url: str
+        :param pages_urls: List[str]
+        :return: None
+        """
+        self.main_website = copy.copy(measured[page_one_url])
+        self.websites_list = [copy.copy(measured[url]) for url in pages_urls]
         self.prepare_additional_data()
 
     def measure_load_time(self, url: str) -> WebsiteMeasurement:
         """
-        Validate passed url address then try to load website html
-        and measure time from start to end.
-        Return WebsiteMeasurement with collected data.
+        Validate passed url address then load website html self.samples
+        times and measure time of every load phase from DNS lookup to end
+        of download.
+        In both mode warm measurement is added to cold one as variant.
+        With both compression uncompressed measurement is added as
+        'uncompressed' variant.
+        Return WebsiteMeasurement with collected data, failed one if website
+        could not be loaded.
+        Raise ValueError if url is invalid or its scheme is not http(s).
 
         :param url: str
         :return: WebsiteMeasurement
         """
         Validate('url').is_valid(url)
-        client = urllib.request.urlopen(url)
-        start_time = time()
-        client.read()
-        end_time = time()
-        client.close()
-        website = self.save_to_object(url, start_time, end_time)
+        if url.split('://', 1)[0].lower() not in DEFAULT_PORTS:
+            logger.error(f'[ERROR] unsupported URL scheme: {url}')
+            raise ValueError
+        compress = self.compression != 'off'
+        mode = 'warm' if self.mode == 'warm' else 'cold'
+        website = self.try_measure_samples(url, mode, compress)
+        if self.mode == 'both':
+            website.variants['warm'] = self.try_measure_samples(
+                url, 'warm', compress
+            )
+        if self.compression == 'both':
+            website.variants['uncompressed'] = self.try_measure_samples(
+                url, mode, False
+            )
         return website
 
+    def try_measure_samples(
+            self, url: str, mode: str, compress: bool = True
+    ) -> WebsiteMeasurement:
+        """
+        Measure samples of website, errors of load (timeout, DNS, connection,
+        TLS, HTTP status and any other error of this url) are returned as
+        failed WebsiteMeasurement, so they do not stop the round.
+
+        :param url: str
+        :param mode: str
+        :param compress: bool
+        :return: WebsiteMeasurement
+        """
+        try:
+            return self.measure_samples(url, mode, compress)
+        except Exception as e:
+            error = get_error_kind(e)
+            logger.error(
+                f'\n[ERROR][WebsiteMeasure][try_measure_samples]'
+                f'\n{url} failed ({error}): {e!r}'
+            )
+            return WebsiteMeasurement.from_error(url, error, mode)
+
+    def measure_samples(
+            self, url: str, mode: str, compress: bool = True
+    ) -> WebsiteMeasurement:
+        """
+        Load website self.samples times in cold or warm mode.
+        Warm mode opens pooled connection with not measured load first, so
+        every sample reuses connection.
+        Sampling stops after end of round deadline, collected samples are
+        kept.
+
+        :param url: str
+        :param mode: str
+        :param compress: bool, accept compressed body
+        :return: WebsiteMeasurement
+        """
+        reuse = mode == 'warm'
+        if reuse and not self.backend.is_warm(url):
+            self.load_website(url, reuse, compress)
+
+        timing = self.load_website(url, reuse, compress)
+        website = self.save_to_object(
+            url, timing.start_time, timing.end_time, timing.phases,
+            timing.body_bytes
+        )
+        website.mode = mode
+        website.decoded_bytes = timing.decoded_bytes
+        website.decompress_time = timing.decompress_time
+        website.queue_time = timing.queue_time
+        if self.full_page:
+            self.save_page(website, timing)
+        for _ in range(self.samples - 1):
+            if self.deadline_at is not None and \
+                    monotonic() >= self.deadline_at:
+                break
+            timing = self.load_website(url, reuse, compress)
+            website.add_sample(
+                timing.start_time, timing.end_time, timing.phases,
+                timing.body_bytes
+            )
+            website.queue_time += timing.queue_time
+        return website
+
+    def load_website(
+            self, url: str, reuse: bool = False, compress: bool = True
+    ) -> Union[PhaseTiming, PageTiming]:
+        """
+        Load website html once with self.backend, with reuse on pooled
+        keep-alive connection, with compress accept compressed body.
+        In full page mode load also all resources of html with
+        self.page_loader.
+        With self.limiter load waits for free slot of host, time of waiting
+        is saved as queue of timing and is not part of load time. In full
+        page mode document and every resource wait for slot of own host.
+        Return durations of all load phases.
+
+        :param url: str
+        :param reuse: bool
+        :param compress: bool
+        :return: Union[PhaseTiming, PageTiming]
+        """
+        if self.full_page:
+            return self.get_page_loader().load(url, reuse, compress)
+        if self.limiter is None:
+            return self.fetch(url, reuse, compress)
+        with self.limiter.limit(url) as queue:
+            timing = self.fetch(url, reuse, compress)
+        timing.queue = queue
+        return timing
+
+    def fetch(
+            self, url: str, reuse: bool = False, compress: bool = True
+    ) -> PhaseTiming:
+        """
+        Load website html once with self.backend.
+
+        :param url: str
+        :param reuse: bool
+        :param compress: bool
+        :return: PhaseTiming
+        """
+        return self.backend.fetch(url, reuse, compress=compress)
+
+    def get_page_loader(self) -> PageLoader:
+        """
+        Create PageLoader sharing self.backend connections with first full
+        page load.
+
+        :return: PageLoader
+        """
+        with self.page_loader_lock:
+            if self.page_loader is None:
+                self.page_loader = PageLoader(
+                    self.backend, self.parallelism, self.concurrency,
+                    self.limiter
+                )
+            return self.page_loader
+
+    @staticmethod
+    def save_page(website: WebsiteMeasurement, page: PageTiming) -> None:
+        """
+        Save document time and resources of full page load to website.
+
+        :param website: WebsiteMeasurement
+        :param page: PageTiming
+        :return: None
+        """
+        website.document_time = page.document_time
+        website.resources = len(page.resources)
+        website.resource_bytes = page.get_bytes()
+        website.critical_resources = sum(
+            resource.critical for resource in page.resources
+        )
+        website.critical_bytes = page.get_bytes(critical=True)
+        website.failed_resources = sum(
+            resource.error is not None for resource in page.resources
+        )
+
     def save_to_object(
             self,
             url: str,
             start_time: time,
-            end_time: time
+            end_time: time,
+            phases: Dict[str, float] = None,
+            bytes_transferred: int = 0
     ) -> WebsiteMeasurement:
         """
         Save measurement data to WebsiteMeasurement dataclass.
@@ -168,9 +1208,14 @@ class WebsiteMeasure:
         :param url: str
         :param start_time: time
         :param end_time: time
+        :param phases: Dict[str, float], seconds of PHASES
+        :param bytes_transferred: int
         :return: WebsiteMeasurement
         """
-        return WebsiteMeasurement(url, start_time, end_time)
+        return WebsiteMeasurement(
+            url, start_time, end_time, **(phases or {}),
+            bytes_transferred=bytes_transferred
+        )
 
     def prepare_additional_data(self):
         """
@@ -181,11 +1226,30 @@ class WebsiteMeasure:
         """
         self.websites_list.append(self.main_website)
         self.websites_list = WebsiteMeasurement.get_sorted_ranking(
-            self.websites_list
+            self.websites_list, self.rank_by, self.metric
         )
         result_data = dict()
+        if self.group_name:
+            result_data['group'] = self.group_name
         result_data['comparison_result'] = self.get_comparison_result()
+        result_data['ranked_by'] = f'{self.rank_by} of {self.metric}'
         result_data['comparison_date'] = str(datetime.datetime.now())
+        aggregate = self.aggregates.get(self.main_website.url)
+        if self.serve and aggregate:
+            result_data['all_rounds'] = ' '.join(
+                [f'samples: {aggregate.count}'] + [
+                    f'{name}: {round(value, ROUND_VALUE)}'
+                    for name, value in aggregate.summarize().items()
+                ]
+            )
+            result_data['all_rounds_histogram'] = aggregate.to_text()
+        if self.load_steps:
+            saturation = get_saturation(self.load_steps)
+            result_data['max_throughput'] = round(
+                max(step.throughput for step in self.load_steps), ROUND_VALUE
+            )
+            result_data['saturation'] = 'not reached' if saturation is None \
+                else f'{saturation.clients} clients'
 
         self.result_data = result_data
 
@@ -207,30 +1271,95 @@ class WebsiteMeasure:
             the competitors - send email message to specified email address.
             - if the benchmarked website is loaded twice as slow as at least
             one of the competitors send SMS message alongside the email message
+        Slowdown ratios are set in self.policy, samples of self.metric are
+        compared without outliers and slowdown has to be significant (with
+        enough samples), see AlertPolicy.
 
+        Notifications are queued to self.dispatcher and sent in background,
         SMS notifications mocked with DummySMSSender.
+        Digests of mail alerts are sent when digest window passed.
+        Nothing is sent if main website could not be measured or is ranked
+        first, failed competitors are skipped.
 
         :return: None
         """
-        if self.main_website.ranking_place != 1:
-            with MailSender() as mail:
-                mail.send_message(
-                    self.main_website.ranking_place,
-                    len(self.websites_list),
-                    self.mail
+        if self.main_website.is_failed():
+            logger.error(
+                f'\n[ERROR][WebsiteMeasure][send_notifications]'
+                f'\nMain website failed ({self.main_website.error}), '
+                f'notifications skipped'
+            )
+        elif getattr(self.main_website, 'ranking_place', None) == 1:
+            logger.info(
+                f'\n[INFO][WebsiteMeasure][send_notifications]'
+                f'\nMain website ranked first, notifications skipped'
+            )
+        else:
+            comparisons = self.policy.compare_all(
+                self.main_website, self.websites_list
+            )
+            for comparison in comparisons:
+                logger.debug(
+                    f'\n[DEBUG][WebsiteMeasure][send_notifications]'
+                    f'\n{comparison}'
                 )
+            if any(comparison.mail for comparison in comparisons):
+                self.notify('mail', self.mail)
+                if any(comparison.sms for comparison in comparisons):
+                    self.notify('sms', self.sms)
 
-            for page in self.websites_list:
-                if self.main_website.time * 2 >= page.time:
-                    # from website_measure.sms import TwilioSMSSender
-                    # sms = TwilioSMSSender()
-                    sms = DummySMSSender()
-                    sms.send_message(
-                        self.main_website.ranking_place,
-                        len(self.websites_list),
-                        self.sms
-                    )
-                    break
+        if self.alerts is not None:
+            for digest in self.alerts.pop_digests():
+                self.get_dispatcher().send(digest)
+
+    def notify(self, kind: str, recipient: str) -> None:
+        """
+        Queue notification about main website ranking place.
+        With self.alerts alerts in cooldown are skipped and mail alerts go
+        to digest if digest window is set.
+
+        :param kind: str, 'mail' or 'sms'
+        :param recipient: str
+        :return: None
+        """
+        notification = Notification(
+            kind,
+            self.main_website.ranking_place,
+            len(self.websites_list),
+            recipient,
+            main_url=self.main_website.url
+        )
+        if self.alerts is not None:
+            if kind == 'mail' and self.alerts.digest_window is not None:
+                self.alerts.add_to_digest(notification)
+                return
+            if not self.alerts.should_send(notification):
+                return
+        self.get_dispatcher().send(notification)
+
+    def get_dispatcher(self) -> NotificationDispatcher:
+        """
+        Create NotificationDispatcher with first notification, in daemon
+        mode it keeps SMTP session between rounds.
+
+        :return: NotificationDispatcher
+        """
+        if self.dispatcher is None:
+            self.dispatcher = NotificationDispatcher(
+                keep_alive=self.serve, on_delivered=self.mark_delivered
+            )
+        return self.dispatcher
+
+    def mark_delivered(self, notification: Notification) -> None:
+        """
+        Start cooldown of delivered alert, called by NotificationDispatcher
+        worker thread.
+
+        :param notification: Notification
+        :return: None
+        """
+        if self.alerts is not None and notification.kind != 'digest':
+            self.alerts.mark_sent(notification)
 
     def write_result_to_file(self):
         """
@@ -239,21 +1368,48 @@ class WebsiteMeasure:
         :return: None
         """
         with WriteFile() as write_file:
-            for page in self.websites_list:
-                write_file.append(f'{str(page)}\n')
-            for k, v in self.result_data.items():
-                write_file.append(f'{k}:\t\t{v}\n')
+            self.write_result(write_file)
+
+    def write_result(self, write_file: WriteFile) -> None:
+        """
+        Append comparision result with result_data and compared pages to
+        open result file.
+
+        :param write_file: WriteFile
+        :return: None
+        """
+        for page in self.websites_list:
+            write_file.append(f'{page.to_text(self.metric)}\n')
+        for line in self.get_load_test_lines():
+            write_file.append(f'{line}\n')
+        for k, v in self.result_data.items():
+            write_file.append(f'{k}:\t\t{v}\n')
 
     def print_result(self):
         """
         Print comparision result with result_data and compared pages to
         terminal.
-        To change WebsiteMeasurement print format check str method in
+        To change WebsiteMeasurement print format check to_text method in
         website.py/WebsiteMeasurement.
 
         :return: None
         """
         for page in self.websites_list:
-            print(str(page))
+            print(page.to_text(self.metric))
+        for line in self.get_load_test_lines():
+            print(line)
         for k, v in self.result_data.items():
             print(f'{k}:\t\t{v}')
+
+    def get_load_test_lines(self) -> List[str]:
+        """
+        Saturation curve of main website: line with every step of load
+        test, empty without load test.
+
+        :return: List[str]
+        """
+        if not self.load_steps:
+            return []
+        return [f'load test of {self.main_website.url}:'] + [
+            f'  {step.to_text()}' for step in self.load_steps
+        ]
@@ -0,0 +1,250 @@
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from website_measure import logger
+from website_measure.constants import NOTIFY_BACKOFF, NOTIFY_RETRIES
+
+
+@dataclass
+class Notification:
+    """
+    Dataclass object with notification waiting for delivery.
+    kind - 'mail', 'sms' or 'digest' (one mail with many alerts)
+    """
+    kind: str
+    main_website_place: int
+    all_websites: int
+    recipient: Optional[str] = None
+    attempts: int = 0
+    main_url: str = ''
+    alerts: List[dict] = field(default_factory=list)
+
+
+class NotificationDispatcher:
+    """
+    Send notifications from background worker thread, so slow mail server
+    does not delay results.
+    Failed notification is retried with exponential backoff, delivered one
+    is passed to on_delivered callback.
+    Authenticated SMTP session and sms sender are created once and reused,
+    with keep_alive (daemon mode) also between rounds, otherwise SMTP
+    session is closed when queue is empty.
+    """
+    def __init__(
+            self,
+            retries: int = NOTIFY_RETRIES,
+            backoff: float = NOTIFY_BACKOFF,
+            keep_alive: bool = False,
+            on_delivered: Optional[Callable[[Notification], None]] = None
+    ):
+        """
+        self.retries - max retries of failed notification
+        self.backoff - seconds before first retry, doubled for next ones
+        self.keep_alive - keep SMTP session open when queue is empty
+        self.on_delivered - called in worker thread with every delivered
+        notification, example: AlertCache.mark_sent
+        self.queue - notifications waiting for delivery
+        self.mail_sender - open MailSender session or None
+        self.sms_sender - sms sender created with first sms
+        self.stopped - event set by close()
+        self.worker - background thread, started with first notification
+
+        :param retries: int
+        :param backoff: float
+        :param keep_alive: bool
+        :param on_delivered: Optional[Callable[[Notification], None]]
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.keep_alive = keep_alive
+        self.on_delivered = on_delivered
+        self.queue = queue.Queue()
+        self.mail_sender = None
+        self.sms_sender = None
+        self.stopped = threading.Event()
+        self.worker = None
+        self.lock = threading.Lock()
+
+    def send(self, notification: Notification) -> None:
+        """
+        Queue notification for delivery, start worker if needed.
+
+        :param notification: Notification
+        :return: None
+        """
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(
+                    target=self.work, name='wlm-notify', daemon=True
+                )
+                self.worker.start()
+        self.queue.put(notification)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued notifications are delivered (or dropped
+        after retries), at most timeout seconds (None - no limit).
+        Return True if queue is empty.
+
+        :param timeout: Optional[float]
+        :return: bool
+        """
+        with self.queue.all_tasks_done:
+            return self.queue.all_tasks_done.wait_for(
+                lambda: not self.queue.unfinished_tasks, timeout
+            )
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait up to timeout seconds for delivery, then stop worker.
+        Not delivered notifications are logged as lost.
+        Return True if all notifications were delivered.
+
+        :param timeout: Optional[float]
+        :return: bool
+        """
+        delivered = self.wait(timeout)
+        if not delivered:
+            logger.error(
+                f'\n[ERROR][NotificationDispatcher][close]'
+                f'\n{self.queue.unfinished_tasks} notifications not delivered'
+            )
+        self.stopped.set()
+        self.queue.put(None)
+        if delivered and self.worker is not None:
+            self.worker.join()
+        return delivered
+
+    def work(self) -> None:
+        """
+        Worker thread loop.
+        Deliver queued notifications until None is queued.
+
+        :return: None
+        """
+        while True:
+            notification = self.queue.get()
+            try:
+                if notification is None:
+                    self.close_mail_sender()
+                    return
+                self.deliver(notification)
+                if self.queue.empty() and not self.keep_alive:
+                    self.close_mail_sender()
+            finally:
+                self.queue.task_done()
+
+    def deliver(self, notification: Notification) -> None:
+        """
+        Send notification, retry with exponential backoff on failure.
+
+        :param notification: Notification
+        :return: None
+        """
+        while not self.stopped.is_set():
+            notification.attempts += 1
+            try:
+                if self.send_now(notification):
+                    self.delivered(notification)
+                    return
+            except Exception as e:
+                logger.error(
+                    f'\n[ERROR][NotificationDispatcher][deliver]'
+                    f'\n{notification.kind} attempt {notification.attempts}'
+                    f'\n{e!r}'
+                )
+            if notification.kind != 'sms':
+                self.close_mail_sender()
+            if notification.attempts > self.retries:
+                break
+            delay = self.backoff * 2 ** (notification.attempts - 1)
+            if self.stopped.wait(delay):
+                break
+        logger.error(
+            f'\n[ERROR][NotificationDispatcher][deliver]'
+            f'\n{notification.kind} to {notification.recipient} lost after '
+            f'{notification.attempts} attempts'
+        )
+
+    def delivered(self, notification: Notification) -> None:
+        """
+        Pass delivered notification to self.on_delivered, its errors are
+        logged.
+
+        :param notification: Notification
+        :return: None
+        """
+        if self.on_delivered is None:
+            return
+        try:
+            self.on_delivered(notification)
+        except Exception as e:
+            logger.error(
+                f'\n[ERROR][NotificationDispatcher][delivered]\n{e!r}'
+            )
+
+    def send_now(self, notification: Notification) -> bool:
+        """
+        Send notification with reused mail session or sms sender.
+        Return True if message was sent.
+
+        :param notification: Notification
+        :return: bool
+        """
+        if notification.kind == 'digest':
+            return self.get_mail_sender().send_digest(
+                notification.alerts, notification.recipient
+            )
+        if notification.kind == 'mail':
+            sender = self.get_mail_sender()
+        else:
+            sender = self.get_sms_sender()
+        return sender.send_message(
+            notification.main_website_place,
+            notification.all_websites,
+            notification.recipient
+        )
+
+    def get_mail_sender(self):
+        """
+        Open authenticated MailSender session or return already open one.
+
+        :return: MailSender
+        """
+        if self.mail_sender is None:
+            from website_measure.mail import MailSender
+
+            self.mail_sender = MailSender().__enter__()
+        return self.mail_sender
+
+    def get_sms_sender(self):
+        """
+        Create sms sender once and reuse it.
+        SMS notifications mocked with DummySMSSender, for twilio use:
+        TwilioSMSSender().__enter__()
+
+        :return: DummySMSSender
+        """
+        if self.sms_sender is None:
+            from website_measure.sms import DummySMSSender
+
+            self.sms_sender = DummySMSSender()
+        return self.sms_sender
+
+    def close_mail_sender(self) -> None:
+        """
+        Close open MailSender session.
+
+        :return: None
+        """
+        if self.mail_sender is None:
+            return
+        try:
+            self.mail_sender.__exit__()
+        except Exception as e:
+            logger.error(
+                f'\n[ERROR][NotificationDispatcher][close_mail_sender]\n{e!r}'
+            )
+        self.mail_sender = None
@@ -0,0 +1,365 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from time import perf_counter_ns
+from typing import Dict, List, Optional
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from website_measure import logger
+from website_measure.backend import (
+    NS_IN_SECOND, MeasureBackend, PhaseTiming, get_error_kind,
+)
+from website_measure.constants import DEFAULT_CONCURRENCY, DEFAULT_PARALLELISM
+from website_measure.limits import HostLimiter
+
+
+@dataclass
+class Resource:
+    """
+    Dataclass object with sub-resource of page.
+    kind - 'css', 'js' or 'img', critical - render blocking resource
+    (stylesheet or script without async/defer).
+    """
+    url: str
+    kind: str
+    critical: bool = False
+    timing: Optional[PhaseTiming] = None
+    error: Optional[str] = None
+
+
+class ResourceParser(HTMLParser):
+    """
+    Collect urls of stylesheets, scripts and images from page html.
+    """
+    def __init__(self, base_url: str):
+        """
+        self.base_url - url of page, changed by <base href>
+        self.resources - collected resources in order of html, without
+        duplicates
+
+        :param base_url: str
+        """
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.resources: Dict[str, Resource] = {}
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        """
+        Collect resource of <link rel=stylesheet>, <script src> and
+        <img src> tag.
+
+        :param tag: str
+        :param attrs: list
+        :return: None
+        """
+        attrs = dict(attrs)
+        if tag == 'base' and attrs.get('href'):
+            self.base_url = urljoin(self.base_url, attrs['href'])
+        elif tag == 'link' and 'stylesheet' in \
+                (attrs.get('rel') or '').lower().split():
+            self.add(attrs.get('href'), 'css', True)
+        elif tag == 'script':
+            critical = 'async' not in attrs and 'defer' not in attrs and \
+                attrs.get('type') != 'module'
+            self.add(attrs.get('src'), 'js', critical)
+        elif tag == 'img':
+            self.add(attrs.get('src'), 'img')
+
+    def add(self, url: Optional[str], kind: str, critical: bool = False):
+        """
+        Add http(s) resource with url relative to self.base_url.
+
+        :param url: Optional[str]
+        :param kind: str
+        :param critical: bool
+        :return: None
+        """
+        if not url:
+            return
+        url = urldefrag(urljoin(self.base_url, url.strip()))[0]
+        if urlsplit(url).scheme not in ('http', 'https'):
+            return
+        if url not in self.resources:
+            self.resources[url] = Resource(url, kind, critical)
+
+
+def get_resources(html: str, base_url: str) -> List[Resource]:
+    """
+    Resources referenced by page html.
+
+    :param html: str
+    :param base_url: str
+    :return: List[Resource]
+    """
+    parser = ResourceParser(base_url)
+    parser.feed(html)
+    parser.close()
+    return list(parser.resources.values())
+
+
+@dataclass
+class PageTiming:
+    """
+    Dataclass object with full page load: html document timing and timings
+    of all sub-resources.
+    end_ns - end of the last loaded resource, nanoseconds from monotonic
+    perf_counter_ns clock, queue - nanoseconds of waiting for free slots of
+    hosts by document and all resources.
+    start_time, end_time, phases and body_bytes are the same as in
+    PhaseTiming, with end_time of whole page and phases of document.
+    """
+    document: PhaseTiming
+    resources: List[Resource] = field(default_factory=list)
+    end_ns: int = 0
+    queue: int = 0
+
+    @property
+    def start_time(self) -> float:
+        """
+        Start of page load in seconds.
+
+        :return: float
+        """
+        return self.document.start_time
+
+    @property
+    def end_time(self) -> float:
+        """
+        End of page load with all resources in seconds.
+
+        :return: float
+        """
+        return self.end_ns / NS_IN_SECOND
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        """
+        Durations of document load phases in seconds.
+
+        :return: Dict[str, float]
+        """
+        return self.document.phases
+
+    @property
+    def body_bytes(self) -> int:
+        """
+        Bytes of document body.
+
+        :return: int
+        """
+        return self.document.body_bytes
+
+    @property
+    def decoded_bytes(self) -> int:
+        """
+        Bytes of document body after decompression.
+
+        :return: int
+        """
+        return self.document.decoded_bytes
+
+    @property
+    def decompress_time(self) -> float:
+        """
+        Time of document body decompression in seconds.
+
+        :return: float
+        """
+        return self.document.decompress_time
+
+    @property
+    def queue_time(self) -> float:
+        """
+        Time of waiting for free slot of host in seconds.
+
+        :return: float
+        """
+        return self.queue / NS_IN_SECOND
+
+    @property
+    def document_time(self) -> float:
+        """
+        Load time of html document in seconds.
+
+        :return: float
+        """
+        return self.document.end_time - self.document.start_time
+
+    def get_bytes(self, critical: bool = False) -> int:
+        """
+        Body bytes of all (or only critical) loaded resources.
+
+        :param critical: bool
+        :return: int
+        """
+        return sum(
+            resource.timing.body_bytes for resource in self.resources
+            if resource.timing is not None
+            and (resource.critical or not critical)
+        )
+
+
+class PageLoader:
+    """
+    Load html document and then all its stylesheets, scripts and images
+    concurrently, like a browser: up to self.parallelism resources of the
+    same origin at the same time, over pooled keep-alive connections.
+    With self.limiter document and every resource wait for free slot of
+    their host.
+    """
+    def __init__(
+            self,
+            backend: MeasureBackend,
+            parallelism: int = DEFAULT_PARALLELISM,
+            pages: int = DEFAULT_CONCURRENCY,
+            limiter: HostLimiter = None
+    ):
+        """
+        self.backend - MeasureBackend loading document and resources
+        self.parallelism - max resources of one origin loaded at the same
+        time
+        self.pages - max pages loaded at the same time, every page has own
+        self.parallelism threads
+        self.limiter - HostLimiter of document and resource loads, None -
+        without limits
+        self.executor - thread pool created with first page with resources
+        self.lock - lock of self.executor creation
+
+        :param backend: MeasureBackend
+        :param parallelism: int
+        :param pages: int
+        :param limiter: HostLimiter
+        """
+        if parallelism < 1:
+            raise ValueError('parallelism must be at least 1')
+        self.backend = backend
+        self.parallelism = parallelism
+        self.pages = pages
+        self.limiter = limiter
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def close(self) -> None:
+        """
+        Stop threads of self.executor.
+
+        :return: None
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        """
+        Thread pool shared by pages loaded at the same time.
+
+        :return: ThreadPoolExecutor
+        """
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.parallelism * self.pages,
+                    thread_name_prefix='wlm-page'
+                )
+            return self.executor
+
+    def load(
+            self, url: str, reuse: bool = False, compress: bool = True
+    ) -> PageTiming:
+        """
+        Load document (with reuse on pooled connection) and all its
+        resources on pooled connections.
+        Resources which failed are kept with error, page load does not fail.
+
+        :param url: str
+        :param reuse: bool
+        :param compress: bool, accept compressed document and resources
+        :return: PageTiming
+        """
+        document = self.fetch(url, reuse, True, compress)
+        html = bytes(document.body).decode('utf-8', errors='replace')
+        document.body = None
+        page = PageTiming(
+            document, get_resources(html, document.url), queue=document.queue
+        )
+        if page.resources:
+            executor = self.get_executor()
+            semaphores = {}
+            futures = []
+            for resource in page.resources:
+                key = self.backend.get_key(urlsplit(resource.url))
+                if key not in semaphores:
+                    semaphores[key] = threading.BoundedSemaphore(
+                        self.parallelism
+                    )
+                futures.append(executor.submit(
+                    self.load_resource, resource, semaphores[key], compress
+                ))
+            for future in futures:
+                future.result()
+            page.queue += sum(
+                resource.timing.queue for resource in page.resources
+            )
+        page.end_ns = max(
+            [document.end_ns] + [
+                resource.timing.end_ns for resource in page.resources
+                if resource.timing is not None
+            ]
+        )
+        return page
+
+    def fetch(
+            self,
+            url: str,
+            reuse: bool = False,
+            keep_body: bool = False,
+            compress: bool = True
+    ) -> PhaseTiming:
+        """
+        Load url with self.backend, with self.limiter after waiting for free
+        slot of its host, time of waiting is saved as queue of timing.
+
+        :param url: str
+        :param reuse: bool
+        :param keep_body: bool
+        :param compress: bool
+        :return: PhaseTiming
+        """
+        if self.limiter is None:
+            return self.backend.fetch(url, reuse, keep_body, compress)
+        with self.limiter.limit(url) as queue:
+            timing = self.backend.fetch(url, reuse, keep_body, compress)
+        timing.queue = queue
+        return timing
+
+    def load_resource(
+            self,
+            resource: Resource,
+            semaphore: threading.BoundedSemaphore,
+            compress: bool = True
+    ) -> None:
+        """
+        Load resource on pooled connection when origin has free slot, save
+        timing or kind of error to resource.
+        Every error of resource (also redirect to not http(s) url or corrupt
+        body) is saved, so it does not fail page load.
+
+        :param resource: Resource
+        :param semaphore: threading.BoundedSemaphore
+        :param compress: bool
+        :return: None
+        """
+        with semaphore:
+            start_ns = perf_counter_ns()
+            try:
+                resource.timing = self.fetch(
+                    resource.url, True, compress=compress
+                )
+            except Exception as e:
+                resource.error = get_error_kind(e)
+                resource.timing = PhaseTiming(start_ns, perf_counter_ns())
+                logger.debug(
+                    f'\n[DEBUG][PageLoader][load_resource]'
+                    f'\n{resource.url} failed ({resource.error}): {e!r}'
+                )
@@ -0,0 +1,97 @@
+import http.client
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from website_measure.constants import MAX_IDLE_CONNECTIONS
+
+PoolKey = Tuple[str, str, int]  # (scheme, host, port)
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of idle keep-alive connections, separate for every
+    (scheme, host, port).
+    """
+    def __init__(self, max_idle: int = MAX_IDLE_CONNECTIONS):
+        """
+        self.max_idle - max idle connections kept for one host, the rest is
+        closed on release
+        self.idle - idle connections by host key
+
+        :param max_idle: int
+        """
+        self.max_idle = max_idle
+        self.idle: Dict[PoolKey, List[http.client.HTTPConnection]] = {}
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        """
+        Context manager method.
+
+        :return: self
+        """
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        """
+        Context manager method.
+        Close all idle connections.
+        """
+        self.close()
+
+    def acquire(self, key: PoolKey) -> Optional[http.client.HTTPConnection]:
+        """
+        Take the most recently used idle connection of host.
+        Return None if there is no idle connection.
+
+        :param key: PoolKey
+        :return: Optional[http.client.HTTPConnection]
+        """
+        with self.lock:
+            connections = self.idle.get(key)
+            if connections:
+                return connections.pop()
+        return None
+
+    def release(
+            self, key: PoolKey, connection: http.client.HTTPConnection
+    ) -> None:
+        """
+        Give back connection for reuse or close it if pool of host is full.
+
+        :param key: PoolKey
+        :param connection: http.client.HTTPConnection
+        :return: None
+        """
+        with self.lock:
+            connections = self.idle.setdefault(key, [])
+            if len(connections) < self.max_idle:
+                connections.append(connection)
+                return
+        connection.close()
+
+    def has_idle(self, key: PoolKey) -> bool:
+        """
+        True if there is idle connection of host.
+
+        :param key: PoolKey
+        :return: bool
+        """
+        with self.lock:
+            return bool(self.idle.get(key))
+
+    def close(self) -> None:
+        """
+        Close and forget all idle connections.
+
+        :return: None
+        """
+        with self.lock:
+            connections = [
+                connection
+                for host_connections in self.idle.values()
+                for connection in host_connections
+            ]
+            self.idle.clear()
+        for connection in connections:
+            connection.close()
@@ -0,0 +1,184 @@
+import ipaddress
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+
+from website_measure import logger
+from website_measure.constants import DEFAULT_CONCURRENCY, DNS_DEFAULT_TTL
+
+
+def get_dns_resolver():
+    """
+    dnspython resolver, None if dnspython is not installed.
+
+    :return: dns.resolver.Resolver or None
+    """
+    try:
+        import dns.resolver
+    except ImportError:
+        return None
+    try:
+        return dns.resolver.Resolver()
+    except dns.resolver.NoResolverConfiguration:
+        return None
+
+
+class Resolver:
+    """
+    Resolve host names with in-process cache.
+    With installed dnspython records are cached for their TTL, otherwise
+    system resolver is used and results are cached for self.default_ttl.
+    """
+    def __init__(self, default_ttl: float = DNS_DEFAULT_TTL):
+        """
+        self.default_ttl - seconds of caching addresses without known TTL
+        self.cache - (host, port): (expiry monotonic time, addresses)
+        self.lock - lock of self.cache
+        self.dns_resolver - dnspython resolver, created with first lookup,
+        False - dnspython is not installed
+
+        :param default_ttl: float
+        """
+        self.default_ttl = default_ttl
+        self.cache: Dict[Tuple[str, int], Tuple[float, list]] = {}
+        self.lock = threading.Lock()
+        self.dns_resolver = None
+
+    def resolve(self, host: str, port: int) -> list:
+        """
+        Addresses of host in socket.getaddrinfo format, from cache if not
+        expired.
+        Raise socket.gaierror if host can not be resolved.
+
+        :param host: str
+        :param port: int
+        :return: list
+        """
+        key = host, port
+        now = monotonic()
+        with self.lock:
+            cached = self.cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        addresses, ttl = self.lookup(host, port)
+        with self.lock:
+            self.cache[key] = now + ttl, addresses
+        return addresses
+
+    def lookup(self, host: str, port: int) -> Tuple[list, float]:
+        """
+        Resolve host without cache, return addresses and their TTL.
+        IP addresses and hosts without dnspython are resolved with system
+        resolver and self.default_ttl.
+
+        :param host: str
+        :param port: int
+        :return: Tuple[list, float]
+        """
+        if self.dns_resolver is None:
+            self.dns_resolver = get_dns_resolver() or False
+        if self.dns_resolver is False or self.is_ip(host):
+            return socket.getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            ), self.default_ttl
+        return self.lookup_records(host, port)
+
+    def lookup_records(self, host: str, port: int) -> Tuple[list, float]:
+        """
+        Resolve A and AAAA records of host with dnspython, TTL is the lowest
+        TTL of records.
+        Hosts without records (NXDOMAIN, names from /etc/hosts or other NSS
+        sources) are resolved with system resolver and self.default_ttl.
+
+        :param host: str
+        :param port: int
+        :return: Tuple[list, float]
+        """
+        import dns.exception
+
+        query = getattr(self.dns_resolver, 'resolve', None) or \
+            self.dns_resolver.query
+        addresses = []
+        ttls = []
+        for record_type, family in (('A', socket.AF_INET),
+                                    ('AAAA', socket.AF_INET6)):
+            try:
+                answer = query(host, record_type)
+            except dns.exception.DNSException:
+                continue
+            ttls.append(answer.rrset.ttl)
+            for record in answer:
+                address = (record.address, port)
+                if family == socket.AF_INET6:
+                    address += (0, 0)
+                addresses.append(
+                    (family, socket.SOCK_STREAM, socket.IPPROTO_TCP, '',
+                     address)
+                )
+        if not addresses:
+            logger.debug(
+                f'\n[DEBUG][Resolver][lookup_records]'
+                f'\nNo DNS records of {host}, system resolver used'
+            )
+            return socket.getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            ), self.default_ttl
+        return addresses, min(ttls)
+
+    @staticmethod
+    def is_ip(host: str) -> bool:
+        """
+        True if host is IP address.
+
+        :param host: str
+        :return: bool
+        """
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return True
+
+    def prefetch(
+            self, urls: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> List[str]:
+        """
+        Resolve hosts of all urls concurrently before measurement, so DNS
+        lookup is not part of measured time.
+        Hosts which can not be resolved are logged and returned, their
+        measurement fails with dns error.
+
+        :param urls: Iterable[str]
+        :param concurrency: int
+        :return: List[str], not resolved hosts
+        """
+        keys = {}
+        for url in urls:
+            parts = urlsplit(url)
+            if parts.hostname:
+                port = parts.port or (443 if parts.scheme == 'https' else 80)
+                keys[parts.hostname, port] = None
+        keys = list(keys)
+
+        def resolve(key: Tuple[str, int]) -> bool:
+            try:
+                self.resolve(*key)
+                return True
+            except OSError:
+                return False
+
+        with ThreadPoolExecutor(
+                max_workers=max(1, min(concurrency, len(keys))),
+                thread_name_prefix='wlm-resolve'
+        ) as executor:
+            resolved = list(executor.map(resolve, keys))
+        failed = [host for (host, _), ok in zip(keys, resolved) if not ok]
+        logger.info(
+            f'\n[INFO][Resolver][prefetch]'
+            f'\nResolved {len(keys) - len(failed)} of {len(keys)} hosts'
+        )
+        return failed
@@ -0,0 +1,126 @@
+import random
+import signal
+import threading
+from time import monotonic
+from typing import Callable
+
+from website_measure import logger
+from website_measure.constants import DEFAULT_JITTER
+
+
+class Scheduler:
+    """
+    Run benchmark rounds periodically until stopped.
+    Rounds start every interval seconds (plus random jitter), round which
+    would overlap still running previous one is skipped.
+    SIGTERM and SIGINT stop scheduler after current round.
+    """
+    def __init__(
+            self,
+            round_function: Callable[[], None],
+            interval: float,
+            jitter: float = DEFAULT_JITTER
+    ):
+        """
+        self.round_function - callable running single benchmark round
+        self.interval - seconds between starts of rounds
+        self.jitter - max random delay of round start in seconds
+        self.stopped - event set by stop()
+        self.rounds - number of finished rounds
+        self.skipped - number of skipped overlapping rounds
+
+        :param round_function: Callable[[], None]
+        :param interval: float
+        :param jitter: float
+        """
+        if interval <= 0:
+            raise ValueError('interval must be greater than 0')
+        if jitter < 0:
+            raise ValueError('jitter can not be negative')
+        self.round_function = round_function
+        self.interval = interval
+        self.jitter = jitter
+        self.stopped = threading.Event()
+        self.rounds = 0
+        self.skipped = 0
+
+    def run(self) -> None:
+        """
+        Run rounds until stop() or SIGTERM/SIGINT.
+        Exception of round is logged and scheduler continues.
+
+        :return: None
+        """
+        self.install_signal_handlers()
+        logger.info(
+            f'\n[INFO][Scheduler][run]'
+            f'\nStarted with interval {self.interval}s, jitter {self.jitter}s'
+        )
+        next_tick = monotonic()
+        while not self.stopped.is_set():
+            delay = next_tick - monotonic()
+            if self.jitter:
+                delay += random.uniform(0, self.jitter)
+            if delay > 0 and self.stopped.wait(delay):
+                break
+
+            self.run_round()
+            next_tick = self.get_next_tick(next_tick, monotonic())
+
+        logger.info(
+            f'\n[INFO][Scheduler][run]'
+            f'\nStopped after {self.rounds} rounds, skipped {self.skipped}'
+        )
+
+    def run_round(self) -> None:
+        """
+        Run single round, log exception instead of raising it.
+
+        :return: None
+        """
+        try:
+            self.round_function()
+        except Exception as e:
+            logger.error(f'\n[ERROR][Scheduler][run_round]\n{e!r}')
+        self.rounds += 1
+
+    def get_next_tick(self, tick: float, now: float) -> float:
+        """
+        Start of the next round after tick which is not in the past.
+        Ticks passed during too long round are skipped and counted in
+        self.skipped.
+
+        :param tick: float, monotonic time of started round
+        :param now: float, monotonic time
+        :return: float
+        """
+        tick += self.interval
+        if tick < now:
+            missed = int((now - tick) // self.interval) + 1
+            self.skipped += missed
+            tick += missed * self.interval
+            logger.info(
+                f'\n[INFO][Scheduler][get_next_tick]'
+                f'\nRound overran interval, skipped {missed} rounds'
+            )
+        return tick
+
+    def stop(self, *args) -> None:
+        """
+        Stop scheduler after current round. Usable as signal handler.
+
+        :return: None
+        """
+        self.stopped.set()
+
+    def install_signal_handlers(self) -> None:
+        """
+        Stop scheduler on SIGTERM and SIGINT.
+        Signal handlers can be set only in main thread.
+
+        :return: None
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
@@ -1,6 +1,5 @@
 import os
 
-from twilio.rest import Client
 from website_measure import logger
 from website_measure.constants import SMS_TEMPLATE
 
@@ -29,9 +28,13 @@ class TwilioSMSSender:
         Context manager method.
         Create connection with server and login to it with provided
         credentials after init.
+        twilio is imported here, it is slow to import and not needed until
+        sms is sent.
 
         :return: self
         """
+        from twilio.rest import Client
+
         self.client = Client(self.account_id, self.token)
         return self
 
@@ -40,16 +43,17 @@ class TwilioSMSSender:
             main_website_place: int,
             all_websites: int,
             recipient_number: str
-    ) -> None:
+    ) -> bool:
         """
         Fill SMS_TEMPLATE with provided data.
         Send sms message to recipient_number phone number or phone number
         from .env file.
+        Return True if message was sent.
 
         :param main_website_place: int
         :param all_websites: int
         :param recipient_number: str
-        :return: None
+        :return: bool
         """
         if not recipient_number:
             recipient_number = os.environ.get('DEFAULT_RECIPIENT_PHONE_NUMBER')
@@ -66,8 +70,10 @@ class TwilioSMSSender:
             logger.info(
                 f'\n[INFO][TwilioSMSSender][send_message]'
                 f'\n{message.sid}')
+            return True
         except Exception as e:
             logger.info(f'\n[ERROR][TwilioSMSSender][send_message]\n{e}')
+            return False
 
 
 class DummySMSSender:
@@ -79,7 +85,7 @@ class DummySMSSender:
             main_website_place: int,
             all_websites: int,
             recipient_number: str
-    ) -> None:
+    ) -> bool:
         """
         Fill SMS_TEMPLATE with provided data.
         Print sms message with recipient_number phone number or phone number
@@ -88,7 +94,7 @@ class DummySMSSender:
         :param main_website_place: int
         :param all_websites: int
         :param recipient_number: str
-        :return: None
+        :return: bool
         """
         if not recipient_number:
             recipient_number = os.environ.get('DEFAULT_RECIPIENT_PHONE_NUMBER')
@@ -105,3 +111,4 @@ class DummySMSSender:
             f'\n[INFO][DummySMSSender][send_message]'
             f'\nSMS message: {text}'
         )
+        return True
@@ -0,0 +1,229 @@
+import math
+from array import array
+from statistics import NormalDist
+from typing import Dict, List, Sequence, Tuple
+
+from website_measure.constants import (
+    ADAPTIVE_CONFIDENCE, OUTLIER_THRESHOLD, STATISTICS, TRIM_PROPORTION,
+)
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """
+    Percentile of already sorted values with linear interpolation between
+    closest ranks.
+
+    :param sorted_values: Sequence[float]
+    :param percent: float, 0 - 100
+    :return: float
+    """
+    if not sorted_values:
+        raise ValueError('percentile of empty samples')
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    fraction = position - lower
+    return sorted_values[lower] + \
+        (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def mean(values: Sequence[float]) -> float:
+    """
+    Arithmetic mean of values.
+
+    :param values: Sequence[float]
+    :return: float
+    """
+    if not values:
+        raise ValueError('mean of empty samples')
+    return math.fsum(values) / len(values)
+
+
+def stddev(values: Sequence[float]) -> float:
+    """
+    Sample standard deviation of values, 0.0 for less than 2 values.
+
+    :param values: Sequence[float]
+    :return: float
+    """
+    if len(values) < 2:
+        return 0.0
+    average = mean(values)
+    return math.sqrt(
+        math.fsum((value - average) ** 2 for value in values) /
+        (len(values) - 1)
+    )
+
+
+def mad(values: Sequence[float]) -> float:
+    """
+    Median absolute deviation of values from their median.
+
+    :param values: Sequence[float]
+    :return: float
+    """
+    median = percentile(sorted(values), 50)
+    return percentile(sorted(abs(value - median) for value in values), 50)
+
+
+def reject_outliers(
+        values: Sequence[float], threshold: float = OUTLIER_THRESHOLD
+) -> List[float]:
+    """
+    Values without outliers: values with modified z-score (distance from
+    median in MADs) above threshold. Values with zero MAD are kept.
+
+    :param values: Sequence[float]
+    :param threshold: float
+    :return: List[float]
+    """
+    if len(values) < 3:
+        return list(values)
+    deviation = mad(values)
+    if deviation == 0:
+        return list(values)
+    median = percentile(sorted(values), 50)
+    return [
+        value for value in values
+        if 0.6745 * abs(value - median) / deviation <= threshold
+    ]
+
+
+def trimmed_mean(
+        values: Sequence[float], proportion: float = TRIM_PROPORTION
+) -> float:
+    """
+    Mean of values without proportion of the lowest and the highest values.
+
+    :param values: Sequence[float]
+    :param proportion: float, 0 - 0.5
+    :return: float
+    """
+    ordered = sorted(values)
+    cut = int(len(ordered) * proportion)
+    return mean(ordered[cut:len(ordered) - cut] or ordered)
+
+
+def mann_whitney(
+        values: Sequence[float], others: Sequence[float]
+) -> float:
+    """
+    One-sided p-value of Mann-Whitney U test that values are greater than
+    others, normal approximation with tie and continuity correction.
+    Ranks are computed with single sort of all values.
+
+    :param values: Sequence[float]
+    :param others: Sequence[float]
+    :return: float
+    """
+    count, other_count = len(values), len(others)
+    if not count or not other_count:
+        raise ValueError('mann-whitney test of empty samples')
+    ordered = sorted(
+        [(value, True) for value in values] +
+        [(value, False) for value in others]
+    )
+    total = len(ordered)
+    rank_sum = 0.0
+    ties = 0.0
+    start = 0
+    while start < total:
+        end = start
+        while end + 1 < total and ordered[end + 1][0] == ordered[start][0]:
+            end += 1
+        tied = end - start + 1
+        ties += tied ** 3 - tied
+        rank = (start + end) / 2 + 1
+        rank_sum += rank * sum(
+            is_value for _, is_value in ordered[start:end + 1]
+        )
+        start = end + 1
+
+    u = rank_sum - count * (count + 1) / 2
+    variance = count * other_count / 12 * (
+        total + 1 - ties / (total * (total - 1))
+    )
+    if variance <= 0:
+        return 1.0
+    z = (u - count * other_count / 2 - 0.5) / math.sqrt(variance)
+    return 1 - NormalDist().cdf(z)
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """
+    Compute all STATISTICS of values with single sort.
+
+    :param values: Sequence[float]
+    :return: Dict[str, float]
+    """
+    ordered = array('d', sorted(values))
+    return {
+        'min': ordered[0],
+        'median': percentile(ordered, 50),
+        'mean': mean(ordered),
+        'p90': percentile(ordered, 90),
+        'p95': percentile(ordered, 95),
+        'p99': percentile(ordered, 99),
+        'stddev': stddev(ordered),
+    }
+
+
+def confidence_interval(
+        values: Sequence[float],
+        name: str,
+        confidence: float = ADAPTIVE_CONFIDENCE
+) -> Tuple[float, float]:
+    """
+    Confidence interval of statistic from STATISTICS of values.
+    Mean has normal interval of standard error, percentiles have
+    distribution free interval between order statistics. 'min' and
+    'stddev' use interval of median.
+    Less than 2 values have infinite interval.
+
+    :param values: Sequence[float]
+    :param name: str
+    :param confidence: float, 0 - 1
+    :return: Tuple[float, float], lower and upper bound
+    """
+    if name not in STATISTICS:
+        raise KeyError(f'unknown statistic: {name}')
+    if len(values) < 2:
+        return -math.inf, math.inf
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    count = len(values)
+    if name == 'mean':
+        error = z * stddev(values) / math.sqrt(count)
+        average = mean(values)
+        return average - error, average + error
+
+    fraction = 0.5 if name in ('min', 'median', 'stddev') else \
+        float(name[1:]) / 100
+    spread = z * math.sqrt(count * fraction * (1 - fraction))
+    ordered = sorted(values)
+    lower = max(0, math.floor(count * fraction - spread))
+    upper = min(count - 1, math.ceil(count * fraction + spread) - 1)
+    return ordered[lower], ordered[max(lower, upper)]
+
+
+def statistic(values: Sequence[float], name: str) -> float:
+    """
+    Compute single statistic from STATISTICS of values.
+
+    :param values: Sequence[float]
+    :param name: str
+    :return: float
+    """
+    if name not in STATISTICS:
+        raise KeyError(f'unknown statistic: {name}')
+    if name == 'min':
+        return min(values)
+    if name == 'mean':
+        return mean(values)
+    if name == 'stddev':
+        return stddev(values)
+    ordered = sorted(values)
+    if name == 'median':
+        return percentile(ordered, 50)
+    return percentile(ordered, float(name[1:]))
@@ -0,0 +1,162 @@
+import sys
+from dataclasses import dataclass, field
+from typing import IO, Iterable, Iterator, List
+from urllib.parse import urlsplit, urlunsplit
+
+from website_measure import logger
+from website_measure.constants import (
+    DEFAULT_PORTS, DEFAULT_SCHEME, INVALID_URLS_TEMPLATE,
+)
+from website_measure.validate import Validate
+
+
+def normalize_url(url: str) -> str:
+    """
+    Add DEFAULT_SCHEME to url without scheme, lowercase scheme and host and
+    remove default port.
+
+    :param url: str
+    :return: str
+    """
+    url = url.strip()
+    if '://' not in url:
+        url = f'{DEFAULT_SCHEME}://{url}'
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.hostname or ''
+    if ':' in netloc:
+        netloc = f'[{netloc}]'
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc += f':{parts.port}'
+    if parts.username:
+        netloc = f'{parts.netloc.rsplit("@", 1)[0]}@{netloc}'
+    return urlunsplit(
+        (scheme, netloc, parts.path, parts.query, parts.fragment)
+    )
+
+
+def read_urls(file: IO[str]) -> Iterator[str]:
+    """
+    Stream urls from text file, one url per line.
+    Empty lines and lines starting with # are skipped.
+
+    :param file: IO[str]
+    :return: Iterator[str]
+    """
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+@dataclass
+class UrlList:
+    """
+    Dataclass object with collected urls.
+    """
+    urls: List[str] = field(default_factory=list)
+    invalid: List[str] = field(default_factory=list)
+    duplicates: int = 0
+
+
+class UrlCollector:
+    """
+    Collect urls from command line, files and stdin.
+    Validate every url, normalize valid ones and skip duplicates.
+    Invalid urls are collected and reported together.
+    """
+    def __init__(self, exclude: Iterable[str] = ()):
+        """
+        self.validate - url validator with precompiled regex
+        self.seen - keys of already collected (or excluded) urls
+        self.result - collected urls
+
+        :param exclude: Iterable[str], normalized urls to skip, example:
+        main website url
+        """
+        self.validate = Validate('url')
+        self.seen = {self.get_key(url) for url in exclude}
+        self.result = UrlList()
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        """
+        Key of normalized url used to find duplicates, url without path is
+        the same as url with '/' path.
+
+        :param url: str
+        :return: str
+        """
+        parts = urlsplit(url)
+        if not parts.path:
+            parts = parts._replace(path='/')
+        return urlunsplit(parts._replace(fragment=''))
+
+    def add(self, url: str) -> None:
+        """
+        Validate, normalize and collect single url.
+
+        :param url: str
+        :return: None
+        """
+        url = url.strip()
+        try:
+            if not self.validate.matches(url):
+                raise ValueError
+            url = normalize_url(url)
+        except ValueError:
+            self.result.invalid.append(url)
+            return
+        key = self.get_key(url)
+        if key in self.seen:
+            self.result.duplicates += 1
+            return
+        self.seen.add(key)
+        self.result.urls.append(url)
+
+    def add_all(self, urls: Iterable[str]) -> None:
+        """
+        Collect all urls.
+
+        :param urls: Iterable[str]
+        :return: None
+        """
+        for url in urls:
+            self.add(url)
+
+    def add_file(self, file_path: str) -> None:
+        """
+        Collect urls streamed from text file, '-' reads stdin.
+
+        :param file_path: str
+        :return: None
+        """
+        if file_path == '-':
+            self.add_all(read_urls(sys.stdin))
+            return
+        with open(file_path) as file:
+            self.add_all(read_urls(file))
+
+    def report(self, stream: IO[str] = None) -> None:
+        """
+        Log and print to stream (stderr by default) all invalid urls at
+        once.
+
+        :param stream: IO[str]
+        :return: None
+        """
+        logger.info(
+            f'\n[INFO][UrlCollector][report]'
+            f'\nCollected {len(self.result.urls)} urls, skipped '
+            f'{self.result.duplicates} duplicates and '
+            f'{len(self.result.invalid)} invalid'
+        )
+        if not self.result.invalid:
+            return
+        stream = stream or sys.stderr
+        text = '\n'.join([
+            INVALID_URLS_TEMPLATE.format(count=len(self.result.invalid)),
+            *self.result.invalid
+        ])
+        logger.error(text)
+        print(text, file=stream)
@@ -1,9 +1,22 @@
 import re
+from functools import lru_cache
+from typing import Pattern
 
 from website_measure import logger
 from website_measure.constants import REGEX_VALIDATION
 
 
+@lru_cache(maxsize=None)
+def get_pattern(regex_string: str) -> Pattern:
+    """
+    Compiled regex, every regex string is compiled only once.
+
+    :param regex_string: str
+    :return: Pattern
+    """
+    return re.compile(regex_string, re.IGNORECASE)
+
+
 class Validate:
     """
     Validate input data with regex.
@@ -12,6 +25,7 @@ class Validate:
         """
         self.regex_string - regex string from REGEX_VALIDATION dictionary
         self.error_message - error message from REGEX_VALIDATION dictionary
+        self.regex - compiled self.regex_string
 
         Update REGEX_VALIDATION dict in constants.py to use different regex
         strings, error messages or validate different types of data.
@@ -27,6 +41,16 @@ class Validate:
                 '\nNo data in REGEX_VALIDATION dict'
             )
             raise KeyError
+        self.regex = get_pattern(self.regex_string)
+
+    def matches(self, data: str) -> bool:
+        """
+        Check data with compiled regex without raising and logging.
+
+        :param data: str
+        :return: bool
+        """
+        return bool(self.regex.search(data))
 
     def is_valid(self, data: str, ) -> bool:
         """
@@ -36,8 +60,7 @@ class Validate:
         :param data: str
         :return: bool
         """
-        regex = re.compile(self.regex_string, re.IGNORECASE)
-        if not regex.search(data):
+        if not self.matches(data):
             logger.error(self.error_message.format(data=data))
             raise ValueError
         return True
@@ -1,20 +1,93 @@
+import math
+from array import array
 from dataclasses import dataclass, field
 from time import time
+from typing import Dict, Optional
 
-from website_measure.constants import ROUND_VALUE
+from website_measure import stats
+from website_measure.constants import DEFAULT_MODE, PHASES, ROUND_VALUE
+from website_measure.histogram import Histogram
+
+# Fields of single (first) load (queue_time of all loads) sent in record
+# next to url, times and samples
+RECORD_FIELDS = (
+    'decoded_bytes', 'decompress_time', 'document_time', 'resources',
+    'resource_bytes', 'critical_resources', 'critical_bytes',
+    'failed_resources', 'queue_time',
+)
 
 
 @dataclass
 class WebsiteMeasurement:
     """
     Dataclass object with website measurement data.
+    Total load time is kept in compact self.samples array, load time of
+    every phase (dns, connect, tls, ttfb, download) in self.phase_samples.
+    Bytes of body transferred in every sample are kept in self.byte_samples.
+    Measurements of the same url in other mode (e.g. warm next to cold) are
+    kept in self.variants and reported side by side.
+    Website which could not be measured has kind of error (one of
+    ERROR_KINDS) in self.error, no samples and is ranked last.
+    In full page mode time is load of document with all resources, load
+    time of html document alone is in self.document_time.
+    self.bytes_transferred are bytes of body on the wire, compressed body
+    has self.decoded_bytes after decompression.
+    self.queue_time is time of all loads waiting for free slot of host,
+    it is not part of measured times.
+    Total load times are also counted in constant memory self.histogram,
+    which is merged across rounds and worker processes.
+    With adaptive sampling self.confidence_low and self.confidence_high
+    are bounds of confidence interval of ranking statistic.
     """
     url: str
     start_time: time
     end_time: time
+    dns: float = field(default=0.0, metadata={'unit': 'seconds'})
+    connect: float = field(default=0.0, metadata={'unit': 'seconds'})
+    tls: float = field(default=0.0, metadata={'unit': 'seconds'})
+    ttfb: float = field(default=0.0, metadata={'unit': 'seconds'})
+    download: float = field(default=0.0, metadata={'unit': 'seconds'})
+    bytes_transferred: int = field(default=0, metadata={'unit': 'bytes'})
+    mode: str = DEFAULT_MODE
+    error: Optional[str] = None
+    decoded_bytes: int = field(default=0, metadata={'unit': 'bytes'})
+    decompress_time: float = field(
+        default=0.0, metadata={'unit': 'seconds'}
+    )
+    document_time: float = field(default=0.0, metadata={'unit': 'seconds'})
+    resources: int = 0
+    resource_bytes: int = field(default=0, metadata={'unit': 'bytes'})
+    critical_resources: int = 0
+    critical_bytes: int = field(default=0, metadata={'unit': 'bytes'})
+    failed_resources: int = 0
+    queue_time: float = field(default=0.0, metadata={'unit': 'seconds'})
+    confidence_low: Optional[float] = field(
+        default=None, metadata={'unit': 'seconds'}
+    )
+    confidence_high: Optional[float] = field(
+        default=None, metadata={'unit': 'seconds'}
+    )
     ranking_place: int = field(init=False)
     time: float = field(init=False, metadata={'unit': 'seconds'})
     time_round: float = field(init=False, metadata={'unit': 'seconds'})
+    throughput: float = field(
+        init=False, metadata={'unit': 'bytes per second'}
+    )
+    samples: array = field(
+        init=False, repr=False, metadata={'unit': 'seconds'}
+    )
+    phase_samples: Dict[str, array] = field(
+        init=False, repr=False, metadata={'unit': 'seconds'}
+    )
+    byte_samples: array = field(
+        init=False, repr=False, metadata={'unit': 'bytes'}
+    )
+    histogram: Histogram = field(
+        init=False, repr=False, metadata={'unit': 'seconds'}
+    )
+    variants: Dict[str, 'WebsiteMeasurement'] = field(
+        init=False, repr=False, default_factory=dict
+    )
 
     def __str__(self):
         """
@@ -22,17 +95,206 @@ class WebsiteMeasurement:
 
         :return: str
         """
-        return f'|{self.ranking_place}. \t| time: {self.time_round} \t| url:' \
-               f' {self.url}'
+        return self.to_text()
 
     def __post_init__(self):
         """
-        Calculate self.time and self.time_round after init object.
+        Calculate self.time, self.time_round and self.throughput after init
+        object.
+        Measured times and bytes are the first sample.
 
         :return: None
         """
         self.time = self.calculate_time()
         self.time_round = self.round_time()
+        self.throughput = self.calculate_throughput()
+        self.samples = array('d', [self.time])
+        self.byte_samples = array('q', [self.bytes_transferred])
+        self.phase_samples = {
+            phase: array('d', [getattr(self, phase)]) for phase in PHASES
+        }
+        self.histogram = Histogram()
+        if self.error is None:
+            self.histogram.record(self.time)
+
+    @classmethod
+    def from_error(
+            cls, url: str, error: str, mode: str = DEFAULT_MODE
+    ) -> 'WebsiteMeasurement':
+        """
+        Failed measurement of url without samples.
+
+        :param url: str
+        :param error: str, one of ERROR_KINDS
+        :param mode: str
+        :return: WebsiteMeasurement
+        """
+        website = cls(url, 0, 0, mode=mode, error=error)
+        website.samples = array('d')
+        website.byte_samples = array('q')
+        website.phase_samples = {phase: array('d') for phase in PHASES}
+        return website
+
+    @property
+    def network(self) -> float:
+        """
+        Total load time without DNS lookup (network and server time).
+
+        :return: float
+        """
+        return self.time - self.dns
+
+    @property
+    def confidence(self) -> Optional[float]:
+        """
+        Half-width of confidence interval as part of its middle, None
+        without interval.
+
+        :return: Optional[float]
+        """
+        if self.confidence_low is None:
+            return None
+        middle = (self.confidence_high + self.confidence_low) / 2
+        if middle <= 0:
+            return math.inf
+        return (self.confidence_high - self.confidence_low) / 2 / middle
+
+    def is_failed(self) -> bool:
+        """
+        True if website could not be measured.
+
+        :return: bool
+        """
+        return self.error is not None
+
+    def to_text(self, metric: str = 'time') -> str:
+        """
+        Text with ranking place, total time, phases (if measured) and url.
+        With more than one sample statistics of metric samples are added.
+        Variants measured in other modes are added at the end.
+
+        :param metric: str, one of METRICS
+        :return: str
+        """
+        text = f'|{self.ranking_place}. \t| '
+        if self.variants:
+            text += f'{self.mode}: '
+        text += self.get_result_text(metric)
+        for name, variant in self.variants.items():
+            text += f' \t| {name}: ' \
+                    f'{variant.get_result_text(metric, with_url=False)}'
+        return text
+
+    def get_result_text(
+            self, metric: str = 'time', with_url: bool = True
+    ) -> str:
+        """
+        Text with total time, phases (if measured), url and statistics of
+        metric samples (if more than one sample).
+
+        :param metric: str, one of METRICS
+        :param with_url: bool
+        :return: str
+        """
+        if self.is_failed():
+            parts = [f'failed: {self.error}']
+            if with_url:
+                parts.append(f'url: {self.url}')
+            return ' \t| '.join(parts)
+
+        parts = [f'time: {self.time_round}']
+        if self.has_phases():
+            parts.append(' '.join(
+                f'{phase}: {round(getattr(self, phase), ROUND_VALUE)}'
+                for phase in PHASES
+            ))
+        if self.bytes_transferred:
+            parts.append(
+                f'bytes: {self.bytes_transferred} '
+                f'throughput: {round(self.throughput)} B/s'
+            )
+        if self.decoded_bytes and \
+                self.decoded_bytes != self.bytes_transferred:
+            parts.append(
+                f'decoded: {self.decoded_bytes} B '
+                f'decompress: {round(self.decompress_time, ROUND_VALUE)}'
+            )
+        if self.resources:
+            parts.append(
+                f'document: {round(self.document_time, ROUND_VALUE)} '
+                f'resources: {self.resources} ({self.resource_bytes} B) '
+                f'critical: {self.critical_resources} '
+                f'({self.critical_bytes} B) failed: {self.failed_resources}'
+            )
+        if self.queue_time:
+            parts.append(f'queue: {round(self.queue_time, ROUND_VALUE)}')
+        if with_url:
+            parts.append(f'url: {self.url}')
+        text = ' \t| '.join(parts)
+        if len(self.samples) > 1:
+            summary = ' '.join(
+                f'{name}: {round(value, ROUND_VALUE)}'
+                for name, value in self.get_statistics(metric).items()
+            )
+            text += f' \t| {metric} samples: {len(self.samples)} {summary}'
+        if self.confidence is not None:
+            text += f' confidence: ±{round(self.confidence * 100, 1)}%'
+        return text
+
+    def to_record(self) -> tuple:
+        """
+        Compact picklable record of measurement with samples as raw bytes
+        of arrays, used to send measurements between processes.
+
+        :return: tuple
+        """
+        return (
+            self.url,
+            self.mode,
+            self.start_time,
+            self.end_time,
+            tuple(getattr(self, phase) for phase in PHASES),
+            self.bytes_transferred,
+            self.samples.tobytes(),
+            tuple(self.phase_samples[phase].tobytes() for phase in PHASES),
+            self.byte_samples.tobytes(),
+            tuple(
+                (name, variant.to_record())
+                for name, variant in self.variants.items()
+            ),
+            self.error,
+            tuple(getattr(self, name) for name in RECORD_FIELDS),
+            self.histogram.to_bytes()
+        )
+
+    @classmethod
+    def from_record(cls, record: tuple) -> 'WebsiteMeasurement':
+        """
+        Measurement rebuilt from to_record() record.
+
+        :param record: tuple
+        :return: WebsiteMeasurement
+        """
+        (url, mode, start_time, end_time, phases, bytes_transferred,
+         samples, phase_samples, byte_samples, variants, error, page,
+         histogram) = record
+        website = cls(
+            url, start_time, end_time, **dict(zip(PHASES, phases)),
+            bytes_transferred=bytes_transferred, mode=mode, error=error,
+            **dict(zip(RECORD_FIELDS, page))
+        )
+        website.samples = array('d')
+        website.samples.frombytes(samples)
+        website.byte_samples = array('q')
+        website.byte_samples.frombytes(byte_samples)
+        website.histogram = Histogram.from_bytes(histogram)
+        for phase, data in zip(PHASES, phase_samples):
+            website.phase_samples[phase] = array('d')
+            website.phase_samples[phase].frombytes(data)
+        website.variants = {
+            name: cls.from_record(variant) for name, variant in variants
+        }
+        return website
 
     def round_time(self):
         """
@@ -49,6 +311,109 @@ class WebsiteMeasurement:
         """
         return self.end_time - self.start_time
 
+    def calculate_throughput(self) -> float:
+        """
+        Bytes transferred per second of self.time, 0.0 for zero time.
+
+        :return: float
+        """
+        if self.time <= 0:
+            return 0.0
+        return self.bytes_transferred / self.time
+
+    def has_phases(self) -> bool:
+        """
+        True if time of any phase was measured.
+
+        :return: bool
+        """
+        return any(getattr(self, phase) for phase in PHASES)
+
+    def add_sample(
+            self,
+            start_time: time,
+            end_time: time,
+            phases: Dict[str, float] = None,
+            bytes_transferred: int = 0
+    ) -> None:
+        """
+        Add next measurement of the same website to self.samples,
+        self.phase_samples and self.byte_samples.
+
+        :param start_time: time
+        :param end_time: time
+        :param phases: Dict[str, float], seconds of PHASES
+        :param bytes_transferred: int
+        :return: None
+        """
+        phases = phases or {}
+        self.samples.append(end_time - start_time)
+        self.histogram.record(end_time - start_time)
+        self.byte_samples.append(bytes_transferred)
+        for phase in PHASES:
+            self.phase_samples[phase].append(phases.get(phase, 0.0))
+
+    def merge(self, other: 'WebsiteMeasurement') -> None:
+        """
+        Add samples of other measurement of the same url (and of its
+        variants measured by both) to self.
+        First load data are kept, queue times are added.
+
+        :param other: WebsiteMeasurement
+        :return: None
+        """
+        self.samples.extend(other.samples)
+        self.histogram.merge(other.histogram)
+        self.queue_time += other.queue_time
+        self.byte_samples.extend(other.byte_samples)
+        for phase in PHASES:
+            self.phase_samples[phase].extend(other.phase_samples[phase])
+        for name, variant in other.variants.items():
+            if name in self.variants and not variant.is_failed() and \
+                    not self.variants[name].is_failed():
+                self.variants[name].merge(variant)
+
+    def get_samples(self, metric: str = 'time') -> array:
+        """
+        Samples of total time, total time without DNS lookup ('network')
+        or one of PHASES.
+
+        :param metric: str
+        :return: array
+        """
+        if metric == 'time':
+            return self.samples
+        if metric == 'network':
+            return array('d', map(
+                float.__sub__, self.samples, self.phase_samples['dns']
+            ))
+        return self.phase_samples[metric]
+
+    def get_statistic(
+            self, statistic: str = 'time', metric: str = 'time'
+    ) -> float:
+        """
+        Value of statistic (one of STATISTICS) computed from all samples of
+        metric (one of METRICS).
+        'time' statistic returns value of the first sample.
+
+        :param statistic: str
+        :param metric: str
+        :return: float
+        """
+        if statistic == 'time':
+            return getattr(self, metric)
+        return stats.statistic(self.get_samples(metric), statistic)
+
+    def get_statistics(self, metric: str = 'time') -> Dict[str, float]:
+        """
+        All STATISTICS computed from samples of metric.
+
+        :param metric: str
+        :return: Dict[str, float]
+        """
+        return stats.summarize(self.get_samples(metric))
+
     @staticmethod
     def set_ranking_place(list_of_objects: list) -> list:
         """
@@ -65,24 +430,45 @@ class WebsiteMeasurement:
         return list_of_objects
 
     @staticmethod
-    def sort(list_of_objects: list) -> list:
+    def sort(
+            list_of_objects: list,
+            statistic: str = 'time',
+            metric: str = 'time'
+    ) -> list:
         """
-        Sort passed list with object time.
+        Sort passed list with object time or chosen statistic of samples of
+        total time or single phase.
+        Failed measurements are sorted last.
 
         :param list_of_objects: list
+        :param statistic: str
+        :param metric: str
         :return: list
         """
-        list_of_objects.sort(key=lambda obj: obj.time)
+        def get_key(obj: WebsiteMeasurement) -> tuple:
+            if obj.is_failed():
+                return True, 0.0
+            return False, obj.get_statistic(statistic, metric)
+
+        list_of_objects.sort(key=get_key)
         return list_of_objects
 
     @staticmethod
-    def get_sorted_ranking(list_of_objects: list) -> list:
+    def get_sorted_ranking(
+            list_of_objects: list,
+            statistic: str = 'time',
+            metric: str = 'time'
+    ) -> list:
         """
         Combined sort() staticmethod and set_ranking_place() staticmethod.
 
         :param list_of_objects: list
+        :param statistic: str
+        :param metric: str
         :return: list
         """
-        list_of_objects = WebsiteMeasurement.sort(list_of_objects)
+        list_of_objects = WebsiteMeasurement.sort(
+            list_of_objects, statistic, metric
+        )
         list_of_objects = WebsiteMeasurement.set_ranking_place(list_of_objects)
         return list_of_objects
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from website_measure import LOG_DIR_PATH, logger
 from website_measure.constants import RESULT_OUTPUT_FILENAME
@@ -7,49 +8,79 @@ from website_measure.constants import RESULT_OUTPUT_FILENAME
 class WriteFile:
     """
     Write text file in the indicated direction.
+    Text is written through one buffered handle to temporary file which
+    replaces result file at the end, so readers never see half-written
+    result.
     """
-    def __init__(self, file_name: str = RESULT_OUTPUT_FILENAME):
+    def __init__(
+            self,
+            file_name: str = RESULT_OUTPUT_FILENAME,
+            directory: str = LOG_DIR_PATH
+    ):
         """
         self.file_name - file name of text file wit result data from
         constants.py file.
         self.file_path - path of self.file_name from __init__ file.
+        self.file - handle of temporary file, open inside context manager
+        self.temp_path - path of temporary file
+        self.lines - number of appended texts
 
         :param file_name: str
+        :param directory: str
         """
         self.file_name = file_name
-        self.file_path = os.path.join(LOG_DIR_PATH, self.file_name)
+        self.directory = directory
+        self.file_path = os.path.join(directory, self.file_name)
         self.file = None
+        self.temp_path = None
+        self.lines = 0
 
     def __enter__(self):
         """
         Context manager method.
-        Remove old result file from self.file_path directory.
+        Open temporary file next to self.file_path.
 
         :return: self
         """
-        try:
-            os.remove(self.file_path)
-        except FileNotFoundError:
-            pass
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, self.temp_path = tempfile.mkstemp(
+            prefix=f'.{self.file_name}.', suffix='.tmp', dir=self.directory
+        )
+        os.chmod(self.temp_path, 0o644)
+        self.file = os.fdopen(descriptor, 'w')
+        self.lines = 0
         return self
 
-    def __exit__(self, *args, **kwargs):
+    def __exit__(self, exc_type, *args, **kwargs):
         """
         Context manager method.
-        Close file.
+        Flush and close file, then atomically replace old result file with
+        it. On exception temporary file is removed and old result file is
+        kept.
         """
-        self.file.close()
+        try:
+            if exc_type is None:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+        finally:
+            self.file.close()
+
+        if exc_type is not None:
+            os.remove(self.temp_path)
+            return
+
+        os.replace(self.temp_path, self.file_path)
+        logger.info(
+            f'\n[INFO][WriteFile][__exit__]'
+            f'\nWrote {self.lines} lines to file {self.file_name}'
+        )
 
     def append(self, text: str):
         """
-        Create and append text file with text data.
+        Append text data to buffered file.
 
         :param text: str
         :return: None
         """
-        with open(self.file_path, 'a') as self.file:
-            self.file.write(text)
-            logger.info(
-                f'\n[INFO][WriteFile][append]'
-                f'\nAppend file {self.file_name}\nText: {text}'
-            )
+        self.file.write(text)
+        self.lines += 1